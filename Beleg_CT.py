@@ -7,160 +7,84 @@
     Aufgabe 2: Rekonstruktion von CT-Bildern aus den Sinogrammen von Aufgabe 1
 """
 
+import os
 import sys
+import time
+from functools import partial
 
 import numpy as np
 from PyQt5 import QtCore
 from PyQt5.QtGui import QIcon
-from scipy.ndimage import map_coordinates
 from PyQt5 import QtWidgets
 from PyQt5.QtWidgets import (QFileDialog, QPushButton, QGridLayout,
                              QVBoxLayout, QHBoxLayout, QRadioButton,
                              QGroupBox, QProgressBar, QLabel,
-                             QSpinBox, QComboBox, QAction, QCheckBox)
+                             QSpinBox, QComboBox, QAction, QCheckBox,
+                             QMessageBox)
 
 import pyqtgraph
 
+from rechenkern import (FILTER, GENAUIGKEITEN, GEOMETRIE_VERZEICHNIS,
+                        INTERPOLATIONEN, PROJEKTOREN, RUECKPROJEKTOREN,
+                        SPEICHER_BUDGET, TEXTBILD_ENDUNG,
+                        Iterationsrechnung, Rueckwaertsrechnung,
+                        Vorwaertsrechnung, bild_laden,
+                        drehung_vorverarbeitung, filtern,
+                        fourier_rekonstruktion, geometrie_cache,
+                        messprotokoll, rescale,
+                        sinogramm_lesen, sinogramm_speichern,
+                        systemmatrix_hinweis, systemmatrix_pruefen,
+                        vorschau_rekonstruktion, vorschau_stufen, zuschneiden)
 
-def drehmatrix(grad):
-    """ Erzeugt eine Drehmatrix.
 
-        Parameter:
-        ----------
-        grad: Angabe der Drehung(im positivem Drehsinne) in Grad.
-    """
-    # Umrechnung Winkel in Bogenmaß
-    grad_rad = np.radians(grad)
-    # Drehmatrix in homogenen Koordinaten
-    dreh = np.array([[np.cos(grad_rad), np.sin(grad_rad), 0],
-                     [-np.sin(grad_rad), np.cos(grad_rad), 0], [0, 0, 1]])
-    # Matrizen invertieren, da Transformation im positiven Sinn
-    dreh = np.linalg.inv(dreh)
-    return dreh
-
-
-def drehung_vorverarbeitung(image):
-    """ Fuer eine anschließende Drehung muessen am Rande des Originalbild
-        Nullen hinzugefuegt werden, um eine anschließende verlustlose Drehung
-        des Bildes zu ermoeglichen (es sollen keine gefuellten Werte des
-        Originalbildes abgeschnitten werden, nur Nullen).
+# Sinogrammzeilen je Kachel der Sinogramm-Animation (siehe
+# Gui.sino_kacheln_erstellen)
+SINO_KACHEL = 16
 
-        Parameter:
-        ----------
-        image: Array, Eingabewerte.
-
-        Skizze zur Verdeutlichung:
-
-                            c
-          +--------------------------------------+
-          |                                      |
-          |                 a                    |
-          |    +----------------------------+    |
-          |    |                            |    +---------->  mit Nullen
-          |    |                            |    |             gefuellter
-          |    |                            |    |             Rand
-          |    |                            |    |
-          |    |                            |    |
-        c |  a |                            | a  | c
-          |    |                            |    |
-          |    |                            |    |
-          |    |                            |    |
-          |    |                            |    |
-          |    |                            +------------>   Originalbild
-          |    |                            |    |
-          |    |                            |    |
-          |    +----------------------------+    |
-          |                 a                    |
-          |                                      |
-          +--------------------------------------+
-                            c
-    """
-    # Annahme: quadratische Eingangs-Matrix
-    # Seitenlaenge der ursprünglichen Matrix abspeichern (a)
-    laenge_original = len(image)
-    # Wie groß muss vergrößertes Bild sein für anschließende verlustfreie
-    # Drehung? (mit Satz des Pythagoras berechnet)
-    # (auf)runden und Integer damit keine halben Pixel als Ergebnis erhalten
-    # werden (c)
-    c = np.int(np.ceil(np.sqrt(2) * laenge_original))
-    # Prüfen, ob Originalbild überhaupt mittig reingelegt werden kann:
-    b = c - laenge_original
-    # ist b eine ungerade Zahl, dann vergroeßere c um Eins, damit b im
-    # anschließenden gerade Zahl ist
-    if b % 2 == 1:
-        c += 1
-        b = c - laenge_original
-    # ansonsten ist b gerade und Originalbild kann mittig reingelegt werden
-    # Anlegen eines (groeßeren) Arrays, indem Originalbild anschließend
-    # (mittig!!) gespeichert wird
-    image_groß = np.zeros((c, c))
-    # nun wird Originalbild mittig ins vergroeßertes Bild gelegt
-    image_groß[np.int(b / 2):laenge_original + np.int(b / 2), np.int(b / 2):laenge_original + np.int(b / 2)] = image
-    return image_groß
-
-
-def drehung(image, grad):
-    """ Drehung eines Bildes im positiven Drehsinne.
+
+class Bildtakt:
+    """ Begrenzt die Aktualisierung einer Grafik auf hoechstens fps Bilder
+        pro Sekunde. Anforderungen zwischen zwei Bildern werden
+        zusammengefasst, Zwischenstaende also verworfen, damit die
+        Oberflaeche nicht die Berechnung ausbremst.
 
         Parameter:
         ----------
-        image: Array, Eingabewerte.
+        zeichnen: Funktion, die ein Bild zeichnet.
 
-        grad: Angabe der Drehung(im positivem Drehsinne) in Grad.
-    """
-    # Erzeugen einer Drehmatrix mit gewaehltem Winkel
-    transform = drehmatrix(grad)
-    image_transform = np.zeros_like(image)
-    # Rotation mit Drehmatrix bezieht sich auf Nullpunkt des Koordinatensystems
-    # das heißt fuer eine Drehung um die Mitte des Bildes muss der Nullpunkt
-    # des Koordinatensystems in die Mitte des Bildes gelegt werden
-    # (ansonsten Drehung um obere linke Ecke des Bildes)
-    # Pixel, bei dem Mitte des Koordinaensystems liegt:
-    pixel_mitte = len(image) // 2
-    if len(image_transform) % 2 == 0:
-        x = np.arange(-pixel_mitte, pixel_mitte)
-        y = np.arange(-pixel_mitte, pixel_mitte)
-    else:
-        x = np.arange(-pixel_mitte, pixel_mitte + 1)
-        y = np.arange(-pixel_mitte, pixel_mitte + 1)
-    x, y = np.meshgrid(x, y)
-    koord_xy_transform = (np.array([x, y, np.ones_like(x)]).T @ transform).T
-    x_transform = (koord_xy_transform[0])
-    y_transform = (koord_xy_transform[1])
-    bed1 = (-pixel_mitte <= x_transform) * (x_transform < pixel_mitte)
-    bed2 = (-pixel_mitte <= y_transform) * (y_transform < pixel_mitte)
-    bed = bed1 * bed2
-    image_transform[bed] = \
-        map_coordinates(image, np.array([(y_transform[bed] + pixel_mitte),
-                                         (x_transform[bed] + pixel_mitte)]))
-    return image_transform
-
-
-def rescale(original, img_rueck):
+        fps: maximale Anzahl Bilder pro Sekunde.
     """
-    Skaliert ein rückprojiziertes Bild auf den Wertebereich des Originalbildes.
-
-    Parameters
-    ----------
-    original: Originalbild.
 
-    img_rueck: rückprojiziertes Bild.
+    def __init__(self, zeichnen, fps=10):
+        self.zeichnen = zeichnen
+        self.offen = False
+        self.timer = QtCore.QTimer()
+        self.timer.timeout.connect(self.ausloesen)
+        self.set_fps(fps)
+
+    def set_fps(self, fps):
+        """ Aendert die maximale Bildrate. """
+        self.timer.setInterval(int(1000 / fps))
+
+    def anfordern(self):
+        """ Neues Bild anfordern, wird spaetestens mit dem naechsten Takt
+            gezeichnet. """
+        self.offen = True
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def ausloesen(self):
+        """ Takt: offene Anforderung zeichnen, sonst Timer anhalten. """
+        if self.offen:
+            self.offen = False
+            self.zeichnen()
+        else:
+            self.timer.stop()
 
-    Return
-    ----------
-    img_rueck: skaliertes rückprojiziertes Bild
-    """
-    # Wertebereich fuer Originalbild
-    min_original = np.min(original)
-    max_original = np.max(original)
-    # Wertebereich des rueckprojiziertes Bildes
-    min_rueck = np.min(img_rueck)
-    max_rueck = np.max(img_rueck)
-    diff = min_rueck - min_original
-    img_rueck -= diff
-    scal = max_original / max_rueck
-    img_rueck *= scal
-    return img_rueck
+    def beenden(self):
+        """ Verwirft offene Anforderungen (z.B. am Ende der Berechnung). """
+        self.timer.stop()
+        self.offen = False
 
 
 # Layouteinstellungen, grafische Oberflaeche gestalten
@@ -169,18 +93,24 @@ class MainGui(QtWidgets.QMainWindow):
         super().__init__()
         self.tb = self.addToolBar("")
         self.grid = QGridLayout()
-        self.central = Gui(self.grid, self.tb)
+        self.central = Gui(self.grid, self.tb, self.statusBar())
         self.central.setLayout(self.grid)
         self.setCentralWidget(self.central)
 
 
 # Layouteinstellungen, grafische Oberflaeche gestalten
 class Gui(QtWidgets.QWidget):
-    def __init__(self, grid, toolbar):
+    def __init__(self, grid, toolbar, statusleiste):
         super().__init__()
         self.calculate_vor = None
         self.calculate_rueck = None
         self.data = None
+        # Statusleiste fuer Winkel/s und Restzeit der laufenden Berechnung
+        self.statusleiste = statusleiste
+        self.status_beginn = None
+        self.status_hinweis = None
+        # Rechteck des CT-Tisches waehrend der Animation
+        self.cttisch = None
         self.grid = grid
         # Tollbar erzeugen
         self.tb = toolbar
@@ -247,6 +177,61 @@ class Gui(QtWidgets.QWidget):
         # Liste Buttons
         self.alle_buttons = [self.load, self.save_img, self.saveSino,
                              self.clear, self.loadSino]
+        # maximale Bildrate der Animationen, dazwischen liegende Bilder
+        # werden verworfen
+        self.tb.addSeparator()
+        self.tb.addWidget(QLabel(" Bilder/s: "))
+        self.sb_fps = QSpinBox()
+        self.sb_fps.setMinimum(1)
+        self.sb_fps.setMaximum(60)
+        self.sb_fps.setValue(10)
+        self.sb_fps.setToolTip('Maximale Anzahl an Bildern pro Sekunde '
+                               'während der Animation.')
+        self.tb.addWidget(self.sb_fps)
+        self.takt_sino = Bildtakt(self.zeichnen_sinogramm, self.sb_fps.value())
+        self.takt_cttisch = Bildtakt(self.zeichnen_cttisch,
+                                     self.sb_fps.value())
+        self.takt_r = Bildtakt(self.zeichnen_r, self.sb_fps.value())
+        self.sb_fps.valueChanged.connect(self.fps_aendern)
+        # Rechengenauigkeit fuer Vorwaerts- und Rueckprojektion
+        self.tb.addSeparator()
+        self.tb.addWidget(QLabel(" Genauigkeit: "))
+        self.cb_genauigkeit = QComboBox()
+        for name in GENAUIGKEITEN:
+            self.cb_genauigkeit.addItem(name)
+        self.cb_genauigkeit.setToolTip('float32 halbiert Speicherbedarf und '
+                                       'Speicherbandbreite aller Rechnungen.')
+        self.tb.addWidget(self.cb_genauigkeit)
+        self.geometrie_speichern = QAction("Geometrie speichern", self)
+        self.geometrie_speichern.setCheckable(True)
+        self.geometrie_speichern.setStatusTip(
+            'Speichert Drehgeometrien und Systemmatrizen im Ordner '
+            'cache/geometrie, spätere Programmstarts laden sie wieder '
+            'statt sie neu zu berechnen.')
+        self.tb.addAction(self.geometrie_speichern)
+        self.geometrie_speichern.triggered.connect(
+            self.geometrie_speichernButtonPress)
+        # Messung der einzelnen Verarbeitungsstufen
+        self.tb.addSeparator()
+        self.messung = QAction("Messung", self)
+        self.messung.setCheckable(True)
+        self.messung.setStatusTip('Misst Zeiten je Verarbeitungsstufe und '
+                                  'je Winkel (Neustart beim Einschalten).')
+        self.tb.addAction(self.messung)
+        self.messung.triggered.connect(self.messungButtonPress)
+        self.messung_speichern = QAction("Messung speichern", self)
+        self.messung_speichern.setStatusTip('Speichert die Messung als JSON '
+                                            '(Zusammenfassung) oder CSV '
+                                            '(Ablaufprotokoll).')
+        self.tb.addAction(self.messung_speichern)
+        self.messung_speichern.triggered.connect(
+            self.messung_speichernButtonPress)
+        self.profil = QAction("Profil", self)
+        self.profil.setCheckable(True)
+        self.profil.setStatusTip('Zeichnet die nächste Berechnung mit '
+                                 'cProfile auf.')
+        self.tb.addAction(self.profil)
+        self.profil.triggered.connect(self.profilButtonPress)
 
         # Auswahlmoeglichkeiten fuer Vorwärtsprojektion
         # ist Uebersicht zur Auswahl Parameter fuer Vorwaertsprojektion
@@ -280,11 +265,41 @@ class Gui(QtWidgets.QWidget):
         self.vbox_anglesteps.addWidget(self.sb_anglesteps)
         self.groupBox_anglesteps.setLayout(self.vbox_anglesteps)
         self.hbox_v.addWidget(self.groupBox_anglesteps)
+        # erstellt ComboBox zur Auswahl der Interpolation bei der Drehung
+        # (Genauigkeit gegen Rechenzeit)
+        self.groupBox_interpolation = QGroupBox("Interpolation:")
+        self.cb_interpolation = QComboBox()
+        for name in INTERPOLATIONEN:
+            self.cb_interpolation.addItem(name)
+        self.vbox_interpolation = QVBoxLayout()
+        self.vbox_interpolation.addWidget(self.cb_interpolation)
+        self.groupBox_interpolation.setLayout(self.vbox_interpolation)
+        self.hbox_v.addWidget(self.groupBox_interpolation)
+        # erstellt ComboBox zur Auswahl des Projektors (Drehung des Bildes,
+        # zwischengespeicherte Systemmatrix oder Strahlverfolgung)
+        self.groupBox_projektor_v = QGroupBox("Projektor:")
+        self.cb_projektor_v = QComboBox()
+        for name in PROJEKTOREN:
+            self.cb_projektor_v.addItem(name)
+        self.vbox_projektor_v = QVBoxLayout()
+        self.vbox_projektor_v.addWidget(self.cb_projektor_v)
+        self.groupBox_projektor_v.setLayout(self.vbox_projektor_v)
+        self.hbox_v.addWidget(self.groupBox_projektor_v)
         # erstellt Checkbox, zur Auswahl, ob während Berechnung Animation
         # dargestellt werden soll
         self.ani_v = QCheckBox("mit Animation?")
         self.ani_v.setChecked(True)
         self.vbox_v.addWidget(self.ani_v)
+        # erstellt SpinBox zur Auswahl der Anzahl an Prozessen, auf die die
+        # Winkel der Vorwaertsprojektion verteilt werden (1: kein Pool)
+        self.hbox_prozesse = QHBoxLayout()
+        self.hbox_prozesse.addWidget(QLabel("Prozesse:"))
+        self.sb_prozesse = QSpinBox()
+        self.sb_prozesse.setMinimum(1)
+        self.sb_prozesse.setMaximum(os.cpu_count() or 1)
+        self.sb_prozesse.setValue(1)
+        self.hbox_prozesse.addWidget(self.sb_prozesse)
+        self.vbox_v.addLayout(self.hbox_prozesse)
         # erstellt eine Progressbar, welche den Fortschritt in der
         # Vorwaertsprojektion (des Sinogramms) darstellt.
         self.progress_sino = QProgressBar()
@@ -314,29 +329,80 @@ class Gui(QtWidgets.QWidget):
         self.groupBox_projection = QGroupBox("Projektion im Winkelraum:")
         self.radio_mit = QRadioButton("gefiltert")
         self.radio_ohne = QRadioButton("ungefiltert")
+        # direkte Fourier-Rekonstruktion (ohne Rueckprojektion)
+        self.radio_fourier = QRadioButton("Fourier (direkt)")
+        # iterative Rekonstruktion (SART mit Teilmengen)
+        self.radio_iterativ = QRadioButton("iterativ (SART)")
         self.radio_mit.setChecked(True)
         self.vbox_projection = QVBoxLayout()
         self.vbox_projection.addWidget(self.radio_mit)
         self.vbox_projection.addWidget(self.radio_ohne)
+        self.vbox_projection.addWidget(self.radio_fourier)
+        self.vbox_projection.addWidget(self.radio_iterativ)
         self.groupBox_projection.setLayout(self.vbox_projection)
         self.hbox_r.addWidget(self.groupBox_projection)
         # erstellt ComboBox zur Auswahl der Filter für gefilterte 
         # Rueckprojektion
         self.groupBox_cb = QGroupBox("Filter fuer Rückprojektion:")
         self.cb_filter = QComboBox()
-        self.cb_filter.addItem("Ramp")
-        self.cb_filter.addItem("Hamming")
+        for name in FILTER:
+            self.cb_filter.addItem(name)
         self.vbox_cb = QVBoxLayout()
         self.vbox_cb.addWidget(self.cb_filter)
         self.groupBox_cb.setLayout(self.vbox_cb)
         self.hbox_r.addWidget(self.groupBox_cb)
         self.radio_mit.clicked.connect(self.activate_cb_filter)
         self.radio_ohne.clicked.connect(self.deactivate_cb_filter)
+        self.radio_fourier.clicked.connect(self.deactivate_cb_filter)
+        self.radio_iterativ.clicked.connect(self.deactivate_cb_filter)
+        # erstellt ComboBox zur Auswahl des Projektors fuer Rueckprojektion
+        self.groupBox_projektor_r = QGroupBox("Projektor:")
+        self.cb_projektor_r = QComboBox()
+        for name in RUECKPROJEKTOREN:
+            self.cb_projektor_r.addItem(name)
+        self.vbox_projektor_r = QVBoxLayout()
+        self.vbox_projektor_r.addWidget(self.cb_projektor_r)
+        self.groupBox_projektor_r.setLayout(self.vbox_projektor_r)
+        self.hbox_r.addWidget(self.groupBox_projektor_r)
         # erstellt Checkbox, zur Auswahl, ob während Berechnung Animation
         # dargestellt werden soll
         self.ani_r = QCheckBox("mit Animation?")
         self.ani_r.setChecked(True)
         self.vbox_r.addWidget(self.ani_r)
+        # erstellt Checkbox, zur Auswahl, ob vor der vollen Aufloesung eine
+        # grobe Vorschau (1/4, dann 1/2 Aufloesung) gezeigt werden soll
+        self.vorschau_r = QCheckBox("mit Vorschau (1/4, 1/2)?")
+        self.vorschau_r.setChecked(False)
+        self.vbox_r.addWidget(self.vorschau_r)
+        # erstellt SpinBox zur Auswahl der Anzahl an Threads, auf die die
+        # Winkel der Rueckprojektion verteilt werden
+        self.hbox_threads = QHBoxLayout()
+        self.hbox_threads.addWidget(QLabel("Threads:"))
+        self.sb_threads = QSpinBox()
+        self.sb_threads.setMinimum(1)
+        self.sb_threads.setMaximum(os.cpu_count() or 1)
+        self.sb_threads.setValue(1)
+        self.hbox_threads.addWidget(self.sb_threads)
+        self.vbox_r.addLayout(self.hbox_threads)
+        # erstellt SpinBoxen fuer die iterative Rekonstruktion: maximale
+        # Anzahl an Iterationen und Anzahl Teilmengen der Winkel
+        self.hbox_iterationen = QHBoxLayout()
+        self.hbox_iterationen.addWidget(QLabel("Iterationen:"))
+        self.sb_iterationen = QSpinBox()
+        self.sb_iterationen.setMinimum(1)
+        self.sb_iterationen.setMaximum(200)
+        self.sb_iterationen.setValue(10)
+        self.hbox_iterationen.addWidget(self.sb_iterationen)
+        self.hbox_iterationen.addWidget(QLabel("Teilmengen:"))
+        self.sb_teilmengen = QSpinBox()
+        self.sb_teilmengen.setMinimum(1)
+        self.sb_teilmengen.setMaximum(100)
+        self.sb_teilmengen.setValue(10)
+        self.hbox_iterationen.addWidget(self.sb_teilmengen)
+        self.vbox_r.addLayout(self.hbox_iterationen)
+        for spinbox in (self.sb_iterationen, self.sb_teilmengen):
+            spinbox.setEnabled(False)
+            self.radio_iterativ.toggled.connect(spinbox.setEnabled)
         # erstellt eine Progressbar, welche den Fortschritt in der
         # Vorwaertsprojektion (des Sinogramms) darstellt.
         self.progress_img_r = QProgressBar()
@@ -386,6 +452,8 @@ class Gui(QtWidgets.QWidget):
         # damit verhalten wie Mathplotlib
         self.img2.setOpts(axisOrder='row-major')
         self.view2.addItem(self.img2)
+        # Kacheln des Sinogramms waehrend der Vorwaertsprojektion
+        self.sino_kacheln = []
         self.grid.addLayout(self.vbox_img2, 0, 2)
         
         # Bild 3: rückprojiziertes Bild
@@ -428,17 +496,18 @@ class Gui(QtWidgets.QWidget):
         """
         options = QFileDialog.Options()
         options |= QFileDialog.DontUseNativeDialog
-        fileName, _ = QFileDialog.getOpenFileName(self,
-                                                  "Open file", "",
-                                                  "CT Bilder (*.npy)",
-                                                  options=options)
+        fileName, _ = QFileDialog.getOpenFileName(
+            self, "Open file", "",
+            "CT Bilder (*.npy *{0});;CT Bilder binaer (*.npy);;"
+            "CT Bilder Text (*{0})".format(TEXTBILD_ENDUNG),
+            options=options)
         if fileName:
             # nachdem neue Datei geladen wird sollen vorherige Grafiken
             # aus allen Bildern entfernt werden, Löschen vorherig
             # gespeicherter Daten
             self.clearButtonPress()
             # Einlesen der Daten
-            self.data = np.load(fileName)
+            self.data = bild_laden(fileName)
             self.img1.setImage(self.data)
             self.groupBox_vor.setEnabled(True)
 
@@ -457,8 +526,10 @@ class Gui(QtWidgets.QWidget):
             i.setEnabled(False)
         self.breaking.setEnabled(True)
         self.laenge_original = len(self.data)
+        dtype = GENAUIGKEITEN[self.cb_genauigkeit.currentText()]
         # Vorverarbeitung fuer Drehung
-        self.data_gross = drehung_vorverarbeitung(self.data)
+        with messprotokoll.stufe("drehung_vorverarbeitung"):
+            self.data_gross = drehung_vorverarbeitung(self.data, dtype)
         # verschiedene (Rotations)winkel durchgehen
         # Auswahl Endpunkt je nachdem, was auf der graphischen Oberflaeche
         # ausgewaehlt wird
@@ -470,25 +541,46 @@ class Gui(QtWidgets.QWidget):
             angle_value = 360
         self.winkel_max = angle_value
         angle_steps = self.sb_anglesteps.value()
-        self.sinogramm = np.zeros([angle_steps, len(self.data_gross)])
-        # Animation CT Tisch
-        self.data_gms = np.zeros_like(self.data_gross)
-        self.cttisch = np.zeros_like(self.data)
-        self.cttisch[-3:-1] = np.max(self.data)
-        self.cttisch = drehung_vorverarbeitung(self.cttisch)
-        self.cttisch = np.roll(self.cttisch, len(self.data)//10, axis=0)
+        self.sinogramm = np.zeros([angle_steps, len(self.data_gross)],
+                                  dtype=dtype)
+        # angezeigtes Sinogramm, wird nur in geaenderten Zeilen nachgefuehrt
+        self.sinogramm_anzeige = np.zeros_like(self.sinogramm)
+        self.zeilen_geaendert = None
+        self.levels_sino = None
+        self.sino_kacheln_erstellen()
         # auf grafischen Oberfläche Auswahl, ob Darstellung mit Animation
         # oder nicht
         animation_vor = self.ani_v.isChecked()
+        # Animation CT Tisch
+        if animation_vor:
+            self.cttisch_erstellen()
+        # Ordnung der Interpolation fuer die Drehung
+        ordnung = INTERPOLATIONEN[self.cb_interpolation.currentText()]
+        projektor = self.cb_projektor_v.currentText()
+        if projektor == "Systemmatrix" and not self.systemmatrix_moeglich(
+                len(self.data_gross), angle_steps, ordnung):
+            self.animation_finish(True)
+            return
         # hier Thread wegen rechenaufwändigem Teil
-        self.calculate_vor = Vorwaertsprojektion(self.data_gms, angle_value,
-                                                 self.cttisch, self.data_gross,
+        self.calculate_vor = Vorwaertsprojektion(angle_value, self.data_gross,
                                                  angle_steps, self.sinogramm,
-                                                 animation_vor)
+                                                 ordnung, projektor=projektor,
+                                                 prozesse=self.sb_prozesse.value(),
+                                                 sicherung=True)
+        # abgebrochene Berechnung mit denselben Einstellungen fortsetzen,
+        # danach bereits frueher projizierte Winkel aus dem Cache uebernehmen
+        fortgesetzt = self.fortsetzen_anbieten(self.calculate_vor.rechnung)
+        if self.calculate_vor.rechnung.aus_cache() or fortgesetzt:
+            self.sinogramm_anzeige[:] = self.sinogramm
+            self.animation(0, angle_steps)
+        self.status_starten(angle_steps, np.count_nonzero(
+            self.calculate_vor.rechnung.erledigt) / angle_steps,
+            systemmatrix_hinweis(ordnung)
+            if projektor == "Systemmatrix" else None)
         # mit Animation
         if animation_vor:
             self.calculate_vor.signal.connect(self.progress_vor)
-            self.calculate_vor.signal.connect(self.animation)
+            self.calculate_vor.signal_zeilen.connect(self.animation)
             self.calculate_vor.signal_finish.connect(self.animation_finish)
             self.calculate_vor.signal.connect(self.animation_cttisch)
         else:
@@ -504,10 +596,6 @@ class Gui(QtWidgets.QWidget):
         In einem sich oeffnenden file dialog kann ein Sinogramm
         unter selbst gewaehlten Dateinamen abgespeichert werden.
         """
-        self.sinogramm_plus_info = np.vstack((np.ones((1,
-                                                    len(self.sinogramm[0]))),
-                                                    self.sinogramm))
-        self.sinogramm_plus_info[0, 0] = self.laenge_original
         # je nachdem was auf grafischen Oberfläche ausgewaehlt wurde,
         # 180 Grad oder 360 Grad abspeichern
         angle = self.radio180.isChecked()
@@ -515,17 +603,18 @@ class Gui(QtWidgets.QWidget):
             angle_value = 180
         else:
             angle_value = 360
-        self.sinogramm_plus_info[0, 1] = angle_value
         options = QFileDialog.Options()
         options |= QFileDialog.DontUseNativeDialog
-        fileName, _ = QFileDialog.getSaveFileName(self,"Save file",
-                                                  "Sinogramm.milu",
-                                                  "Sinogramme (*.milu)",
-                                                  options=options)
+        fileName, auswahl = QFileDialog.getSaveFileName(
+            self, "Save file", "Sinogramm.milu",
+            "Sinogramme (*.milu);;Sinogramme komprimiert (*.milu)",
+            options=options)
         if fileName:
             # Speichern der Daten
-            with open(fileName, "wb") as file:
-                np.save(file, self.sinogramm_plus_info)
+            sinogramm_speichern(fileName, self.sinogramm,
+                                self.laenge_original, angle_value,
+                                komprimieren=auswahl.startswith(
+                                    "Sinogramme komprimiert"))
 
     def loadsinoButtonPress(self):
         """
@@ -540,12 +629,14 @@ class Gui(QtWidgets.QWidget):
         if fileName:
             self.clearButtonPress()
             # Einlesen der Daten
-            self.sinogramm_plus_info = np.load(fileName)
             # nachdem neue Datei geladen wird sollen vorherige Grafiken
             # aus allen Bildern entfernt werden und vorherige Daten löschen
-            self.laenge_original = np.int(self.sinogramm_plus_info[0, 0])
-            self.winkel_max = np.int(self.sinogramm_plus_info[0, 1])
-            self.sinogramm = self.sinogramm_plus_info[1:]
+            self.sinogramm, kopf = sinogramm_lesen(fileName)
+            self.laenge_original = kopf["laenge_original"]
+            self.winkel_max = kopf["winkel_max"]
+            # Genauigkeit uebernehmen, mit der das Sinogramm berechnet wurde
+            self.cb_genauigkeit.setCurrentText(kopf.get("genauigkeit",
+                                                        "float64"))
             self.img2.setImage(self.sinogramm)
             self.groupBox_rueck.setEnabled(True)
 
@@ -561,40 +652,70 @@ class Gui(QtWidgets.QWidget):
         self.groupBox_vor.setEnabled(False)
         self.img3.clear()
         self.img4.clear()
-        # Anwendung Filter vor Rueckprojektion
-        self.sinogramm_filter = np.copy(self.sinogramm)
+        dtype = GENAUIGKEITEN[self.cb_genauigkeit.currentText()]
+        # direkte Fourier-Rekonstruktion, schnell genug ohne eigenen Thread
+        if self.radio_fourier.isChecked():
+            self.currentchoice = None
+            self.status_starten(len(self.sinogramm))
+            self.image_r = messprotokoll.profilieren(
+                fourier_rekonstruktion,
+                np.asarray(self.sinogramm, dtype=dtype), self.winkel_max)
+            self.progress_img_r.setMaximum(self.winkel_max)
+            self.animation_r_finish(False)
+            return
         # Auswahl Filter auf grafischen Oberfläche
         filterart = self.radio_mit.isChecked()
         # gefiltert
         if filterart:
             # abspeichern des aktuell ausgewaehlten Filters
             self.currentchoice = self.cb_filter.currentText()
-            # Erstellung Rampfilter
-            ramp = np.abs(np.fft.fftshift(np.fft.fftfreq(len(self.sinogramm[0]))))
-            # Auswahl Rampfilter
-            if self.currentchoice == "Ramp":
-                filterkern = ramp
-            # Hamming-Filter
-            else:
-                n = np.arange(len(self.sinogramm[0]))
-                fenster = 0.54 - 0.46 * \
-                          np.cos(2*np.pi*(n/len(self.sinogramm[0])-1))
-                filterkern = ramp * fenster
-            # Fouriertransformation
-            fourier_image = np.fft.fft(self.sinogramm)
-            fourier_image = np.fft.fftshift(fourier_image)
-            # Anwenden des Filters auf Bild:
-            # (Multiplikation im Frequenzraum)
-            fourier_gefiltert = fourier_image * filterkern
-            fourier_gefiltert = np.fft.ifftshift(fourier_gefiltert)
-            self.sinogramm_filter = np.real(np.fft.ifft(fourier_gefiltert))
+        else:
+            self.currentchoice = None
+        # Anwendung Filter vor Rueckprojektion
+        with messprotokoll.stufe("filtern"):
+            self.sinogramm_filter = filtern(self.sinogramm,
+                                            self.currentchoice, dtype=dtype)
         alpha_r = np.linspace(0, self.winkel_max, len(self.sinogramm_filter),
                               endpoint=False)
         self.image_r = np.zeros((len(self.sinogramm_filter[0]),
-                                 len(self.sinogramm_filter[0])))
+                                 len(self.sinogramm_filter[0])), dtype=dtype)
+        projektor = self.cb_projektor_r.currentText()
+        if projektor == "Systemmatrix" and not self.systemmatrix_moeglich(
+                len(self.image_r), len(alpha_r)):
+            self.animation_r_finish(True)
+            return
         # hier Thread da rechenaufwendig
-        self.calculate_rueck = Rueckwaertsprojektion(self.sinogramm_filter,
-                                                     self.image_r, alpha_r)
+        if self.radio_iterativ.isChecked():
+            # Bild wird nach jeder Teilmenge in image_r aktualisiert
+            self.calculate_rueck = Iterationsrekonstruktion(
+                self.sinogramm_filter, self.image_r, alpha_r,
+                self.winkel_max, projektor, self.sb_iterationen.value(),
+                self.sb_teilmengen.value())
+            self.status_starten(len(alpha_r) * self.sb_iterationen.value())
+        else:
+            self.calculate_rueck = Rueckwaertsprojektion(
+                self.sinogramm_filter, self.image_r, alpha_r,
+                self.winkel_max, projektor,
+                threads=self.sb_threads.value(), sicherung=True,
+                laenge_original=self.laenge_original)
+            # abgebrochene Berechnung mit denselben Einstellungen fortsetzen
+            if self.fortsetzen_anbieten(self.calculate_rueck.rechnung):
+                self.img3.setImage(self.image_r)
+            self.status_starten(len(alpha_r), np.count_nonzero(
+                self.calculate_rueck.rechnung.erledigt) / len(alpha_r))
+        # grobe Vorschau vor der vollen Aufloesung (iterativ mit wenigen
+        # Iterationen, das Ergebnis dient als Startbild)
+        if self.vorschau_r.isChecked():
+            iterationen = 0
+            if self.radio_iterativ.isChecked():
+                iterationen = min(self.sb_iterationen.value(), 3)
+            self.calculate_rueck.vorschau = vorschau_stufen(
+                self.sinogramm, alpha_r,
+                partial(vorschau_rekonstruktion, winkel_max=self.winkel_max,
+                        filterart=self.currentchoice, iterationen=iterationen,
+                        teilmengen=self.sb_teilmengen.value()))
+            self.calculate_rueck.signal_vorschau.connect(
+                self.vorschau_anzeigen)
         # Auswahl ob mit oder ohne Animation auf grafischen Oberfläche
         animation_rueck = self.ani_r.isChecked()
         # mit Animation
@@ -625,12 +746,13 @@ class Gui(QtWidgets.QWidget):
         if fileName:
             # Speichern der Daten
             with open(fileName, "wb") as file:
-                np.save(file, self.self.image_r)
+                np.save(file, self.image_r)
 
     def clearButtonPress(self):
         """ Löscht alle vorher erzeugten/geladenen Bilder. """
         self.img1.clear()
         self.img2.clear()
+        self.sino_kacheln_entfernen()
         self.img3.clear()
         self.img4.clear()
         self.data = None
@@ -648,6 +770,156 @@ class Gui(QtWidgets.QWidget):
         if self.calculate_rueck is not None:
             self.calculate_rueck.breaking = True
 
+    def fortsetzen_anbieten(self, rechnung):
+        """
+        Bietet an, eine abgebrochene Berechnung mit denselben Einstellungen
+        fortzusetzen. Bei Ablehnung wird deren Sicherung verworfen.
+
+        Parameters
+        ----------
+        rechnung: Vorwaertsrechnung oder Rueckwaertsrechnung.
+
+        Return
+        ----------
+        True, falls fortgesetzt wird.
+        """
+        if not rechnung.sicherung.vorhanden():
+            return False
+        antwort = QMessageBox.question(
+            self, "Fortsetzen",
+            "Eine abgebrochene Berechnung mit denselben Einstellungen "
+            "wurde gefunden.\nSoll sie fortgesetzt werden?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        if antwort == QMessageBox.Yes:
+            rechnung.fortsetzen()
+            return True
+        rechnung.sicherung.loeschen()
+        return False
+
+    def messungButtonPress(self, aktiv):
+        """ Schaltet die Messung der Verarbeitungsstufen ein oder aus, beim
+            Einschalten werden fruehere Messungen verworfen. """
+        if aktiv:
+            messprotokoll.zuruecksetzen()
+        messprotokoll.aktiv = aktiv
+
+    def geometrie_speichernButtonPress(self, aktiv):
+        """ Schaltet die Ablage der Drehgeometrien (und Systemmatrizen) auf
+            der Festplatte ein oder aus. """
+        geometrie_cache.verzeichnis_setzen(GEOMETRIE_VERZEICHNIS if aktiv
+                                           else None)
+
+    def messung_speichernButtonPress(self):
+        """
+        In einem sich oeffnenden file dialog kann die Messung als JSON
+        (Zeiten, Zaehler, Histogramm der Dauer je Winkel, Ablaufprotokoll)
+        oder CSV (nur Ablaufprotokoll) gespeichert werden.
+        """
+        options = QFileDialog.Options()
+        options |= QFileDialog.DontUseNativeDialog
+        fileName, filter_datei = QFileDialog.getSaveFileName(
+            self, "Save Messung", "",
+            "Messung JSON (*.json);;Ablaufprotokoll CSV (*.csv)",
+            options=options)
+        if fileName:
+            endung = ".csv" if "csv" in filter_datei else ".json"
+            if not fileName.lower().endswith(endung):
+                fileName += endung
+            messprotokoll.exportieren(fileName)
+
+    def profilButtonPress(self, aktiv):
+        """ Fordert ein cProfile der naechsten Berechnung an (oder nimmt die
+            Anforderung zurueck). """
+        messprotokoll.profil_datei = None
+        if not aktiv:
+            return
+        options = QFileDialog.Options()
+        options |= QFileDialog.DontUseNativeDialog
+        fileName, _ = QFileDialog.getSaveFileName(
+            self, "Save Profil", "", "cProfile (*.prof)", options=options)
+        if not fileName:
+            self.profil.setChecked(False)
+            return
+        if not fileName.endswith(".prof"):
+            fileName += ".prof"
+        messprotokoll.profil_datei = fileName
+
+    def systemmatrix_moeglich(self, laenge, angle_steps, ordnung=1):
+        """ Prueft vor dem Start, ob die Systemmatrix in den Speicher
+            passt, sonst Meldung und False. """
+        try:
+            systemmatrix_pruefen(laenge, angle_steps, ordnung)
+        except ValueError as fehler:
+            QMessageBox.warning(self, "Systemmatrix", str(fehler))
+            return False
+        return True
+
+    def status_starten(self, anzahl_winkel, anteil=0.0, hinweis=None):
+        """
+        Merkt sich den Beginn einer Berechnung fuer die Anzeige von
+        Winkel/s und Restzeit in der Statusleiste.
+
+        Parameters
+        ----------
+        anzahl_winkel: Anzahl zu berechnender Winkel (iterativ: Winkel mal
+        Iterationen).
+
+        anteil: bereits erledigter Anteil (beim Fortsetzen).
+
+        hinweis: optionaler Text, der bis zum Ende der Berechnung mit
+        angezeigt wird.
+        """
+        self.status_beginn = time.perf_counter()
+        self.status_winkel = anzahl_winkel
+        self.status_anteil = anteil
+        self.status_hinweis = hinweis
+        self.status_zeigen("Berechnung läuft ...")
+
+    def status_zeigen(self, text):
+        """ Zeigt text (und ggf. den Hinweis der Berechnung) in der
+            Statusleiste. """
+        if self.status_hinweis:
+            text += " – " + self.status_hinweis
+        self.statusleiste.showMessage(text)
+
+    def status_anzeigen(self, anteil):
+        """
+        Zeigt Winkel/s und geschaetzte Restzeit in der Statusleiste.
+
+        Parameters
+        ----------
+        anteil: erledigter Anteil der Berechnung (0 bis 1).
+        """
+        if self.status_beginn is None:
+            return
+        vergangen = time.perf_counter() - self.status_beginn
+        neu = anteil - self.status_anteil
+        if neu <= 0 or vergangen <= 0:
+            return
+        self.status_zeigen(
+            "{:.1f} Winkel/s, noch ca. {:.0f} s".format(
+                neu * self.status_winkel / vergangen,
+                max(0, vergangen * (1 - anteil) / neu)))
+
+    def status_beenden(self, abgebrochen):
+        """ Zeigt Dauer und Winkel/s der beendeten Berechnung (und ob ein
+            Profil gespeichert wurde). """
+        if self.status_beginn is None:
+            return
+        vergangen = time.perf_counter() - self.status_beginn
+        self.status_beginn = None
+        if abgebrochen:
+            text = "Berechnung abgebrochen nach {:.1f} s".format(vergangen)
+        else:
+            winkel = (1 - self.status_anteil) * self.status_winkel
+            text = "{:.0f} Winkel in {:.1f} s ({:.1f} Winkel/s)".format(
+                winkel, vergangen, winkel / max(vergangen, 1e-9))
+        # Profil gilt nur fuer eine Berechnung
+        if self.profil.isChecked() and messprotokoll.profil_datei is None:
+            self.profil.setChecked(False)
+            text += ", Profil gespeichert"
+        self.status_zeigen(text)
+
     def activate_cb_filter(self):
         """ Zusammenspiel activate- inactivate Auswahl an Filtern. """
         self.cb_filter.setEnabled(True)
@@ -656,13 +928,121 @@ class Gui(QtWidgets.QWidget):
         """ Zusammenspiel activate- inactivate Auswahl an Filtern. """
         self.cb_filter.setEnabled(False)
 
-    def animation_cttisch(self):
+    def fps_aendern(self, fps):
+        """ Uebernimmt die maximale Bildrate fuer alle Animationen. """
+        for takt in (self.takt_sino, self.takt_cttisch, self.takt_r):
+            takt.set_fps(fps)
+
+    def cttisch_erstellen(self):
+        """
+        Stellt das vergroeßerte Originalbild dar und legt den CT-Tisch als
+        Rechteck darueber. Waehrend der Animation wird nur das Rechteck
+        gedreht, das Bild selbst muss dafuer nicht neu berechnet werden.
+        """
+        laenge = len(self.data)
+        rand = (len(self.data_gross) - laenge) // 2
+        # Tisch: zwei Pixel dick, um ein Zehntel der Bildgroeße unterhalb
+        # des Originalbildes
+        self.cttisch = QtWidgets.QGraphicsRectItem(
+            rand, rand + laenge - 3 + laenge // 10, laenge, 2)
+        # Drehung um Mitte des mittleren Pixels (wie in drehung)
+        mitte = len(self.data_gross) // 2 + 0.5
+        self.cttisch.setTransformOriginPoint(mitte, mitte)
+        self.cttisch.setBrush(pyqtgraph.mkBrush("w"))
+        self.cttisch.setPen(pyqtgraph.mkPen(None))
+        self.view1.addItem(self.cttisch)
+        self.img1.setImage(self.data_gross)
+
+    def cttisch_entfernen(self):
+        """ Entfernt CT-Tisch und stellt Originalbild wieder dar. """
+        if self.cttisch is not None:
+            self.view1.removeItem(self.cttisch)
+            self.cttisch = None
+            self.img1.setImage(self.data)
+
+    def animation_cttisch(self, alpha):
         """ Animiert CT-Tisch während Vorwärtsprojektion. """
-        self.img1.setImage(self.data_gms)
+        self.alpha_cttisch = alpha
+        self.takt_cttisch.anfordern()
+
+    def zeichnen_cttisch(self):
+        """ Dreht CT-Tisch auf aktuellen Winkel. """
+        if self.cttisch is not None:
+            self.cttisch.setRotation(-self.alpha_cttisch)
+
+    def animation(self, start, stop):
+        """
+        Animiert Erstellung Sinogramm während Vorwärtsprojektion.
 
-    def animation(self):
-        """ Animiert Erstellung Sinogramm während Vorwärtsprojektion. """
-        self.img2.setImage(self.sinogramm)
+        Parameters
+        ----------
+        start, stop: seit dem letzten Bild neu berechnete Zeilen.
+        """
+        if self.zeilen_geaendert is None:
+            self.zeilen_geaendert = (start, stop)
+        else:
+            self.zeilen_geaendert = (min(start, self.zeilen_geaendert[0]),
+                                     max(stop, self.zeilen_geaendert[1]))
+        self.takt_sino.anfordern()
+
+    def sino_kacheln_erstellen(self):
+        """
+        Legt das angezeigte Sinogramm als Stapel von Kacheln zu je
+        SINO_KACHEL Zeilen an. Waehrend der Animation werden nur Kacheln mit
+        geaenderten Zeilen neu gezeichnet statt des ganzen Sinogramms.
+        """
+        self.sino_kacheln_entfernen()
+        anzahl, laenge = self.sinogramm_anzeige.shape
+        for start in range(0, anzahl, SINO_KACHEL):
+            kachel = pyqtgraph.ImageItem()
+            kachel.setOpts(axisOrder='row-major')
+            kachel.setPos(0, start)
+            self.view2.addItem(kachel)
+            self.sino_kacheln.append(kachel)
+        # Bildausschnitt fest, solange noch nicht alle Kacheln gefuellt sind
+        self.view2.setRange(QtCore.QRectF(0, 0, laenge, anzahl), padding=0)
+
+    def sino_kacheln_entfernen(self):
+        """ Entfernt die Kacheln der Sinogramm-Animation. """
+        for kachel in self.sino_kacheln:
+            self.view2.removeItem(kachel)
+        self.sino_kacheln = []
+        self.view2.enableAutoRange()
+
+    def zeichnen_sinogramm(self):
+        """ Uebernimmt nur die geaenderten Zeilen ins angezeigte Sinogramm
+            und zeichnet nur deren Kacheln neu, mit festen Grauwerten (ohne
+            Autoskalierung). Waechst der Wertebereich, werden alle Kacheln
+            mit den neuen Grauwerten gezeichnet. """
+        if self.zeilen_geaendert is None:
+            return
+        start, stop = self.zeilen_geaendert
+        self.zeilen_geaendert = None
+        with messprotokoll.stufe("zeichnen_sinogramm"):
+            zeilen = self.sinogramm[start:stop]
+            # Wertebereich nur aus den neuen Zeilen fortschreiben
+            levels = (np.min(zeilen), np.max(zeilen))
+            if self.levels_sino is not None:
+                levels = (min(self.levels_sino[0], levels[0]),
+                          max(self.levels_sino[1], levels[1]))
+            if levels != self.levels_sino:
+                self.levels_sino = levels
+                for kachel in self.sino_kacheln:
+                    if kachel.image is not None:
+                        kachel.setLevels(levels)
+            for nummer in range(start // SINO_KACHEL,
+                                (stop - 1) // SINO_KACHEL + 1):
+                a = nummer * SINO_KACHEL
+                b = a + SINO_KACHEL
+                neu = self.sinogramm[max(a, start):min(b, stop)]
+                alt = self.sinogramm_anzeige[max(a, start):min(b, stop)]
+                kachel = self.sino_kacheln[nummer]
+                # z.B. nur gespiegelte Zeilen am anderen Ende des Bereichs
+                if kachel.image is not None and np.array_equal(alt, neu):
+                    continue
+                alt[:] = neu
+                kachel.setImage(self.sinogramm_anzeige[a:b],
+                                autoLevels=False, levels=self.levels_sino)
 
     def animation_finish(self, abgebrochen):
         """
@@ -673,13 +1053,17 @@ class Gui(QtWidgets.QWidget):
         abgebrochen: Datentyp bool (True or False), unterscheidet Vorgehen,
         ob aktuelle Berechung mit abgebrochen wurde oder nicht.
         """
+        self.takt_sino.beenden()
+        self.takt_cttisch.beenden()
+        self.cttisch_entfernen()
+        self.sino_kacheln_entfernen()
+        self.status_beenden(abgebrochen)
         if abgebrochen:
             self.groupBox_vor.setEnabled(True)
             self.groupBox_rueck.setEnabled(False)
             self.saveSino.setEnabled(False)
             self.progress_sino.reset()
             self.img2.clear()
-            self.img1.setImage(self.data)
         else:
             self.progress_sino.setValue(self.progress_sino.maximum())
             self.img2.setImage(self.sinogramm)
@@ -701,11 +1085,17 @@ class Gui(QtWidgets.QWidget):
         ----------
         alpha: aktueller Berechnungsschritt (Winkel).
         """
-        self.progress_sino.setValue(alpha)
+        self.progress_sino.setValue(int(alpha))
+        self.status_anzeigen(alpha / self.progress_sino.maximum())
 
     def animation_r(self):
         """ Animiert Rückprojektion. """
-        self.img3.setImage(self.image_r)
+        self.takt_r.anfordern()
+
+    def zeichnen_r(self):
+        """ Zeichnet aktuellen Stand der Rückprojektion. """
+        with messprotokoll.stufe("zeichnen_r"):
+            self.img3.setImage(self.image_r)
 
     def animation_r_finish(self, abgebrochen):
         """
@@ -716,6 +1106,8 @@ class Gui(QtWidgets.QWidget):
         abgebrochen: Datentyp bool (True or False), unterscheidet Vorgehen,
         ob aktuelle Berechung mit abgebrochen wurde oder nicht.
         """
+        self.takt_r.beenden()
+        self.status_beenden(abgebrochen)
         if abgebrochen:
             self.progress_img_r.reset()
             self.img3.clear()
@@ -726,19 +1118,18 @@ class Gui(QtWidgets.QWidget):
                 self.groupBox_vor.setEnabled(True)
         else:
             self.progress_img_r.setValue(self.progress_img_r.maximum())
-            # durch vorherige Vorwärtsprojektion (dabei wurde Ursprungsbild
-            # fuer eine verlustfreie Drehung vergroeßert) ist um
-            # rueckprojeziertes Bild ein Kreis
-            # dieser wird nun entfernt
-            diff = (len(self.image_r) - self.laenge_original) // 2
-            self.image_r = self.image_r[diff:self.laenge_original+diff,
-                           diff:self.laenge_original+diff]
+            # Kreis um rueckprojiziertes Bild entfernen
+            with messprotokoll.stufe("zuschneiden"):
+                self.image_r = zuschneiden(self.image_r,
+                                           self.laenge_original)
             # Rückprojektion darstellen auf grafischer Oberflaeche
             self.img3.setImage(self.image_r)
             # Differenzbild ezeugen und grafisch darstellen
             if self.data is not None:
                 # Skalieren
-                self.image_r_scal = rescale(self.data, np.copy(self.image_r))
+                with messprotokoll.stufe("rescale"):
+                    self.image_r_scal = rescale(self.data,
+                                                np.copy(self.image_r))
                 self.groupBox_vor.setEnabled(True)
                 self.diff_img = np.abs(self.data - self.image_r_scal)
                 self.img4.setImage(self.diff_img, levels=(np.min(self.data),
@@ -758,7 +1149,22 @@ class Gui(QtWidgets.QWidget):
         ----------
         i: aktueller Berechnungsschritt
         """
-        self.progress_img_r.setValue(i)
+        self.progress_img_r.setFormat("%p%")
+        self.progress_img_r.setValue(int(i))
+        self.status_anzeigen(i / self.progress_img_r.maximum())
+
+    def vorschau_anzeigen(self, faktor, bild):
+        """
+        Zeigt eine Vorschau der Rekonstruktion.
+
+        Parameters
+        ----------
+        faktor: Verkleinerungsfaktor der Vorschau.
+
+        bild: auf volle Groeße vergroeßertes Vorschaubild.
+        """
+        self.progress_img_r.setFormat("Vorschau 1/{}".format(faktor))
+        self.img3.setImage(bild)
 
 
 def main():
@@ -772,66 +1178,107 @@ def main():
 class Vorwaertsprojektion(QtCore.QThread):
     # Signale, welche während Projektion erstellt werden
     signal = QtCore.pyqtSignal(float)
+    # neu berechnete Sinogrammzeilen (start, stop)
+    signal_zeilen = QtCore.pyqtSignal(int, int)
     signal_finish = QtCore.pyqtSignal(bool)
 
-    def __init__(self, data_gms, angle_value, cttisch, data_gross, angle_steps,
-                 sinogramm, animation):
+    def __init__(self, angle_value, data_gross, angle_steps, sinogramm,
+                 ordnung=3, speicher_budget=SPEICHER_BUDGET,
+                 projektor="Rotation", prozesse=1, sicherung=False):
         super().__init__()
-        self.data_gms = data_gms
-        self.angle_value = angle_value
-        self.data_gross = data_gross
-        self.angle_steps = angle_steps
-        self.sinogramm = sinogramm
-        self.cttisch = cttisch
-        self.animation = animation
+        # eigentliche Berechnung im Rechenkern
+        self.rechnung = Vorwaertsrechnung(data_gross, angle_value,
+                                          angle_steps, sinogramm, ordnung,
+                                          speicher_budget, projektor,
+                                          prozesse, sicherung)
         # Abbruch
         self.breaking = False
 
     def run(self):
-        # Anzahl an Winkelschritten
-        numbers_angle = np.linspace(0, self.angle_value, self.angle_steps,
-                                    endpoint=False)
-        for count, alpha in enumerate(numbers_angle):
-            # Drehung
-            data_transform = drehung(self.data_gross, alpha)
-            # Bildung von Linienintegralen fuer einzelnen Rotationswinkel
-            linienintegral = np.sum(data_transform, axis=0)
-            self.sinogramm[count] = linienintegral
-            if self.animation:
-                cttisch_dreh = drehung(self.cttisch, -alpha)
-                self.data_gms[:] = self.data_gross + cttisch_dreh
+        abgebrochen = messprotokoll.profilieren(self.rechnung.berechnen,
+                                                self.fortschritt)
+        self.signal_finish.emit(abgebrochen)
+
+    def fortschritt(self, alpha):
+        """ Meldet Fortschritt an Oberflaeche, True bei Abbruch. """
+        with messprotokoll.stufe("signale"):
+            self.signal_zeilen.emit(*self.rechnung.zeilen)
             self.signal.emit(alpha)
-            if self.breaking:
-                self.signal_finish.emit(True)
-                return
-        self.signal_finish.emit(False)
+        return self.breaking
 
 
-class Rueckwaertsprojektion(QtCore.QThread):
+class Rekonstruktionsthread(QtCore.QThread):
+    """ Gemeinsamer Ablauf der Rekonstruktionen: optional eine grobe
+        Vorschau, danach die eigentliche Rechnung (self.rechnung). """
     # Signale, welche wäährend Projektion erstellt werden
     signal = QtCore.pyqtSignal(float)
     signal_finish = QtCore.pyqtSignal(float)
+    # Vorschau: Verkleinerungsfaktor, Bild in voller Groeße
+    signal_vorschau = QtCore.pyqtSignal(int, object)
 
-    def __init__(self, sinogramm_filter, image_r, alpha_r):
+    def __init__(self):
         super().__init__()
-        self.sinogramm_filter = sinogramm_filter
-        self.image_r = image_r
-        self.alpha_r = alpha_r
         # Abbruch
         self.breaking = False
+        # Generator der Vorschau (siehe vorschau_stufen) oder None
+        self.vorschau = None
 
     def run(self):
-        for i in range(len(self.sinogramm_filter)):
-            sino2d = self.sinogramm_filter[i] * np.ones_like(self.image_r)
-            # Drehung
-            sino2d_transform = drehung(sino2d, -self.alpha_r[i])
-            self.image_r += sino2d_transform
-            self.signal.emit(self.alpha_r[i])
-            if self.breaking:
-                self.signal_finish.emit(True)
-                return
-        self.signal_finish.emit(False)
+        bild = None
+        if self.vorschau is not None:
+            for faktor, bild in self.vorschau:
+                if self.breaking:
+                    break
+                self.signal_vorschau.emit(faktor, bild)
+        if self.breaking:
+            self.signal_finish.emit(True)
+            return
+        self.vorschau_uebernehmen(bild)
+        abgebrochen = messprotokoll.profilieren(self.rechnung.berechnen,
+                                                self.fortschritt)
+        self.signal_finish.emit(abgebrochen)
+
+    def vorschau_uebernehmen(self, bild):
+        """ Feinste Vorschau fuer die volle Rechnung nutzen (hier nicht,
+            die Rueckprojektion beginnt immer bei Null). """
+
+    def fortschritt(self, alpha):
+        """ Meldet Fortschritt an Oberflaeche, True bei Abbruch. """
+        with messprotokoll.stufe("signale"):
+            self.signal.emit(alpha)
+        return self.breaking
+
+
+class Rueckwaertsprojektion(Rekonstruktionsthread):
+
+    def __init__(self, sinogramm_filter, image_r, alpha_r, winkel_max=180,
+                 projektor="Rotation", ordnung=1,
+                 speicher_budget=SPEICHER_BUDGET, threads=1, intervall=0.2,
+                 sicherung=False, laenge_original=None):
+        super().__init__()
+        # eigentliche Berechnung im Rechenkern
+        self.rechnung = Rueckwaertsrechnung(sinogramm_filter, image_r,
+                                            alpha_r, winkel_max, projektor,
+                                            ordnung, speicher_budget,
+                                            threads, intervall, sicherung,
+                                            laenge_original=laenge_original)
+
+
+class Iterationsrekonstruktion(Rekonstruktionsthread):
+
+    def __init__(self, sinogramm, image_r, alpha_r, winkel_max=180,
+                 projektor="Rotation", iterationen=10, teilmengen=10):
+        super().__init__()
+        # eigentliche Berechnung im Rechenkern
+        self.rechnung = Iterationsrechnung(sinogramm, image_r, alpha_r,
+                                           winkel_max, projektor,
+                                           iterationen, teilmengen)
+
+    def vorschau_uebernehmen(self, bild):
+        """ Vergroeßerte Vorschau als Startbild der Iterationen. """
+        if bild is not None:
+            self.rechnung.image_r[:] = bild
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,313 @@
+"""
+    Stapelverarbeitung fuer "Wir basteln uns einen CT" ohne grafische
+    Oberflaeche: erzeugt aus vielen CT-Bildern (.npy) Sinogramme (.milu)
+    und rekonstruierte Bilder.
+
+    Beispiel:
+        python ct_batch.py schichten/ --ausgabe ergebnisse --winkel 360 \
+            --schritte 200 --filter Hamming --prozesse 8
+
+    Volumen (3D-.npy oder Verzeichnis mit einer Datei je Schicht):
+        python ct_batch.py scan.npy --volumen --fenster 16 --ausgabe erg
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+import numpy as np
+
+from rechenkern import (FILTER, GENAUIGKEITEN, INTERPOLATIONEN, PROJEKTOREN,
+                        GEOMETRIE_VERZEICHNIS, RUECKPROJEKTOREN,
+                        TEXTBILD_ENDUNG, Iterationsrechnung,
+                        Rueckwaertsrechnung, Volumenrechnung,
+                        Vorwaertsrechnung, bild_laden,
+                        drehung_vorverarbeitung, filtern,
+                        fourier_rekonstruktion, geometrie_cache, ist_bilddatei,
+                        messprotokoll, schichten_oeffnen,
+                        sinogramm_speichern, systemmatrix_hinweis,
+                        systemmatrix_pruefen, zuschneiden)
+
+
+def dateien_suchen(eingaben):
+    """
+    Sammelt alle CT-Bilder (.npy und .strings_mit_CRLF) aus
+    Verzeichnissen, Mustern (glob) und einzelnen Dateinamen. Die von
+    bild_laden abgelegten .npy-Kopien der Textbilder werden ausgelassen.
+
+    Parameters
+    ----------
+    eingaben: Liste von Verzeichnissen, Mustern oder Dateien. Textbilder
+              werden nur erfasst, wenn nicht auch das gleichnamige .npy
+              daneben erfasst wird (gleiches Bild, gleiche Ausgabe).
+    """
+    dateien = []
+    for eingabe in eingaben:
+        if os.path.isdir(eingabe):
+            eingabe = os.path.join(eingabe, "*")
+        dateien += [datei for datei in sorted(glob.glob(eingabe))
+                    if ist_bilddatei(datei)]
+    # doppelte Dateien nur einmal verarbeiten
+    dateien = list(dict.fromkeys(dateien))
+    vorhanden = set(dateien)
+    return [datei for datei in dateien
+            if not datei.endswith(TEXTBILD_ENDUNG) or
+            datei[:-len(TEXTBILD_ENDUNG)] + ".npy" not in vorhanden]
+
+
+def ausgabe_name(dateiname):
+    """ Name der Ausgabedateien (ohne Endung) fuer ein Bild. """
+    return os.path.splitext(os.path.basename(os.path.normpath(dateiname)))[0]
+
+
+def iterativ_projektor(laenge, angle_steps):
+    """
+    Standardprojektor fuer --iterativ: die Systemmatrix (nach dem Aufbau
+    ein Vielfaches schneller als Drehung, bei weiteren Bildern gleicher
+    Groeße wiederverwendet), falls sie in den Speicher passt, sonst
+    Drehung.
+    """
+    try:
+        systemmatrix_pruefen(laenge, angle_steps)
+    except ValueError as fehler:
+        print("Hinweis: {}, iterativ mit Rotation".format(fehler),
+              file=sys.stderr)
+        return "Rotation"
+    return "Systemmatrix"
+
+
+def verarbeiten(dateiname, args):
+    """
+    Vorwaertsprojektion und Rekonstruktion eines einzelnen Bildes.
+
+    Parameters
+    ----------
+    dateiname: Pfad zum CT-Bild (.npy oder .strings_mit_CRLF).
+
+    args: Kommandozeilenparameter (siehe parser).
+    """
+    name = ausgabe_name(dateiname)
+    data = bild_laden(dateiname)
+    laenge_original = len(data)
+    # Vorverarbeitung fuer Drehung
+    dtype = GENAUIGKEITEN[args.genauigkeit]
+    with messprotokoll.stufe("drehung_vorverarbeitung"):
+        data_gross = drehung_vorverarbeitung(data, dtype)
+    sinogramm = np.zeros([args.schritte, len(data_gross)], dtype=dtype)
+    rechnung = Vorwaertsrechnung(data_gross, args.winkel, args.schritte,
+                                 sinogramm, INTERPOLATIONEN[args.interpolation],
+                                 projektor=args.projektor,
+                                 prozesse=args.prozesse,
+                                 sicherung=args.fortsetzen)
+    if args.fortsetzen and rechnung.sicherung.vorhanden():
+        rechnung.fortsetzen()
+    rechnung.berechnen()
+    sinogramm_speichern(os.path.join(args.ausgabe, name + ".milu"),
+                        sinogramm, laenge_original, args.winkel,
+                        komprimieren=args.komprimieren)
+    if args.nur_sinogramm:
+        return
+    if args.fourier:
+        image_r = fourier_rekonstruktion(sinogramm, args.winkel)
+        np.save(os.path.join(args.ausgabe, name + "_reko.npy"),
+                zuschneiden(image_r, laenge_original))
+        return
+    if args.iterativ:
+        projektor = args.rueckprojektor or iterativ_projektor(len(data_gross),
+                                                              args.schritte)
+        image_r = np.zeros((len(sinogramm[0]), len(sinogramm[0])), dtype=dtype)
+        rechnung = Iterationsrechnung(sinogramm, image_r,
+                                      np.linspace(0, args.winkel,
+                                                  len(sinogramm),
+                                                  endpoint=False),
+                                      args.winkel, projektor,
+                                      args.iterationen, args.teilmengen,
+                                      sicherung=args.fortsetzen,
+                                      laenge_original=laenge_original)
+        if args.fortsetzen and rechnung.sicherung.vorhanden():
+            rechnung.fortsetzen()
+        rechnung.berechnen()
+        np.save(os.path.join(args.ausgabe, name + "_reko.npy"),
+                zuschneiden(image_r, laenge_original))
+        return
+    filterart = None if args.filter == "keiner" else args.filter
+    with messprotokoll.stufe("filtern"):
+        sinogramm_filter = filtern(sinogramm, filterart)
+    alpha_r = np.linspace(0, args.winkel, len(sinogramm_filter),
+                          endpoint=False)
+    image_r = np.zeros((len(sinogramm_filter[0]), len(sinogramm_filter[0])),
+                       dtype=dtype)
+    rechnung = Rueckwaertsrechnung(sinogramm_filter, image_r, alpha_r,
+                                   args.winkel,
+                                   args.rueckprojektor or "Rotation",
+                                   threads=args.threads or 1,
+                                   sicherung=args.fortsetzen,
+                                   laenge_original=laenge_original)
+    if args.fortsetzen and rechnung.sicherung.vorhanden():
+        rechnung.fortsetzen()
+    rechnung.berechnen()
+    np.save(os.path.join(args.ausgabe, name + "_reko.npy"),
+            zuschneiden(image_r, laenge_original))
+
+
+def volumen_verarbeiten(eingabe, args):
+    """
+    Vorwaertsprojektion und gefilterte Rueckprojektion eines Volumens,
+    Ergebnisse als <name>_sinogramme.npy und <name>_volumen.npy.
+
+    Parameters
+    ----------
+    eingabe: 3D-.npy oder Verzeichnis mit einer Datei je Schicht.
+
+    args: Kommandozeilenparameter (siehe parser).
+    """
+    name = ausgabe_name(eingabe)
+    schichten = schichten_oeffnen(eingabe)
+    rechnung = Volumenrechnung(
+        schichten, args.winkel, args.schritte,
+        None if args.filter == "keiner" else args.filter,
+        INTERPOLATIONEN[args.interpolation], args.projektor,
+        args.rueckprojektor or "Rotation", args.fenster,
+        GENAUIGKEITEN[args.genauigkeit],
+        os.path.join(args.ausgabe, name + "_sinogramme.npy"),
+        os.path.join(args.ausgabe, name + "_volumen.npy"),
+        rekonstruieren=not args.nur_sinogramm)
+
+    def fortschritt(fertig):
+        print("  {}/{} Schichten".format(fertig, len(schichten)))
+
+    rechnung.berechnen(fortschritt)
+
+
+def parser():
+    """ Kommandozeilenparameter der Stapelverarbeitung. """
+    parser = argparse.ArgumentParser(
+        description="Sinogramme und Rekonstruktionen fuer viele CT-Bilder "
+                    "ohne grafische Oberflaeche berechnen.")
+    parser.add_argument("eingabe", nargs="+",
+                        help="Verzeichnisse, Muster (glob), .npy- oder "
+                             ".strings_mit_CRLF-Dateien")
+    parser.add_argument("--ausgabe", default=".",
+                        help="Zielverzeichnis fuer .milu und _reko.npy")
+    parser.add_argument("--winkel", type=int, choices=(180, 360), default=180,
+                        help="Winkelbereich der Projektion in Grad")
+    parser.add_argument("--schritte", type=int, default=60,
+                        help="Anzahl der Winkelschritte")
+    parser.add_argument("--filter", choices=FILTER + ("keiner",),
+                        default="Ramp", help="Filter der Rueckprojektion")
+    parser.add_argument("--fourier", action="store_true",
+                        help="direkte Fourier-Rekonstruktion statt "
+                             "(gefilterter) Rueckprojektion")
+    parser.add_argument("--iterativ", action="store_true",
+                        help="iterative Rekonstruktion (SART mit Teilmengen)")
+    parser.add_argument("--iterationen", type=int, default=10,
+                        help="maximale Anzahl Iterationen (--iterativ)")
+    parser.add_argument("--teilmengen", type=int, default=10,
+                        help="Anzahl Teilmengen der Winkel (--iterativ)")
+    parser.add_argument("--interpolation", choices=tuple(INTERPOLATIONEN),
+                        default="kubisch",
+                        help="Interpolation der Drehung (Vorwaertsprojektion)")
+    parser.add_argument("--projektor", choices=PROJEKTOREN,
+                        default="Rotation",
+                        help="Projektor der Vorwaertsprojektion")
+    parser.add_argument("--rueckprojektor", choices=RUECKPROJEKTOREN,
+                        help="Projektor der Rueckprojektion (Standard: "
+                             "Rotation, mit --iterativ Systemmatrix, falls "
+                             "sie in den Speicher passt)")
+    parser.add_argument("--genauigkeit", choices=tuple(GENAUIGKEITEN),
+                        default="float64",
+                        help="Rechengenauigkeit der gesamten Verarbeitung")
+    parser.add_argument("--prozesse", type=int, default=1,
+                        help="Prozesse fuer die Vorwaertsprojektion")
+    parser.add_argument("--threads", type=int,
+                        help="Threads fuer die (gefilterte) Rueckprojektion "
+                             "(Standard: 1, nicht mit --iterativ/--fourier)")
+    parser.add_argument("--komprimieren", action="store_true",
+                        help="Sinogramme blockweise mit zlib packen")
+    parser.add_argument("--fortsetzen", action="store_true",
+                        help="Zwischenstaende sichern und unterbrochene "
+                             "Berechnungen (z.B. nach Strg+C) fortsetzen "
+                             "(mit --fourier nur die Projektion, die "
+                             "Rekonstruktion ist ein einziger Schritt)")
+    parser.add_argument("--nur-sinogramm", action="store_true",
+                        help="nur Sinogramme erzeugen, keine Rekonstruktion")
+    parser.add_argument("--volumen", action="store_true",
+                        help="jede Eingabe ist ein Volumen (3D-.npy oder "
+                             "Verzeichnis mit einer Datei je Schicht)")
+    parser.add_argument("--fenster", type=int, default=8,
+                        help="Schichten gleichzeitig im Speicher (--volumen)")
+    parser.add_argument("--geometrie-cache", type=int,
+                        default=geometrie_cache.obergrenze // 2 ** 20,
+                        help="hoechstens so viel Arbeitsspeicher (MB) fuer "
+                             "zwischengespeicherte Drehgeometrien waehrend "
+                             "einer Projektion (danach wieder %d MB)"
+                             % (geometrie_cache.max_bytes // 2 ** 20))
+    parser.add_argument("--geometrie-verzeichnis", nargs="?",
+                        const=GEOMETRIE_VERZEICHNIS,
+                        help="Drehgeometrien und Systemmatrizen in diesem "
+                             "Verzeichnis speichern und bei spaeteren Laeufen "
+                             "wieder laden (ohne Angabe: %(const)s)")
+    parser.add_argument("--messung",
+                        help="Zeiten je Verarbeitungsstufe und je Winkel "
+                             "messen und als JSON (oder .csv: "
+                             "Ablaufprotokoll) speichern")
+    parser.add_argument("--profil",
+                        help="gesamten Lauf mit cProfile aufzeichnen und "
+                             "die Statistik hier speichern (.prof)")
+    return parser
+
+
+def alle_verarbeiten(dateien, args):
+    """ Verarbeitet alle Dateien (bzw. Volumen) nacheinander mit
+        Fortschrittsausgabe. """
+    for nummer, dateiname in enumerate(dateien, 1):
+        beginn = time.perf_counter()
+        if args.volumen:
+            volumen_verarbeiten(dateiname, args)
+        else:
+            verarbeiten(dateiname, args)
+        print("[{}/{}] {} ({:.1f} s)".format(nummer, len(dateien), dateiname,
+                                             time.perf_counter() - beginn))
+
+
+def main(argv=None):
+    kommandozeile = parser()
+    args = kommandozeile.parse_args(argv)
+    if args.threads is not None and (args.iterativ or args.fourier):
+        kommandozeile.error("--threads gilt nur fuer die (gefilterte) "
+                            "Rueckprojektion, nicht fuer --iterativ oder "
+                            "--fourier")
+    # Volumen: Verzeichnisse sind selbst Volumen, nicht Sammlungen von Bildern
+    dateien = args.eingabe if args.volumen else dateien_suchen(args.eingabe)
+    if not dateien:
+        print("Keine Bilder gefunden.", file=sys.stderr)
+        return 1
+    # verschiedene Bilder duerfen sich die Ausgabedateien nicht teilen
+    namen = {}
+    for dateiname in dateien:
+        namen.setdefault(ausgabe_name(dateiname), []).append(dateiname)
+    doppelt = [gleich for gleich in namen.values() if len(gleich) > 1]
+    if doppelt:
+        for gleich in doppelt:
+            print("Gleiche Ausgabe fuer: {}".format(", ".join(gleich)),
+                  file=sys.stderr)
+        return 1
+    os.makedirs(args.ausgabe, exist_ok=True)
+    if args.projektor == "Systemmatrix":
+        hinweis = systemmatrix_hinweis(INTERPOLATIONEN[args.interpolation])
+        if hinweis is not None:
+            print("Hinweis: {}".format(hinweis), file=sys.stderr)
+    geometrie_cache.obergrenze = args.geometrie_cache * 2 ** 20
+    geometrie_cache.verzeichnis_setzen(args.geometrie_verzeichnis)
+    messprotokoll.aktiv = args.messung is not None
+    messprotokoll.profil_datei = args.profil
+    messprotokoll.profilieren(alle_verarbeiten, dateien, args)
+    if args.messung:
+        messprotokoll.exportieren(args.messung)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
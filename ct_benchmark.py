@@ -0,0 +1,272 @@
+"""
+    Benchmark fuer "Wir basteln uns einen CT" ohne grafische Oberflaeche:
+    misst Drehung, Vorwaertsprojektion, Filterung und Rueckprojektion auf
+    den mitgelieferten Phantomen (Laufzeit, Spitzenspeicher, RMSE der
+    Rekonstruktion) und legt die Ergebnisse als JSON ab, damit Versionen
+    miteinander verglichen werden koennen.
+
+    Beispiel:
+        python ct_benchmark.py --ausgabe benchmark_neu.json \
+            --vergleich benchmark_alt.json
+"""
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy
+
+from rechenkern import (FILTER, GENAUIGKEITEN, INTERPOLATIONEN, PROJEKTOREN,
+                        RUECKPROJEKTOREN, TEXTBILD_ENDUNG, Rueckwaertsrechnung,
+                        Vorwaertsrechnung, drehung, drehung_vorverarbeitung,
+                        filtern, geometrie_cache, projektions_cache, rescale,
+                        spline_koeffizienten, zuschneiden)
+
+# Verzeichnis der mitgelieferten Phantome
+VERZEICHNIS = os.path.dirname(os.path.abspath(__file__))
+
+# Kennzahlen, die beim Vergleich zweier Laeufe betrachtet werden
+ZEITEN = ("drehung_s", "vorwaerts_s", "filtern_s", "rueck_s")
+
+
+def caches_leeren():
+    """ Zwischengespeicherte Geometrien und Sinogrammzeilen verwerfen,
+        damit jede Messung wie ein erster Aufruf rechnet. """
+    geometrie_cache.leeren()
+    projektions_cache.leeren()
+
+
+def messen(funktion, *args):
+    """
+    Fuehrt funktion zweimal aus, jeweils mit leeren Caches: einmal fuer
+    die Laufzeit, einmal unter tracemalloc fuer den Spitzenspeicher (nur
+    Speicher, der waehrenddessen von Python/NumPy angelegt wurde). So
+    enthaelt die Zeit nicht den Aufwand der Speicherverfolgung.
+
+    Return
+    ----------
+    ergebnis (des ersten Laufs), zeit (s), speicher (MB)
+    """
+    caches_leeren()
+    beginn = time.perf_counter()
+    ergebnis = funktion(*args)
+    zeit = time.perf_counter() - beginn
+    caches_leeren()
+    tracemalloc.start()
+    try:
+        funktion(*args)
+        _, spitze = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ergebnis, zeit, spitze / 2 ** 20
+
+
+def phantome_suchen(namen=None):
+    """ Pfade der Phantome (alle .npy im Verzeichnis oder nur namen). """
+    dateien = sorted(glob.glob(os.path.join(VERZEICHNIS, "*.npy")))
+    # Zwischenspeicher der Textbilder (.strings_mit_CRLF.npy) auslassen
+    dateien = [datei for datei in dateien
+               if not datei.endswith(TEXTBILD_ENDUNG + ".npy")]
+    if namen:
+        dateien = [datei for datei in dateien
+                   if os.path.splitext(os.path.basename(datei))[0] in namen]
+    return dateien
+
+
+def vorwaerts(data_gross, winkel, schritte, ordnung, projektor="Rotation"):
+    """ Vorwaertsprojektion wie in der Oberflaeche. """
+    sinogramm = np.zeros([schritte, len(data_gross)], dtype=data_gross.dtype)
+    Vorwaertsrechnung(data_gross, winkel, schritte, sinogramm,
+                      ordnung, projektor=projektor).berechnen()
+    return sinogramm
+
+
+def rueckwaerts(sinogramm_filter, winkel, projektor, laenge_original):
+    """ Rueckprojektion wie in der Oberflaeche. """
+    image_r = np.zeros((len(sinogramm_filter[0]), len(sinogramm_filter[0])),
+                       dtype=sinogramm_filter.dtype)
+    alpha_r = np.linspace(0, winkel, len(sinogramm_filter), endpoint=False)
+    Rueckwaertsrechnung(sinogramm_filter, image_r, alpha_r, winkel,
+                        projektor,
+                        laenge_original=laenge_original).berechnen()
+    return image_r
+
+
+def phantom_messen(dateiname, args):
+    """
+    Alle Kombinationen der Parameter fuer ein Phantom. Die
+    Vorwaertsprojektion haengt nicht vom Filter ab und wird je Filter
+    wiederverwendet.
+
+    Return
+    ----------
+    Liste von dicts, ein Eintrag je Kombination.
+    """
+    name = os.path.splitext(os.path.basename(dateiname))[0]
+    data = np.load(dateiname)
+    dtype = GENAUIGKEITEN[args.genauigkeit]
+    data_gross = drehung_vorverarbeitung(data, dtype)
+    ergebnisse = []
+    for interpolation in args.interpolation:
+        ordnung = INTERPOLATIONEN[interpolation]
+        # einzelne Drehung (ohne Cache, wie beim ersten Aufruf)
+        _, zeit_drehung, _ = messen(
+            drehung, data_gross, 30, ordnung,
+            spline_koeffizienten(data_gross, ordnung))
+        for winkel, schritte in itertools.product(args.winkel,
+                                                  args.schritte):
+            sinogramm, zeit_v, speicher_v = messen(vorwaerts, data_gross,
+                                                   winkel, schritte, ordnung,
+                                                   args.projektor)
+            for filterart in args.filter:
+                sinogramm_filter, zeit_f, speicher_f = messen(
+                    filtern, sinogramm, filterart)
+                image_r, zeit_r, speicher_r = messen(
+                    rueckwaerts, sinogramm_filter, winkel,
+                    args.rueckprojektor, len(data))
+                # Fehler wie Differenzbild der Oberflaeche
+                image_r = rescale(data, np.array(
+                    zuschneiden(image_r, len(data)), dtype=np.float64))
+                rmse = float(np.sqrt(np.mean((data - image_r) ** 2)))
+                ergebnisse.append({
+                    "phantom": name, "laenge": len(data),
+                    "interpolation": interpolation, "winkel": winkel,
+                    "schritte": schritte, "filter": filterart,
+                    "projektor": args.projektor,
+                    "rueckprojektor": args.rueckprojektor,
+                    "genauigkeit": args.genauigkeit,
+                    "drehung_s": zeit_drehung,
+                    "vorwaerts_s": zeit_v, "vorwaerts_mb": speicher_v,
+                    "filtern_s": zeit_f, "filtern_mb": speicher_f,
+                    "rueck_s": zeit_r, "rueck_mb": speicher_r,
+                    "rmse": rmse})
+                if not args.leise:
+                    print("{phantom:20s} {interpolation:16s} {winkel:3d}° "
+                          "{schritte:4d} {filter:11s} vor {vorwaerts_s:7.2f} s"
+                          " rueck {rueck_s:7.2f} s  RMSE {rmse:9.2f}"
+                          .format(**ergebnisse[-1]))
+    return ergebnisse
+
+
+def schluessel(eintrag):
+    """ Kombination der Parameter eines Eintrags (fuer den Vergleich). """
+    return (eintrag["phantom"], eintrag["interpolation"], eintrag["winkel"],
+            eintrag["schritte"], eintrag["filter"],
+            eintrag.get("rueckprojektor"), eintrag.get("genauigkeit"),
+            eintrag.get("projektor", "Rotation"))
+
+
+def vergleichen(alt, neu, toleranz_zeit=0.2, toleranz_rmse=0.01):
+    """
+    Vergleicht zwei Benchmark-Laeufe Eintrag fuer Eintrag.
+
+    Parameters
+    ----------
+    alt, neu: Ergebnisse (dict wie von main gespeichert).
+
+    toleranz_zeit: erlaubte relative Verlangsamung je Stufe.
+
+    toleranz_rmse: erlaubte relative Zunahme des RMSE.
+
+    Return
+    ----------
+    Liste der Verschlechterungen als Text.
+    """
+    alte = {schluessel(eintrag): eintrag for eintrag in alt["ergebnisse"]}
+    verschlechterungen = []
+    for eintrag in neu["ergebnisse"]:
+        vorher = alte.get(schluessel(eintrag))
+        if vorher is None:
+            continue
+        name = " ".join(str(teil) for teil in schluessel(eintrag)[:5])
+        for groesse in ZEITEN:
+            # sehr kurze Zeiten schwanken zu stark
+            if vorher[groesse] > 0.05 and \
+                    eintrag[groesse] > vorher[groesse] * (1 + toleranz_zeit):
+                verschlechterungen.append(
+                    "{}: {} {:.3f} s -> {:.3f} s".format(
+                        name, groesse, vorher[groesse], eintrag[groesse]))
+        if eintrag["rmse"] > vorher["rmse"] * (1 + toleranz_rmse):
+            verschlechterungen.append("{}: RMSE {:.3f} -> {:.3f}".format(
+                name, vorher["rmse"], eintrag["rmse"]))
+    return verschlechterungen
+
+
+def parser():
+    """ Kommandozeilenparameter des Benchmarks. """
+    parser = argparse.ArgumentParser(
+        description="Laufzeit, Speicher und Rekonstruktionsfehler auf den "
+                    "mitgelieferten Phantomen messen.")
+    parser.add_argument("--phantome", nargs="+",
+                        help="nur diese Phantome (Name ohne .npy)")
+    parser.add_argument("--schritte", type=int, nargs="+",
+                        default=[30, 90, 180], help="Anzahl Winkelschritte")
+    parser.add_argument("--winkel", type=int, nargs="+", choices=(180, 360),
+                        default=[180, 360], help="Winkelbereiche in Grad")
+    parser.add_argument("--filter", nargs="+", choices=FILTER,
+                        default=["Ramp", "Hamming"],
+                        help="Filter der Rueckprojektion")
+    parser.add_argument("--interpolation", nargs="+",
+                        choices=tuple(INTERPOLATIONEN),
+                        default=["kubisch", "linear"],
+                        help="Interpolation der Drehung")
+    parser.add_argument("--projektor", choices=PROJEKTOREN,
+                        default="Rotation",
+                        help="Projektor der Vorwaertsprojektion")
+    parser.add_argument("--rueckprojektor", choices=RUECKPROJEKTOREN,
+                        default="Pixelbasiert",
+                        help="Projektor der Rueckprojektion")
+    parser.add_argument("--genauigkeit", choices=tuple(GENAUIGKEITEN),
+                        default="float64", help="Rechengenauigkeit")
+    parser.add_argument("--ausgabe", default="benchmark.json",
+                        help="JSON-Datei fuer die Ergebnisse")
+    parser.add_argument("--vergleich",
+                        help="frueheres Ergebnis (JSON) zum Vergleich")
+    parser.add_argument("--toleranz", type=float, default=0.2,
+                        help="erlaubte relative Verlangsamung beim Vergleich")
+    parser.add_argument("--leise", action="store_true",
+                        help="keine Ausgabe je Kombination")
+    return parser
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    dateien = phantome_suchen(args.phantome)
+    if not dateien:
+        print("Keine Phantome gefunden.", file=sys.stderr)
+        return 1
+    ergebnisse = []
+    for dateiname in dateien:
+        ergebnisse += phantom_messen(dateiname, args)
+    lauf = {"version": 1,
+            "zeitpunkt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "umgebung": {"python": platform.python_version(),
+                         "numpy": np.__version__,
+                         "scipy": scipy.__version__,
+                         "plattform": platform.platform(),
+                         "prozessoren": os.cpu_count()},
+            "ergebnisse": ergebnisse}
+    with open(args.ausgabe, "w", encoding="utf-8") as datei:
+        json.dump(lauf, datei, indent=1)
+    print("{} Messungen in {}".format(len(ergebnisse), args.ausgabe))
+    if args.vergleich:
+        with open(args.vergleich, encoding="utf-8") as datei:
+            alt = json.load(datei)
+        verschlechterungen = vergleichen(alt, lauf, args.toleranz)
+        for zeile in verschlechterungen:
+            print(zeile)
+        if verschlechterungen:
+            return 2
+        print("Keine Verschlechterung gegenueber {}".format(args.vergleich))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,3296 @@
+"""
+    Rechenkern fuer "Wir basteln uns einen CT" ohne grafische Oberflaeche.
+    Enthaelt Drehung, Vorwaerts- und Rueckprojektion, Filterung und
+    Hilfsfunktionen, die sowohl von der Oberflaeche (Beleg_CT.py) als auch
+    von der Stapelverarbeitung (ct_batch.py) verwendet werden.
+"""
+
+import cProfile
+import csv
+import hashlib
+import json
+import multiprocessing
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from multiprocessing import shared_memory
+
+import numpy as np
+from scipy import fft, sparse
+from scipy.ndimage import map_coordinates, spline_filter
+
+
+# Auswahlmoeglichkeiten fuer die Rechengenauigkeit
+GENAUIGKEITEN = {"float64": np.float64, "float32": np.float32}
+
+
+def genauigkeit(array):
+    """ Rechengenauigkeit fuer ein Array: float32 bleibt float32, alles
+        andere (auch Ganzzahlen) wird in float64 gerechnet. """
+    return np.float32 if array.dtype == np.float32 else np.float64
+
+
+# Stufe bei ausgeschaltetem Messprotokoll (misst nichts)
+KEINE_MESSUNG = nullcontext()
+
+
+class Messstufe:
+    """ Misst die Dauer eines with-Blocks und traegt sie ins Messprotokoll
+        ein (siehe Messprotokoll.stufe). """
+
+    def __init__(self, protokoll, name):
+        self.protokoll = protokoll
+        self.name = name
+
+    def __enter__(self):
+        self.beginn = time.perf_counter()
+        return self
+
+    def __exit__(self, *fehler):
+        self.protokoll.eintragen(self.name, self.beginn,
+                                 time.perf_counter() - self.beginn)
+        return False
+
+
+class Messprotokoll:
+    """ Zeiten und Zaehler der einzelnen Verarbeitungsstufen (Drehung,
+        Summe, Filterung, Rueckprojektion, Signale, Zeichnen ...), die
+        Dauer je Winkel und ein Ablaufprotokoll aller gemessenen Stufen.
+        Ausgeschaltet (Standard) kostet jede Messstelle nur die Abfrage von
+        self.aktiv. Rechnungen in eigenen Prozessen (prozesse > 1) werden
+        nicht erfasst.
+
+        Parameter:
+        ----------
+        max_ereignisse: Laenge des Ablaufprotokolls, aeltere Eintraege
+        werden verworfen.
+    """
+
+    def __init__(self, max_ereignisse=100000):
+        self.aktiv = False
+        # cProfile-Datei fuer den naechsten Lauf (siehe profilieren)
+        self.profil_datei = None
+        self.max_ereignisse = max_ereignisse
+        self.lock = threading.Lock()
+        self.zuruecksetzen()
+
+    def zuruecksetzen(self):
+        """ Verwirft alle bisherigen Messungen. """
+        with self.lock:
+            self.beginn = time.perf_counter()
+            # Name der Stufe -> [Summe, Anzahl, Maximum] in Sekunden
+            self.zeiten = {}
+            self.zaehler = {}
+            self.winkelzeiten = []
+            # (Stufe, Beginn seit zuruecksetzen, Dauer) in Sekunden
+            self.ereignisse = deque(maxlen=self.max_ereignisse)
+
+    def stufe(self, name):
+        """ Kontextmanager, der die Dauer der Stufe name misst. """
+        if not self.aktiv:
+            return KEINE_MESSUNG
+        return Messstufe(self, name)
+
+    def eintragen(self, name, beginn, dauer):
+        """ Traegt eine gemessene Dauer (s) der Stufe name ein. """
+        with self.lock:
+            eintrag = self.zeiten.setdefault(name, [0.0, 0, 0.0])
+            eintrag[0] += dauer
+            eintrag[1] += 1
+            eintrag[2] = max(eintrag[2], dauer)
+            self.ereignisse.append((name, beginn - self.beginn, dauer))
+
+    def zaehlen(self, name, anzahl=1):
+        """ Erhoeht den Zaehler name um anzahl. """
+        if not self.aktiv:
+            return
+        with self.lock:
+            self.zaehler[name] = self.zaehler.get(name, 0) + int(anzahl)
+
+    def winkel(self, dauer, anzahl=1):
+        """ Dauer (s) eines Blocks von anzahl Winkeln, wird gleichmaeßig auf
+            die Winkel des Blocks verteilt. """
+        if not self.aktiv:
+            return
+        with self.lock:
+            self.winkelzeiten += [dauer / anzahl] * anzahl
+
+    def histogramm(self, klassen=20):
+        """ Histogramm der Dauer je Winkel.
+
+            Return
+            ----------
+            anzahl, grenzen: wie np.histogram (Grenzen in Sekunden).
+        """
+        with self.lock:
+            winkelzeiten = list(self.winkelzeiten)
+        if not winkelzeiten:
+            return np.zeros(0, dtype=int), np.zeros(0)
+        return np.histogram(winkelzeiten, bins=klassen)
+
+    def zusammenfassung(self):
+        """ Zeiten, Zaehler und Winkelhistogramm als dict (fuer JSON). """
+        anzahl, grenzen = self.histogramm()
+        with self.lock:
+            stufen = {name: {"summe_s": summe, "anzahl": aufrufe,
+                             "mittel_s": summe / aufrufe, "max_s": maximum}
+                      for name, (summe, aufrufe, maximum)
+                      in self.zeiten.items()}
+            return {"dauer_s": time.perf_counter() - self.beginn,
+                    "stufen": stufen, "zaehler": dict(self.zaehler),
+                    "winkel": {"anzahl": len(self.winkelzeiten),
+                               "histogramm_anzahl": anzahl.tolist(),
+                               "histogramm_grenzen_s": grenzen.tolist()}}
+
+    def exportieren(self, dateiname):
+        """
+        Speichert die Messung. Endet dateiname auf .csv, wird das
+        Ablaufprotokoll (eine Zeile je gemessener Stufe) geschrieben, sonst
+        Zusammenfassung und Ablaufprotokoll als JSON.
+        """
+        with self.lock:
+            ereignisse = list(self.ereignisse)
+        if dateiname.lower().endswith(".csv"):
+            with open(dateiname, "w", newline="", encoding="utf-8") as datei:
+                schreiber = csv.writer(datei)
+                schreiber.writerow(("stufe", "beginn_s", "dauer_s"))
+                schreiber.writerows(ereignisse)
+            return
+        protokoll = self.zusammenfassung()
+        protokoll["ereignisse"] = [
+            {"stufe": name, "beginn_s": beginn, "dauer_s": dauer}
+            for name, beginn, dauer in ereignisse]
+        with open(dateiname, "w", encoding="utf-8") as datei:
+            json.dump(protokoll, datei, indent=1)
+
+    def profilieren(self, funktion, *args):
+        """ Fuehrt funktion(*args) aus. Ist profil_datei gesetzt, laeuft
+            sie unter cProfile und die Statistik wird dorthin geschrieben;
+            die Anforderung gilt nur fuer diesen einen Lauf. """
+        dateiname, self.profil_datei = self.profil_datei, None
+        if dateiname is None:
+            return funktion(*args)
+        profil = cProfile.Profile()
+        try:
+            return profil.runcall(funktion, *args)
+        finally:
+            profil.dump_stats(dateiname)
+
+
+# gemeinsames Messprotokoll fuer Rechenkern, Oberflaeche und Skripte
+messprotokoll = Messprotokoll()
+
+
+def drehmatrix(grad):
+    """ Erzeugt eine Drehmatrix.
+
+        Parameter:
+        ----------
+        grad: Angabe der Drehung(im positivem Drehsinne) in Grad.
+    """
+    # Umrechnung Winkel in Bogenmaß
+    grad_rad = np.radians(grad)
+    # Drehmatrix in homogenen Koordinaten
+    dreh = np.array([[np.cos(grad_rad), np.sin(grad_rad), 0],
+                     [-np.sin(grad_rad), np.cos(grad_rad), 0], [0, 0, 1]])
+    # Matrizen invertieren, da Transformation im positiven Sinn
+    dreh = np.linalg.inv(dreh)
+    return dreh
+
+
+def drehung_vorverarbeitung(image, dtype=np.float64):
+    """ Fuer eine anschließende Drehung muessen am Rande des Originalbild
+        Nullen hinzugefuegt werden, um eine anschließende verlustlose Drehung
+        des Bildes zu ermoeglichen (es sollen keine gefuellten Werte des
+        Originalbildes abgeschnitten werden, nur Nullen).
+
+        Parameter:
+        ----------
+        image: Array, Eingabewerte.
+
+        dtype: Datentyp des vergroeßerten Bildes (Rechengenauigkeit).
+
+        Skizze zur Verdeutlichung:
+
+                            c
+          +--------------------------------------+
+          |                                      |
+          |                 a                    |
+          |    +----------------------------+    |
+          |    |                            |    +---------->  mit Nullen
+          |    |                            |    |             gefuellter
+          |    |                            |    |             Rand
+          |    |                            |    |
+          |    |                            |    |
+        c |  a |                            | a  | c
+          |    |                            |    |
+          |    |                            |    |
+          |    |                            |    |
+          |    |                            |    |
+          |    |                            +------------>   Originalbild
+          |    |                            |    |
+          |    |                            |    |
+          |    +----------------------------+    |
+          |                 a                    |
+          |                                      |
+          +--------------------------------------+
+                            c
+    """
+    # Annahme: quadratische Eingangs-Matrix
+    # Seitenlaenge der ursprünglichen Matrix abspeichern (a)
+    laenge_original = len(image)
+    # Wie groß muss vergrößertes Bild sein für anschließende verlustfreie
+    # Drehung? (mit Satz des Pythagoras berechnet)
+    # (auf)runden und Integer damit keine halben Pixel als Ergebnis erhalten
+    # werden (c)
+    c = int(np.ceil(np.sqrt(2) * laenge_original))
+    # Prüfen, ob Originalbild überhaupt mittig reingelegt werden kann:
+    b = c - laenge_original
+    # ist b eine ungerade Zahl, dann vergroeßere c um Eins, damit b im
+    # anschließenden gerade Zahl ist
+    if b % 2 == 1:
+        c += 1
+        b = c - laenge_original
+    # ansonsten ist b gerade und Originalbild kann mittig reingelegt werden
+    # Anlegen eines (groeßeren) Arrays, indem Originalbild anschließend
+    # (mittig!!) gespeichert wird
+    image_groß = np.zeros((c, c), dtype=dtype)
+    # nun wird Originalbild mittig ins vergroeßertes Bild gelegt
+    image_groß[int(b / 2):laenge_original + int(b / 2), int(b / 2):laenge_original + int(b / 2)] = image
+    return image_groß
+
+
+# Messfeld der Projektion: Inkreis des vergroeßerten Bildes
+MESSFELD_KREIS = "kreis"
+
+
+@lru_cache(maxsize=16)
+def messfeld_pixel(laenge, messfeld=None):
+    """ Pixel des gedrehten Bildes, die ueberhaupt berechnet werden. Die
+        Menge haengt nicht vom Winkel ab und wird fuer alle Drehungen
+        wiederverwendet.
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (vergroeßerten) Bildes.
+
+        messfeld: None: alle Pixel. MESSFELD_KREIS: alle Pixel im Inkreis.
+        Das Originalbild liegt bei jedem Winkel darin, außerhalb stehen nur
+        die mit Nullen aufgefuellten Ecken (fuer die Projektion). Sonst
+        Seitenlaenge des mittleren Quadrats (Originalbild, siehe
+        zuschneiden), auf das beschraenkt wird (fuer die Rueckprojektion).
+
+        Return
+        ----------
+        x, y: Koordinaten der Pixel bezogen auf die Bildmitte (zeilenweise).
+
+        gueltig: boolesches Array (laenge, laenge), Maske dieser Pixel.
+    """
+    pixel_mitte = laenge // 2
+    achse = np.arange(laenge) - pixel_mitte
+    x, y = np.meshgrid(achse, achse)
+    if messfeld is None:
+        gueltig = np.ones((laenge, laenge), dtype=bool)
+    elif messfeld == MESSFELD_KREIS:
+        gueltig = x ** 2 + y ** 2 <= (laenge / 2) ** 2
+    else:
+        rand = (laenge - messfeld) // 2
+        gueltig = np.zeros((laenge, laenge), dtype=bool)
+        gueltig[rand:rand + messfeld, rand:rand + messfeld] = True
+    x, y = x[gueltig], y[gueltig]
+    # Ergebnis wird zwischengespeichert und darf nicht veraendert werden
+    for array in (x, y, gueltig):
+        array.flags.writeable = False
+    return x, y, gueltig
+
+
+def drehung_geometrie(laenge, grad, dtype=np.float64, messfeld=None):
+    """ Berechnet die Abtastkoordinaten fuer eine Drehung eines quadratischen
+        Bildes, die nur von Seitenlaenge und Winkel abhaengen. Berechnet
+        werden nur die Pixel des Messfelds (siehe messfeld_pixel).
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (quadratischen) Bildes.
+
+        grad: Angabe der Drehung(im positivem Drehsinne) in Grad.
+
+        dtype: Datentyp der Koordinaten (Rechengenauigkeit).
+
+        messfeld: None: ganzes Bild, MESSFELD_KREIS: Inkreis, sonst
+        Seitenlaenge des mittleren Quadrats.
+
+        Return
+        ----------
+        koord: Array (2, n), Zeilen- und Spaltenkoordinaten im Eingangsbild
+        fuer alle gueltigen Pixel (direkt fuer map_coordinates verwendbar).
+
+        bed: boolesches Array (laenge, laenge), Maske der gueltigen Pixel
+        im gedrehten Bild.
+
+        spalten: Array (n,), Spalte jedes gueltigen Pixels im gedrehten Bild
+        (fuer die Bildung der Linienintegrale).
+    """
+    # Erzeugen einer Drehmatrix mit gewaehltem Winkel
+    transform = drehmatrix(grad)
+    # Rotation mit Drehmatrix bezieht sich auf Nullpunkt des Koordinatensystems
+    # das heißt fuer eine Drehung um die Mitte des Bildes muss der Nullpunkt
+    # des Koordinatensystems in die Mitte des Bildes gelegt werden
+    # (ansonsten Drehung um obere linke Ecke des Bildes)
+    # Pixel, bei dem Mitte des Koordinaensystems liegt:
+    pixel_mitte = laenge // 2
+    # nur Pixel des Messfelds (fuer alle Winkel dieselben)
+    x, y, gueltig = messfeld_pixel(laenge, messfeld)
+    koord_xy_transform = transform[:2, :2].T @ np.array([x, y])
+    x_transform = (koord_xy_transform[0])
+    y_transform = (koord_xy_transform[1])
+    bed1 = (-pixel_mitte <= x_transform) * (x_transform < pixel_mitte)
+    bed2 = (-pixel_mitte <= y_transform) * (y_transform < pixel_mitte)
+    bed_messfeld = bed1 * bed2
+    bed = np.zeros((laenge, laenge), dtype=bool)
+    bed[gueltig] = bed_messfeld
+    koord = np.array([(y_transform[bed_messfeld] + pixel_mitte),
+                      (x_transform[bed_messfeld] + pixel_mitte)], dtype=dtype)
+    spalten = np.nonzero(bed)[1].astype(np.int32)
+    return koord, bed, spalten
+
+
+class GeometrieCache:
+    """ Zwischenspeicher (LRU) fuer Drehgeometrien.
+
+        Die Koordinaten und Masken einer Drehung haengen nur von
+        Seitenlaenge, Winkel und Rechengenauigkeit ab. Sie werden daher
+        einmal berechnet und bei jeder weiteren Drehung mit gleicher Groeße
+        und gleichem Winkel wiederverwendet. Der belegte Speicher ist
+        begrenzt (Standard 512 MB), die am laengsten nicht benutzten
+        Eintraege werden zuerst verworfen. Waehrend einer Projektion darf
+        der Cache mit reservieren voruebergehend wachsen, damit alle ihre
+        Winkel Platz finden; danach gilt wieder max_bytes.
+
+        Parameter:
+        ----------
+        max_bytes: obere Grenze fuer den belegten Arbeitsspeicher außerhalb
+        von Reservierungen.
+
+        obergrenze: hoechste Grenze waehrend einer Reservierung.
+
+        verzeichnis: optionaler Ordner, in dem berechnete Geometrien als
+        .npz-Dateien abgelegt und beim naechsten Programmstart wieder
+        geladen werden (None: nur im Arbeitsspeicher), siehe
+        verzeichnis_setzen.
+    """
+
+    def __init__(self, max_bytes=512 * 2 ** 20, obergrenze=2 * 2 ** 30,
+                 verzeichnis=None):
+        self.max_bytes = max_bytes
+        self.obergrenze = obergrenze
+        # Grenzen der laufenden Reservierungen
+        self.reserviert = []
+        self.eintraege = OrderedDict()
+        self.belegt = 0
+        # Threads der Rueckprojektion drehen gleichzeitig
+        self.lock = threading.Lock()
+        self.verzeichnis = None
+        self.verzeichnis_setzen(verzeichnis)
+
+    def verzeichnis_setzen(self, verzeichnis):
+        """ Schaltet die Ablage der Geometrien auf der Festplatte ein
+            (Ordner) oder aus (None). """
+        if verzeichnis is not None:
+            os.makedirs(verzeichnis, exist_ok=True)
+        self.verzeichnis = verzeichnis
+
+    @staticmethod
+    def schluessel(laenge, grad, dtype=np.float64, messfeld=None):
+        """ Schluessel aus Seitenlaenge, (gerundetem) Winkel, Datentyp
+            der Koordinaten und Messfeld. """
+        if messfeld not in (None, MESSFELD_KREIS):
+            messfeld = int(messfeld)
+        return (int(laenge), round(float(grad), 9), np.dtype(dtype).name,
+                messfeld)
+
+    def datei(self, schluessel):
+        """ Dateiname einer Geometrie im Cache-Verzeichnis. """
+        laenge, grad, dtype, messfeld = schluessel
+        return os.path.join(self.verzeichnis,
+                            "drehung_{}_{!r}_{}_{}.npz".format(
+                                laenge, grad, dtype,
+                                "ganz" if messfeld is None else messfeld))
+
+    def grenze(self):
+        """ Aktuell gueltige Grenze in Bytes (mit Reservierungen). """
+        return max([self.max_bytes] + self.reserviert)
+
+    @contextmanager
+    def reservieren(self, laenge, anzahl_winkel, dtype=np.float64,
+                    messfeld=None):
+        """ Hebt die Grenze fuer die Dauer des with-Blocks (hoechstens bis
+            obergrenze) so weit an, dass die Geometrien aller Winkel einer
+            Projektion Platz finden. Danach gilt wieder die vorherige
+            Grenze, ueberzaehlige Eintraege werden verworfen. """
+        geometrie = self.get(laenge, 0, dtype, messfeld)
+        bedarf = anzahl_winkel * sum(array.nbytes for array in geometrie)
+        reservierung = min(bedarf, self.obergrenze)
+        with self.lock:
+            self.reserviert.append(reservierung)
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.reserviert.remove(reservierung)
+                self.verdraengen(0)
+
+    def verdraengen(self, groesse):
+        """ Verwirft die am laengsten nicht benutzten Eintraege, bis
+            zusaetzlich groesse Bytes Platz haben (Lock muss gehalten
+            werden). """
+        while self.eintraege and self.belegt + groesse > self.grenze():
+            _, alt = self.eintraege.popitem(last=False)
+            self.belegt -= sum(array.nbytes for array in alt)
+
+    def get(self, laenge, grad, dtype=np.float64, messfeld=None):
+        """
+        Liefert (koord, bed, spalten) fuer Seitenlaenge, Winkel, Datentyp
+        der Koordinaten und Messfeld (siehe messfeld_pixel), berechnet sie
+        nur falls noch nicht vorhanden.
+        """
+        geometrie = self.nachschlagen(laenge, grad, dtype, messfeld)
+        if geometrie is None:
+            schluessel = self.schluessel(laenge, grad, dtype, messfeld)
+            geometrie = drehung_geometrie(*schluessel)
+            self.uebernehmen(geometrie, *schluessel)
+        return geometrie
+
+    def nachschlagen(self, laenge, grad, dtype=np.float64, messfeld=None):
+        """ Geometrie aus dem Arbeitsspeicher (bzw. dem Cache-Verzeichnis)
+            oder None, falls sie erst berechnet werden muesste. """
+        schluessel = self.schluessel(laenge, grad, dtype, messfeld)
+        with self.lock:
+            geometrie = self.eintraege.get(schluessel)
+            if geometrie is not None:
+                self.eintraege.move_to_end(schluessel)
+                return geometrie
+        verzeichnis = self.verzeichnis
+        if verzeichnis is not None:
+            dateiname = self.datei(schluessel)
+            if os.path.exists(dateiname):
+                with np.load(dateiname) as datei:
+                    geometrie = (datei["koord"], datei["bed"],
+                                 datei["spalten"])
+                self.ablegen(schluessel, geometrie)
+        return geometrie
+
+    def uebernehmen(self, geometrie, laenge, grad, dtype=np.float64,
+                    messfeld=None):
+        """ Legt eine außerhalb berechnete Geometrie (z.B. in einem anderen
+            Prozess) ab, bei eingeschalteter Ablage auch auf der
+            Festplatte. """
+        schluessel = self.schluessel(laenge, grad, dtype, messfeld)
+        verzeichnis = self.verzeichnis
+        if verzeichnis is not None:
+            np.savez(self.datei(schluessel), koord=geometrie[0],
+                     bed=geometrie[1], spalten=geometrie[2])
+        self.ablegen(schluessel, geometrie)
+
+    def ablegen(self, schluessel, geometrie):
+        """ Neuen Eintrag speichern, aelteste Eintraege ggf. verwerfen. """
+        groesse = sum(array.nbytes for array in geometrie)
+        with self.lock:
+            # inzwischen von einem anderen Thread abgelegt oder zu groß
+            if schluessel in self.eintraege or groesse > self.grenze():
+                return
+            self.verdraengen(groesse)
+            self.eintraege[schluessel] = geometrie
+            self.belegt += groesse
+
+    def leeren(self):
+        """ Entfernt alle Eintraege aus dem Arbeitsspeicher. """
+        with self.lock:
+            self.eintraege.clear()
+            self.belegt = 0
+
+
+# gemeinsamer Cache fuer alle Drehungen
+geometrie_cache = GeometrieCache()
+# Unterordner fuer Drehgeometrien auf der Festplatte (siehe
+# GeometrieCache.verzeichnis_setzen)
+GEOMETRIE_VERZEICHNIS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "cache", "geometrie")
+
+
+# Auswahlmoeglichkeiten fuer Interpolation (Name: Ordnung des Splines)
+INTERPOLATIONEN = {"kubisch": 3, "linear": 1, "nächster Nachbar": 0}
+
+
+def spline_koeffizienten(image, ordnung=3):
+    """ Berechnet die B-Spline-Koeffizienten eines Bildes fuer die
+        Interpolation in map_coordinates (entspricht prefilter=True).
+        Da sich das Bild waehrend einer Projektion nicht aendert, muss dies
+        nur einmal je Bild statt einmal je Drehung geschehen.
+
+        Parameter:
+        ----------
+        image: Array, Eingabewerte.
+
+        ordnung: Ordnung der Spline-Interpolation (0 bis 5).
+    """
+    # fuer nearest/linear ist keine Vorfilterung noetig
+    if ordnung <= 1:
+        return image
+    return spline_filter(image, ordnung, output=genauigkeit(image),
+                         mode="constant")
+
+
+def drehung(image, grad, ordnung=3, koeffizienten=None, messfeld=None):
+    """ Drehung eines Bildes im positiven Drehsinne.
+
+        Parameter:
+        ----------
+        image: Array, Eingabewerte.
+
+        grad: Angabe der Drehung(im positivem Drehsinne) in Grad.
+
+        ordnung: Ordnung der Spline-Interpolation (0: naechster Nachbar,
+        1: linear, 3: kubisch).
+
+        koeffizienten: optional, mit spline_koeffizienten vorberechnete
+        Koeffizienten von image (werden sonst bei jedem Aufruf berechnet).
+
+        messfeld: nur diese Pixel berechnen (siehe messfeld_pixel, z.B.
+        Originalbild bei der Rueckprojektion), None: ganzes Bild. Pixel
+        außerhalb bleiben Null.
+    """
+    if koeffizienten is None:
+        koeffizienten = spline_koeffizienten(image, ordnung)
+    image_transform = np.zeros_like(image)
+    # Koordinaten der Drehung aus Cache (nur einmal je Groeße und Winkel
+    # berechnet)
+    koord, bed, _ = geometrie_cache.get(len(image), grad,
+                                        genauigkeit(koeffizienten), messfeld)
+    with messprotokoll.stufe("drehung"):
+        image_transform[bed] = map_coordinates(koeffizienten, koord,
+                                               order=ordnung, prefilter=False)
+    return image_transform
+
+
+# Speicherbudget (in Bytes) fuer die blockweise Vorwaertsprojektion
+SPEICHER_BUDGET = 256 * 2 ** 20
+
+
+def blockgroesse(laenge, speicher_budget=SPEICHER_BUDGET, bytes_je_pixel=32):
+    """ Anzahl der Winkel, die in einem Block gemeinsam projiziert werden,
+        ohne das Speicherbudget zu ueberschreiten.
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (vergroeßerten) Bildes.
+
+        speicher_budget: maximaler Arbeitsspeicher je Block in Bytes.
+
+        bytes_je_pixel: Speicherbedarf je Pixel und Winkel. Standard fuer
+        die Vorwaertsprojektion: zwei Koordinaten, interpolierter Wert und
+        Spaltenindex (je 8 Byte).
+    """
+    return max(1, int(speicher_budget // (bytes_je_pixel * laenge ** 2)))
+
+
+def geometrien_verbinden(geometrien, laenge):
+    """ Haengt die Drehgeometrien (koord, bed, spalten) eines Blocks von
+        Winkeln aneinander.
+
+        Return
+        ----------
+        koord: Array (2, n), Koordinaten aller Winkel.
+
+        spalten: Array (n,), Spalte im gedrehten Bild, verschoben je Winkel
+        um eine Sinogrammzeile.
+    """
+    koord = np.concatenate([koord for koord, _, _ in geometrien], axis=1)
+    spalten = np.concatenate([geometrie[2] + i * laenge
+                              for i, geometrie in enumerate(geometrien)])
+    return koord, spalten
+
+
+def vorwaertsprojektion_block(koeffizienten, winkel, ordnung=3,
+                              geometrie=None):
+    """ Vorwaertsprojektion fuer einen Block von Winkeln mit einem einzigen
+        Aufruf von map_coordinates ueber die aneinandergehaengten
+        Koordinaten aller Winkel.
+
+        Parameter:
+        ----------
+        koeffizienten: Spline-Koeffizienten des (vergroeßerten) Bildes
+        (siehe spline_koeffizienten) oder Stapel (Anzahl Schichten, laenge,
+        laenge) solcher Koeffizienten; die Koordinaten werden dann nur
+        einmal fuer alle Schichten zusammengestellt, interpoliert wird mit
+        einem Aufruf je Schicht.
+
+        winkel: Array, Drehwinkel des Blocks in Grad.
+
+        ordnung: Ordnung der Spline-Interpolation.
+
+        geometrie: bereits verbundene Geometrie (koord, spalten) der Winkel
+        (siehe geometrien_verbinden), sonst aus dem Geometrie-Cache.
+
+        Return
+        ----------
+        sinogramm_block: Array (len(winkel), laenge), eine Zeile (Summe der
+        Spalten des gedrehten Bildes) je Winkel, in der Genauigkeit der
+        Koeffizienten (bei einem Stapel je Schicht ein solcher Block).
+    """
+    laenge = koeffizienten.shape[-1]
+    dtype = genauigkeit(koeffizienten)
+    if geometrie is None:
+        geometrie = geometrien_verbinden(
+            [geometrie_cache.get(laenge, alpha, dtype, MESSFELD_KREIS)
+             for alpha in winkel],
+            laenge)
+    koord, spalten = geometrie
+    bloecke = []
+    # ein gemeinsamer Aufruf mit 3-D-Koordinaten wuerde auch zwischen den
+    # Schichten interpolieren (kubisch 64 statt 16 Stuetzstellen je Wert),
+    # aneinandergehaengte Schichten aendern die Randbehandlung und sind
+    # nicht schneller; daher bleibt es bei einem Aufruf je Schicht
+    for schicht in koeffizienten.reshape(-1, laenge, laenge):
+        with messprotokoll.stufe("drehung"):
+            werte = map_coordinates(schicht, koord, order=ordnung,
+                                    prefilter=False, output=dtype)
+        # Bildung von Linienintegralen: Summe der Werte je Spalte und Winkel
+        with messprotokoll.stufe("summe"):
+            sinogramm_block = np.bincount(spalten, weights=werte,
+                                          minlength=len(winkel) * laenge)
+        bloecke.append(sinogramm_block.reshape(len(winkel), laenge))
+    if koeffizienten.ndim == 2:
+        return bloecke[0].astype(dtype, copy=False)
+    return np.array(bloecke, dtype=dtype)
+
+
+def rueckprojektion_block(zeilen, winkel, ordnung=1, innen=None):
+    """ Pixelbasierte Rueckprojektion eines Blocks von Sinogrammzeilen.
+
+        Statt jede Zeile zu einem Bild zu verschmieren und dieses zu drehen,
+        wird fuer jedes Pixel direkt die Detektorkoordinate berechnet und
+        die (gefilterte) Projektion dort eindimensional interpoliert.
+        Ergebnis entspricht der Summe von drehung(zeile * ones, -winkel).
+
+        Parameter:
+        ----------
+        zeilen: Array (Anzahl Winkel, laenge), Sinogrammzeilen des Blocks,
+        oder (Anzahl Schichten, Anzahl Winkel, laenge) fuer einen Stapel
+        von Schichten gleicher Geometrie (Koordinaten nur einmal berechnet).
+
+        winkel: Array, zugehoerige Projektionswinkel in Grad.
+
+        ordnung: 0 (naechster Nachbar) oder 1 (linear).
+
+        innen: nur das mittlere Quadrat dieser Seitenlaenge berechnen
+        (Originalbild, siehe zuschneiden), None: ganzes Bild.
+
+        Return
+        ----------
+        image: Array (laenge, laenge) bzw. (innen, innen), Summe der
+        Rueckprojektionen (bei einem Stapel mit vorangestellter Anzahl
+        Schichten).
+    """
+    laenge = zeilen.shape[-1]
+    pixel_mitte = laenge // 2
+    # alle Zwischenergebnisse in der Genauigkeit der Zeilen
+    dtype = genauigkeit(zeilen)
+    # Koordinaten bezogen auf Bildmitte (wie in drehung_geometrie)
+    achse = np.arange(laenge, dtype=dtype) - pixel_mitte
+    if innen is not None:
+        rand = (laenge - innen) // 2
+        achse = achse[rand:rand + innen]
+    x = achse[np.newaxis, np.newaxis, :]
+    y = achse[np.newaxis, :, np.newaxis]
+    grad_rad = np.radians(winkel).astype(dtype)[:, np.newaxis, np.newaxis]
+    # Detektorkoordinate (t) und Lage entlang des Strahls (s) je Pixel
+    t = x * np.cos(grad_rad) - y * np.sin(grad_rad)
+    s = x * np.sin(grad_rad) + y * np.cos(grad_rad)
+    # gueltige Pixel wie in drehung_geometrie, bei gerader Seitenlaenge
+    # zusaetzlich ohne Pixel jenseits der letzten Zeile/Spalte (dort liefert
+    # map_coordinates Null)
+    if laenge % 2 == 0:
+        bed = (-pixel_mitte <= t) & (t <= pixel_mitte - 1) & \
+              (-pixel_mitte <= s) & (s <= pixel_mitte - 1)
+    else:
+        bed = (-pixel_mitte <= t) & (t < pixel_mitte) & \
+              (-pixel_mitte <= s) & (s < pixel_mitte)
+    # Pixel außerhalb werden spaeter verworfen, Index nur gueltig halten
+    t = np.clip(t + pixel_mitte, 0, laenge - 1)
+    # rechts eine Null anfuegen, damit Nachbar des letzten Pixels existiert
+    zeilen = np.concatenate([zeilen, np.zeros(zeilen.shape[:-1] + (1,),
+                                              dtype)], axis=-1)
+    zeilen_index = np.arange(len(winkel))[:, np.newaxis, np.newaxis]
+    if ordnung == 0:
+        index = np.floor(t + 0.5).astype(np.intp)
+        werte = zeilen[..., zeilen_index, index]
+    else:
+        index = np.floor(t)
+        anteil = t - index
+        index = index.astype(np.intp)
+        werte = zeilen[..., zeilen_index, index] * (1 - anteil) + \
+            zeilen[..., zeilen_index, index + 1] * anteil
+    werte[..., ~bed] = 0
+    return np.sum(werte, axis=-3)
+
+
+def begrenzung(bild):
+    """ Kleinstes Rechteck um alle Pixel ungleich Null (bei einem Stapel
+        ueber alle Schichten).
+
+        Return
+        ----------
+        rechteck: (zeile_start, zeile_stop, spalte_start, spalte_stop),
+        leeres Rechteck bei einem Bild ohne Werte.
+    """
+    belegt = np.any(bild.reshape(-1, *bild.shape[-2:]) != 0, axis=0)
+    zeilen = np.flatnonzero(np.any(belegt, axis=1))
+    spalten = np.flatnonzero(np.any(belegt, axis=0))
+    if len(zeilen) == 0:
+        return 0, 0, 0, 0
+    return zeilen[0], zeilen[-1] + 1, spalten[0], spalten[-1] + 1
+
+
+# Speicherbedarf der strahlbasierten Projektion je Pixel und Winkel in
+# Bytes: Detektorindex, zwei Bildindizes, zwei Gewichte, Werte und die
+# Kopien beim Zusammenfuegen der Winkel eines Blocks
+STRAHL_BYTES_JE_PIXEL = 72
+
+
+def strahl_abtastung(laenge, grad, rechteck=None, dtype=np.float64):
+    """ Abtastpunkte der Strahlen eines Winkels nach Joseph.
+
+        Jeder Strahl (Detektorkoordinate t = x cos - y sin, wie in
+        rueckprojektion_block) wird entlang der Achse verfolgt, zu der er
+        am steilsten steht: je Zeile (bzw. Spalte) ein Abtastpunkt, linear
+        zwischen den beiden benachbarten Spalten (bzw. Zeilen)
+        interpoliert und mit der Weglaenge je Schritt (1 / |cos| bzw.
+        1 / |sin|) gewichtet. Nur Zeilen, Spalten und Strahlen, die das
+        Rechteck treffen, werden abgetastet.
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (vergroeßerten) Bildes.
+
+        grad: Projektionswinkel in Grad.
+
+        rechteck: (zeile_start, zeile_stop, spalte_start, spalte_stop),
+        außerhalb gilt das Bild als Null (siehe begrenzung), None: ganzes
+        Bild.
+
+        dtype: Genauigkeit der Gewichte.
+
+        Return
+        ----------
+        detektor: Index der Detektorzelle je Abtastpunkt.
+
+        index_1, index_2: flacher Bildindex der beiden Nachbarn.
+
+        gewicht_1, gewicht_2: Gewichte der Nachbarn (Null fuer Nachbarn
+        außerhalb des Rechtecks).
+    """
+    pixel_mitte = laenge // 2
+    zeile_start, zeile_stop, spalte_start, spalte_stop = \
+        rechteck or (0, laenge, 0, laenge)
+    grad_rad = np.radians(grad)
+    cos, sin = np.cos(grad_rad), np.sin(grad_rad)
+    # Detektorbereich aus den (um ein Pixel erweiterten) Ecken
+    x = np.array([spalte_start - 1, spalte_stop]) - pixel_mitte
+    y = np.array([zeile_start - 1, zeile_stop]) - pixel_mitte
+    ecken = x[:, np.newaxis] * cos - y[np.newaxis, :] * sin
+    t = np.arange(max(int(np.floor(ecken.min())), -pixel_mitte),
+                  min(int(np.ceil(ecken.max())), laenge - 1 - pixel_mitte) + 1)
+    if abs(cos) >= abs(sin):
+        # zeilenweise: Spalte des Strahls in jeder Zeile
+        fuehrung = np.arange(zeile_start, zeile_stop)[:, np.newaxis]
+        lage = (t + (fuehrung - pixel_mitte) * sin) / cos + pixel_mitte
+        weg, basis, schritt = 1 / abs(cos), fuehrung * laenge, 1
+        grenzen = spalte_start, spalte_stop
+    else:
+        # spaltenweise: Zeile des Strahls in jeder Spalte
+        fuehrung = np.arange(spalte_start, spalte_stop)[:, np.newaxis]
+        lage = ((fuehrung - pixel_mitte) * cos - t) / sin + pixel_mitte
+        weg, basis, schritt = 1 / abs(sin), fuehrung, laenge
+        grenzen = zeile_start, zeile_stop
+    index = np.floor(lage)
+    anteil = (lage - index).astype(dtype)
+    index = index.astype(np.intp)
+    # nur Abtastpunkte mit mindestens einem Nachbarn im Rechteck
+    auswahl = (index >= grenzen[0] - 1) & (index < grenzen[1])
+    detektor = np.broadcast_to(t + pixel_mitte, lage.shape)[auswahl]
+    basis = np.broadcast_to(basis, lage.shape)[auswahl]
+    index, anteil = index[auswahl], anteil[auswahl]
+    gewicht_1 = (1 - anteil) * weg * (index >= grenzen[0])
+    gewicht_2 = anteil * weg * (index + 1 < grenzen[1])
+    # Index außerhalb des Bildes nur gueltig halten (Gewicht ist Null)
+    index_1 = basis + np.clip(index, 0, laenge - 1) * schritt
+    index_2 = basis + np.clip(index + 1, 0, laenge - 1) * schritt
+    return detektor, index_1, index_2, gewicht_1, gewicht_2
+
+
+def strahl_block(laenge, winkel, rechteck=None, dtype=np.float64):
+    """ Abtastpunkte (siehe strahl_abtastung) aller Winkel eines Blocks,
+        aneinandergehaengt; der Detektorindex ist je Winkel um eine
+        Sinogrammzeile verschoben. """
+    with messprotokoll.stufe("strahlen"):
+        teile = [strahl_abtastung(laenge, alpha, rechteck, dtype)
+                 for alpha in winkel]
+        detektor = np.concatenate([teil[0] + i * laenge
+                                   for i, teil in enumerate(teile)])
+        return (detektor,) + tuple(np.concatenate(spalte)
+                                   for spalte in list(zip(*teile))[1:])
+
+
+def strahl_vorwaerts(bild, winkel, rechteck=None):
+    """ Strahlbasierte Vorwaertsprojektion (Joseph) eines Blocks von
+        Winkeln: Linienintegral je Detektorzelle direkt aus den Pixeln,
+        ohne das Bild zu drehen.
+
+        Parameter:
+        ----------
+        bild: Array (laenge, laenge), (vergroeßertes) Bild.
+
+        winkel: Array, Projektionswinkel des Blocks in Grad.
+
+        rechteck: Bereich, außerhalb dessen das Bild Null ist (siehe
+        begrenzung), None: ganzes Bild.
+
+        Return
+        ----------
+        sinogramm_block: Array (len(winkel), laenge) in der Genauigkeit des
+        Bildes.
+    """
+    laenge = len(bild)
+    dtype = genauigkeit(bild)
+    detektor, index_1, index_2, gewicht_1, gewicht_2 = strahl_block(
+        laenge, winkel, rechteck, dtype)
+    bild = bild.ravel()
+    with messprotokoll.stufe("summe"):
+        werte = gewicht_1 * bild[index_1] + gewicht_2 * bild[index_2]
+        sinogramm_block = np.bincount(detektor, weights=werte,
+                                      minlength=len(winkel) * laenge)
+    return sinogramm_block.reshape(len(winkel), laenge).astype(dtype,
+                                                              copy=False)
+
+
+def strahl_rueckwaerts(zeilen, winkel, rechteck=None):
+    """ Zu strahl_vorwaerts passende (transponierte) Rueckprojektion: jede
+        Sinogrammzeile wird mit denselben Gewichten entlang der Strahlen
+        auf die Pixel verteilt, sodass <A x, y> = <x, Aᵀ y> gilt.
+
+        Parameter:
+        ----------
+        zeilen: Array (Anzahl Winkel, laenge), Sinogrammzeilen des Blocks.
+
+        winkel: Array, zugehoerige Projektionswinkel in Grad.
+
+        rechteck: nur Pixel in diesem Bereich berechnen (z.B. Originalbild),
+        None: ganzes Bild.
+
+        Return
+        ----------
+        image: Array (laenge, laenge), Summe der Rueckprojektionen.
+    """
+    laenge = zeilen.shape[-1]
+    dtype = genauigkeit(zeilen)
+    detektor, index_1, index_2, gewicht_1, gewicht_2 = strahl_block(
+        laenge, winkel, rechteck, dtype)
+    werte = zeilen.ravel()[detektor]
+    image = np.bincount(index_1, weights=gewicht_1 * werte,
+                        minlength=laenge ** 2) + \
+        np.bincount(index_2, weights=gewicht_2 * werte,
+                    minlength=laenge ** 2)
+    return image.reshape(laenge, laenge).astype(dtype, copy=False)
+
+
+def gemeinsames_array(form, name=None, dtype=np.float64):
+    """ Legt ein Array (Standard float64) in gemeinsamem Speicher an
+        (name=None) oder oeffnet ein bestehendes, damit mehrere Prozesse
+        ohne Kopieren (Pickle) darauf zugreifen koennen.
+
+        Return
+        ----------
+        speicher: SharedMemory-Objekt (muss nach Gebrauch geschlossen
+        werden).
+
+        array: Array auf dem gemeinsamen Speicher.
+    """
+    if name is None:
+        groesse = int(np.prod(form)) * np.dtype(dtype).itemsize
+        speicher = shared_memory.SharedMemory(create=True, size=groesse)
+    else:
+        speicher = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(form, dtype=dtype, buffer=speicher.buf)
+    return speicher, array
+
+
+class GeteilteGeometrie:
+    """ Drehgeometrien eines Blocks von Winkeln in gemeinsamem Speicher.
+        Der Hauptprozess legt sie an und traegt die Geometrien aus seinem
+        Cache ein, die Prozesse der parallelen Projektion berechnen nur die
+        fehlenden. Diese uebernimmt der Hauptprozess danach in seinen
+        Cache, sodass spaetere Projektionen sie nicht erneut berechnen.
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (vergroeßerten) Bildes.
+
+        anzahl: Anzahl Winkel des Blocks.
+
+        dtype: Datentyp der Koordinaten.
+
+        namen: Namen bestehender Speicher (siehe self.namen), None: neu
+        anlegen.
+    """
+
+    def __init__(self, laenge, anzahl, dtype=np.float64, namen=None):
+        self.laenge = laenge
+        # hoechstens alle Pixel des Messfelds je Winkel
+        platz = len(messfeld_pixel(laenge, MESSFELD_KREIS)[0])
+        formen = ((anzahl, 2, platz), (anzahl, platz),
+                  (anzahl, laenge, laenge), (anzahl,))
+        typen = (dtype, np.int32, bool, np.int64)
+        if namen is None:
+            namen = (None,) * len(formen)
+        self.speicher, arrays = zip(*[gemeinsames_array(form, name, typ)
+                                      for form, typ, name
+                                      in zip(formen, typen, namen)])
+        # Anzahl Pixel je Winkel, 0: Geometrie fehlt noch
+        self.koord, self.spalten, self.bed, self.pixel = arrays
+
+    @property
+    def namen(self):
+        return tuple(speicher.name for speicher in self.speicher)
+
+    def eintragen(self, i, geometrie):
+        """ Geometrie (koord, bed, spalten) des i-ten Winkels eintragen. """
+        koord, bed, spalten = geometrie
+        self.koord[i, :, :len(spalten)] = koord
+        self.spalten[i, :len(spalten)] = spalten
+        self.bed[i] = bed
+        self.pixel[i] = len(spalten)
+
+    def geometrie(self, i):
+        """ Geometrie (koord, bed, spalten) des i-ten Winkels (Sichten auf
+            den gemeinsamen Speicher). """
+        n = self.pixel[i]
+        return self.koord[i, :, :n], self.bed[i], self.spalten[i, :n]
+
+    def verbinden(self):
+        """ Verbundene Geometrie aller Winkel (siehe
+            geometrien_verbinden). """
+        return geometrien_verbinden([self.geometrie(i)
+                                     for i in range(len(self.pixel))],
+                                    self.laenge)
+
+    def schliessen(self, freigeben=False):
+        """ Speicher schließen, der Hauptprozess gibt ihn auch frei. """
+        del self.koord, self.spalten, self.bed, self.pixel
+        for speicher in self.speicher:
+            speicher.close()
+            if freigeben:
+                speicher.unlink()
+
+
+def vorwaertsprojektion_teil(name_koeffizienten, name_sinogramm,
+                             namen_geometrie, laenge, angle_steps, winkel,
+                             start, ordnung, dtype="float64"):
+    """ Teilaufgabe der parallelen Vorwaertsprojektion (in einem eigenen
+        Prozess): berechnet die Sinogrammzeilen ab start fuer die
+        uebergebenen Winkel und schreibt sie direkt in das gemeinsame
+        Sinogramm.
+
+        Parameter:
+        ----------
+        name_koeffizienten, name_sinogramm: Namen der gemeinsamen Speicher
+        fuer Spline-Koeffizienten (laenge, laenge) und Sinogramm
+        (angle_steps, laenge).
+
+        namen_geometrie: Namen der gemeinsamen Geometrie des Blocks (siehe
+        GeteilteGeometrie), fehlende Winkel werden hier berechnet und
+        eingetragen.
+
+        winkel: Array, Winkel dieser Teilaufgabe in Grad.
+
+        start: Index der ersten zu berechnenden Sinogrammzeile.
+
+        ordnung: Ordnung der Spline-Interpolation.
+
+        dtype: Datentyp beider gemeinsamer Arrays.
+
+        Return
+        ----------
+        start, stop: berechneter Zeilenbereich.
+    """
+    speicher_k, koeffizienten = gemeinsames_array((laenge, laenge),
+                                                  name_koeffizienten, dtype)
+    speicher_s, sinogramm = gemeinsames_array((angle_steps, laenge),
+                                              name_sinogramm, dtype)
+    geteilt = GeteilteGeometrie(laenge, len(winkel), dtype, namen_geometrie)
+    for i, alpha in enumerate(winkel):
+        if not geteilt.pixel[i]:
+            with messprotokoll.stufe("geometrie"):
+                geteilt.eintragen(i, drehung_geometrie(laenge, alpha, dtype,
+                                                       MESSFELD_KREIS))
+    stop = start + len(winkel)
+    sinogramm[start:stop] = vorwaertsprojektion_block(
+        koeffizienten, winkel, ordnung, geometrie=geteilt.verbinden())
+    # Arrays freigeben, bevor Speicher geschlossen wird
+    del koeffizienten, sinogramm
+    speicher_k.close()
+    speicher_s.close()
+    geteilt.schliessen()
+    return start, stop
+
+
+def prozessoren():
+    """ Anzahl der fuer diesen Prozess verfuegbaren Prozessoren. """
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+# laufender Prozesspool der parallelen Vorwaertsprojektion, Schluessel:
+# Anzahl Prozesse (siehe prozess_pool)
+prozesspools = {}
+
+
+def prozess_pool(prozesse):
+    """ Prozesspool mit prozesse Prozessen. Er bleibt fuer weitere
+        Projektionen erhalten, damit nicht jede Projektion neue Prozesse
+        starten muss; ein Pool anderer Groeße wird vorher beendet. """
+    if prozesse not in prozesspools:
+        prozess_pool_beenden()
+        prozesspools[prozesse] = ProcessPoolExecutor(
+            max_workers=prozesse, mp_context=prozess_kontext())
+    return prozesspools[prozesse]
+
+
+def prozess_pool_beenden():
+    """ Beendet den laufenden Prozesspool (falls vorhanden). """
+    for pool in prozesspools.values():
+        pool.shutdown(cancel_futures=True)
+    prozesspools.clear()
+
+
+def prozess_kontext():
+    """ Startmethode des Prozesspools: forkserver (bzw. spawn, wo es den
+        nicht gibt) statt fork, da die Projektion auch aus einem QThread
+        einer laufenden Qt-Anwendung gestartet wird und das Kopieren eines
+        Prozesses mit mehreren Threads per fork nicht sicher ist. Die
+        Teilaufgaben brauchen nur diesen (Qt-freien) Modul. """
+    methoden = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methoden else "spawn")
+
+
+# Auswahlmoeglichkeiten fuer die Berechnung der Projektionen
+PROJEKTOREN = ("Rotation", "Systemmatrix", "Strahlbasiert")
+# nur fuer die Rueckprojektion verfuegbar
+RUECKPROJEKTOREN = PROJEKTOREN + ("Pixelbasiert",)
+# Ordner, in dem berechnete Systemmatrizen abgelegt werden
+CACHE_VERZEICHNIS = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "cache")
+# hoechstens so viel Arbeitsspeicher (Bytes) fuer eine Systemmatrix
+SYSTEMMATRIX_MAX_BYTES = 2 * 2 ** 30
+
+
+class Systemmatrix:
+    """ Duennbesetzte Systemmatrix A der Projektion fuer eine feste
+        Geometrie (Seitenlaenge, Anzahl Winkelschritte, 180° oder 360°).
+
+        Drehung und Summe der Vorwaertsprojektion sind linear, daher gilt
+        sinogramm = A · bild und fuer die Rueckprojektion bild = Aᵀ · sinogramm.
+        Die Drehung wird dabei bilinear (bzw. mit naechstem Nachbarn)
+        interpoliert. Die Matrix wird einmal aufgebaut (und optional im
+        Cache-Verzeichnis abgelegt), sodass alle weiteren Bilder gleicher
+        Geometrie nur noch Matrix-Vektor-Produkte benoetigen.
+
+        Parameter:
+        ----------
+        laenge: Seitenlaenge des (vergroeßerten) Bildes.
+
+        angle_steps: Anzahl der Winkelschritte.
+
+        winkel_max: 180 oder 360 (Grad).
+
+        ordnung: 0 (naechster Nachbar) oder 1 (bilinear), hoehere Ordnungen
+        werden bilinear interpoliert (siehe systemmatrix_hinweis).
+
+        verzeichnis: Cache-Verzeichnis (None: nicht auf Platte speichern).
+    """
+
+    def __init__(self, laenge, angle_steps, winkel_max, ordnung=1,
+                 verzeichnis=None):
+        self.laenge = laenge
+        self.winkel = np.linspace(0, winkel_max, angle_steps, endpoint=False)
+        self.ordnung = min(ordnung, 1)
+        dateiname = None
+        if verzeichnis is not None:
+            os.makedirs(verzeichnis, exist_ok=True)
+            dateiname = os.path.join(
+                verzeichnis, "systemmatrix_{}_{}_{}_{}_kreis.npz".format(
+                    laenge, angle_steps, winkel_max, self.ordnung))
+        if dateiname is not None and os.path.exists(dateiname):
+            self.matrix = sparse.load_npz(dateiname)
+        else:
+            self.matrix = self.aufbauen()
+            if dateiname is not None:
+                sparse.save_npz(dateiname, self.matrix, compressed=False)
+
+    @staticmethod
+    def zeilenblock(laenge, alpha, ordnung):
+        """ Zeilen der Matrix fuer einen Winkel, aus den Koordinaten der
+            Drehgeometrie. """
+        koord, _, spalten = geometrie_cache.get(laenge, alpha,
+                                                messfeld=MESSFELD_KREIS)
+        if ordnung == 0:
+            nachbarn = [(np.floor(koord + 0.5).astype(np.int64),
+                         np.ones(koord.shape[1]))]
+        else:
+            unten = np.floor(koord)
+            anteil = koord - unten
+            unten = unten.astype(np.int64)
+            nachbarn = []
+            for dz in (0, 1):
+                for ds in (0, 1):
+                    gewicht = (anteil[0] if dz else 1 - anteil[0]) * \
+                              (anteil[1] if ds else 1 - anteil[1])
+                    nachbarn.append((unten + np.array([[dz], [ds]]),
+                                     gewicht))
+        zeilen, matrixspalten, gewichte = [], [], []
+        for index, gewicht in nachbarn:
+            # nur Nachbarn innerhalb des Bildes (außerhalb Nullen)
+            gueltig = np.all((index >= 0) & (index < laenge), axis=0)
+            zeilen.append(spalten[gueltig])
+            matrixspalten.append(index[0, gueltig] * laenge +
+                                 index[1, gueltig])
+            gewichte.append(gewicht[gueltig])
+        return sparse.csr_matrix((np.concatenate(gewichte),
+                                  (np.concatenate(zeilen),
+                                   np.concatenate(matrixspalten))),
+                                 shape=(laenge, laenge ** 2))
+
+    @staticmethod
+    def speicherbedarf(laenge, angle_steps, ordnung=1):
+        """ Geschaetzter Speicherbedarf der Matrix in Bytes: Eintraege des
+            Zeilenblocks eines schiefen Winkels mal Anzahl Winkel, je
+            Eintrag Gewicht (float64) und Spaltenindex (int32). """
+        block = Systemmatrix.zeilenblock(laenge, 22.5, min(ordnung, 1))
+        return angle_steps * block.nnz * 12
+
+    def aufbauen(self):
+        """ Baut die Systemmatrix zeilenblockweise (ein Block je Winkel)
+            auf. """
+        return sparse.vstack([self.zeilenblock(self.laenge, alpha,
+                                               self.ordnung)
+                              for alpha in self.winkel], format="csr")
+
+    def vorwaerts(self, bild, start, stop):
+        """ Sinogrammzeilen der Winkel start bis stop (A · bild). """
+        block = self.matrix[start * self.laenge:stop * self.laenge]
+        return (block @ bild.ravel()).reshape(stop - start, self.laenge)
+
+    def rueckwaerts(self, zeilen, start, stop):
+        """ Rueckprojektion der Sinogrammzeilen start bis stop (Aᵀ · y). """
+        block = self.matrix[start * self.laenge:stop * self.laenge]
+        return (block.T @ np.ravel(zeilen)).reshape(self.laenge, self.laenge)
+
+    def vorwaerts_stapel(self, stapel):
+        """ Sinogramme aller Winkel fuer einen Stapel von Bildern (Anzahl
+            Schichten, laenge, laenge) mit einem einzigen Matrixprodukt. """
+        ergebnis = self.matrix @ stapel.reshape(len(stapel), -1).T
+        return ergebnis.T.reshape(len(stapel), len(self.winkel), self.laenge)
+
+    def rueckwaerts_stapel(self, sinogramme):
+        """ Rueckprojektion eines Stapels von Sinogrammen (Anzahl Schichten,
+            Anzahl Winkel, laenge) mit einem einzigen Matrixprodukt. """
+        ergebnis = self.matrix.T @ sinogramme.reshape(len(sinogramme), -1).T
+        return ergebnis.T.reshape(len(sinogramme), self.laenge, self.laenge)
+
+    def teilmatrix(self, winkel_index):
+        """ Zeilen der Matrix fuer beliebige (nicht zusammenhaengende)
+            Winkel, z.B. eine Teilmenge der iterativen Rekonstruktion. """
+        zeilen = (np.asarray(winkel_index)[:, np.newaxis] * self.laenge +
+                  np.arange(self.laenge)).ravel()
+        return self.matrix[zeilen]
+
+
+# zuletzt benutzte Systemmatrix, Schluessel: Parameter der Geometrie
+systemmatrizen = {}
+
+
+def systemmatrix_pruefen(laenge, angle_steps, ordnung=1):
+    """ Bricht mit ValueError ab, falls die Systemmatrix einer Geometrie
+        mehr als SYSTEMMATRIX_MAX_BYTES belegen wuerde. """
+    bedarf = Systemmatrix.speicherbedarf(laenge, angle_steps, ordnung)
+    if bedarf > SYSTEMMATRIX_MAX_BYTES:
+        raise ValueError(
+            "Systemmatrix fuer {} Winkel bei Seitenlaenge {} braucht ca. "
+            "{:.0f} MB (hoechstens {:.0f} MB), bitte weniger Winkel oder "
+            "einen anderen Projektor waehlen".format(
+                angle_steps, laenge, bedarf / 2 ** 20,
+                SYSTEMMATRIX_MAX_BYTES / 2 ** 20))
+
+
+def systemmatrix_hinweis(ordnung):
+    """ Hinweis fuer die Oberflaeche, falls die Systemmatrix anders
+        interpoliert als gewaehlt (sonst None). """
+    if ordnung > 1:
+        return "Systemmatrix interpoliert bilinear statt kubisch"
+    return None
+
+
+def systemmatrix(laenge, angle_steps, winkel_max, ordnung=1):
+    """ Liefert die Systemmatrix einer Geometrie, wird nur beim ersten Aufruf
+        geladen bzw. aufgebaut. Im Speicher bleibt nur die zuletzt benutzte
+        Matrix. Ist die Ablage der Drehgeometrien eingeschaltet (siehe
+        GeometrieCache.verzeichnis_setzen), wird die Matrix dort
+        gespeichert und bei spaeteren Aufrufen geladen. """
+    schluessel = (laenge, angle_steps, winkel_max, min(ordnung, 1))
+    if schluessel not in systemmatrizen:
+        systemmatrix_pruefen(laenge, angle_steps, ordnung)
+        # alte Matrix vor dem Aufbau der neuen freigeben
+        systemmatrizen.clear()
+        systemmatrizen[schluessel] = Systemmatrix(
+            *schluessel, verzeichnis=geometrie_cache.verzeichnis)
+    return systemmatrizen[schluessel]
+
+
+def rescale(original, img_rueck):
+    """
+    Skaliert ein rückprojiziertes Bild auf den Wertebereich des Originalbildes.
+
+    Parameters
+    ----------
+    original: Originalbild.
+
+    img_rueck: rückprojiziertes Bild.
+
+    Return
+    ----------
+    img_rueck: skaliertes rückprojiziertes Bild
+    """
+    # Wertebereich fuer Originalbild
+    min_original = np.min(original)
+    max_original = np.max(original)
+    # Wertebereich des rueckprojiziertes Bildes
+    min_rueck = np.min(img_rueck)
+    max_rueck = np.max(img_rueck)
+    diff = min_rueck - min_original
+    img_rueck -= diff
+    scal = max_original / max_rueck
+    img_rueck *= scal
+    return img_rueck
+
+
+def zuschneiden(image_r, laenge_original):
+    """
+    Durch die vorherige Vorwaertsprojektion (dabei wurde Ursprungsbild
+    fuer eine verlustfreie Drehung vergroeßert) ist um das rueckprojizierte
+    Bild ein Kreis. Dieser wird entfernt, indem auf die Groeße des
+    Originalbildes zugeschnitten wird.
+
+    Parameters
+    ----------
+    image_r: rückprojiziertes (vergroeßertes) Bild oder Stapel solcher
+    Bilder (Anzahl Schichten, laenge, laenge).
+
+    laenge_original: Seitenlaenge des Originalbildes.
+    """
+    diff = (image_r.shape[-1] - laenge_original) // 2
+    return image_r[..., diff:laenge_original+diff, diff:laenge_original+diff]
+
+
+# Auswahlmoeglichkeiten fuer Filter der gefilterten Rueckprojektion
+FILTER = ("Ramp", "Hamming", "Shepp-Logan", "Cosinus", "Hann")
+
+
+def fft_laenge(laenge):
+    """ Laenge der Fouriertransformation fuer eine Detektorzeile: mindestens
+        doppelte Laenge (Nullen gegen Ueberlappung am Rand), aufgerundet auf
+        eine schnell zu berechnende Laenge. """
+    return fft.next_fast_len(2 * laenge, real=True)
+
+
+@lru_cache(maxsize=32)
+def filterkern(laenge_fft, filterart):
+    """
+    Filterkern im Frequenzraum fuer rfft der Laenge laenge_fft, wird je
+    (Laenge, Filter) nur einmal berechnet.
+
+    Der Rampfilter wird aus seiner diskreten Form im Ortsraum berechnet
+    (h[0] = 1/4, h[n] = -1/(pi n)^2 fuer ungerade n), damit der
+    Gleichanteil trotz Nullen am Rand korrekt bleibt. Die uebrigen Filter
+    sind Rampfilter mal Fensterfunktion.
+
+    Parameters
+    ----------
+    laenge_fft: Laenge der (mit Nullen aufgefuellten) Zeile.
+
+    filterart: Name des Filters (siehe FILTER).
+    """
+    # Abstand jedes Index zum Ursprung (zyklisch, auch fuer ungerade Laenge)
+    n = np.arange(laenge_fft)
+    n = np.minimum(n, laenge_fft - n)
+    ungerade = n % 2 == 1
+    ramp_ort = np.zeros(laenge_fft)
+    ramp_ort[0] = 0.25
+    ramp_ort[ungerade] = -1 / (np.pi * n[ungerade]) ** 2
+    ramp = np.real(fft.rfft(ramp_ort))
+    # Frequenz in Zyklen je Pixel (0 bis 0.5)
+    f = fft.rfftfreq(laenge_fft)
+    if filterart == "Ramp":
+        fenster = 1
+    elif filterart == "Hamming":
+        fenster = 0.54 + 0.46 * np.cos(2 * np.pi * f)
+    elif filterart == "Shepp-Logan":
+        fenster = np.sinc(f)
+    elif filterart == "Cosinus":
+        fenster = np.cos(np.pi * f)
+    elif filterart == "Hann":
+        fenster = 0.5 + 0.5 * np.cos(2 * np.pi * f)
+    else:
+        raise ValueError("unbekannter Filter: {}".format(filterart))
+    kern = ramp * fenster
+    # Kern wird im Cache geteilt und darf nicht veraendert werden
+    kern.setflags(write=False)
+    return kern
+
+
+def filtern(sinogramm, filterart, inplace=False, dtype=None):
+    """
+    Filtert jede Zeile eines Sinogramms im Frequenzraum (reelle FFT, mit
+    Nullen auf eine schnelle Laenge von mindestens doppelter Zeilenlaenge
+    aufgefuellt). Ohne Angabe von dtype werden float32-Sinogramme in
+    float32 gefiltert, alle anderen in float64.
+
+    Parameters
+    ----------
+    sinogramm: Array (Anzahl Winkel, Detektorlaenge) oder einzelne Zeile.
+
+    filterart: Name des Filters (siehe FILTER), None: ungefiltert.
+
+    inplace: Ergebnis direkt in sinogramm schreiben (nur fuer
+    Gleitkomma-Arrays) statt eine Kopie anzulegen.
+
+    dtype: Rechengenauigkeit (np.float32 oder np.float64), None: aus
+    sinogramm.
+
+    Return
+    ----------
+    sinogramm_filter: gefiltertes Sinogramm.
+    """
+    if dtype is None:
+        dtype = genauigkeit(sinogramm)
+    if not inplace or sinogramm.dtype != dtype:
+        sinogramm = np.array(sinogramm, dtype=dtype)
+    if filterart is None:
+        return sinogramm
+    laenge = sinogramm.shape[-1]
+    laenge_fft = fft_laenge(laenge)
+    spektrum = fft.rfft(sinogramm, n=laenge_fft, axis=-1)
+    # Anwenden des Filters auf Bild:
+    # (Multiplikation im Frequenzraum)
+    spektrum *= filterkern(laenge_fft, filterart).astype(sinogramm.dtype)
+    sinogramm[:] = fft.irfft(spektrum, n=laenge_fft, axis=-1,
+                             overwrite_x=True)[..., :laenge]
+    return sinogramm
+
+
+def filtern_zeilen(zeilen, filterart, anzahl=64):
+    """
+    Filtert einen Strom von Sinogrammzeilen (z.B. waehrend sie erzeugt
+    oder von der Platte gelesen werden). Die Zeilen werden in Bloecken zu
+    je anzahl gefiltert und einzeln wieder ausgegeben.
+
+    Parameters
+    ----------
+    zeilen: iterierbare Folge von Sinogrammzeilen gleicher Laenge.
+
+    filterart: Name des Filters (siehe FILTER), None: ungefiltert.
+
+    anzahl: Anzahl Zeilen je Block.
+    """
+    block = []
+    for zeile in zeilen:
+        block.append(zeile)
+        if len(block) == anzahl:
+            yield from filtern(np.array(block), filterart, inplace=True)
+            block = []
+    if block:
+        yield from filtern(np.array(block), filterart, inplace=True)
+
+
+@lru_cache(maxsize=8)
+def fourier_gitter(laenge, anzahl_winkel):
+    """
+    Gewichte der Interpolation von den polaren Abtastwerten (Winkel x
+    Frequenz) auf das kartesische Frequenzgitter der direkten
+    Fourier-Rekonstruktion. Haengt nur von der Geometrie ab und wird daher
+    je (Laenge, Winkelschritte) nur einmal berechnet.
+
+    Nach dem Fourier-Scheibentheorem liegt das Spektrum der Projektion
+    unter dem Winkel alpha auf der Geraden kx = w cos(alpha),
+    ky = -w sin(alpha) des Bildspektrums (Konvention wie in
+    rueckprojektion_block). Jeder Gitterpunkt wird bilinear aus den vier
+    umgebenden Abtastwerten (zwei Winkel, zwei Frequenzen) interpoliert.
+    Die Winkel ueberdecken 180°: Gitterpunkte mit alpha + 180° werden aus
+    der negativen Frequenz unter alpha interpoliert, 360°-Sinogramme
+    faltet fourier_rekonstruktion vorher auf 180°.
+
+    Parameters
+    ----------
+    laenge: Detektorlaenge (Seitenlaenge des vergroeßerten Bildes).
+
+    anzahl_winkel: Anzahl gleichmaeßiger Winkelschritte ueber 180°.
+
+    Return
+    ----------
+    index: Array (4, n), Indizes in die Tabelle der Zeilenspektren
+    (anzahl_winkel + 1, laenge_fft), flach; die letzte Zeile setzt die
+    erste um 180° gedreht fort.
+
+    gewicht: Array (4, n), Gewichte (0 außerhalb des abgetasteten Kreises).
+    """
+    laenge_fft = fft_laenge(laenge)
+    # kartesisches Gitter fuer irfft2 (letzte Achse nur positive Frequenzen)
+    ky = fft.fftfreq(laenge_fft)[:, np.newaxis]
+    kx = fft.rfftfreq(laenge_fft)[np.newaxis, :]
+    frequenz = np.broadcast_to(np.hypot(kx, ky), (len(ky), kx.shape[1]))
+    alpha = np.degrees(np.arctan2(-ky, kx)) + np.zeros_like(frequenz)
+    negativ = alpha < 0
+    # Winkel alpha + 180° entspricht Winkel alpha mit negativer Frequenz
+    alpha[negativ] += 180
+    frequenz = np.where(negativ, -frequenz, frequenz)
+    # Position in der Tabelle (Winkel- und Frequenzindex, gebrochen)
+    a = alpha.ravel() * anzahl_winkel / 180
+    a_unten = np.clip(np.floor(a), 0, anzahl_winkel - 1)
+    anteil_a = a - a_unten
+    f = frequenz.ravel() * laenge_fft
+    f_unten = np.floor(f)
+    anteil_f = f - f_unten
+    f_unten = f_unten.astype(np.int64) % laenge_fft
+    f_oben = (f_unten + 1) % laenge_fft
+    zeile_unten = a_unten.astype(np.int64) * laenge_fft
+    zeile_oben = zeile_unten + laenge_fft
+    index = np.array([zeile_unten + f_unten, zeile_unten + f_oben,
+                      zeile_oben + f_unten, zeile_oben + f_oben])
+    # außerhalb der hoechsten abgetasteten Frequenz nichts interpolieren
+    innen = np.abs(frequenz.ravel()) <= 0.5
+    gewicht = np.array([(1 - anteil_a) * (1 - anteil_f),
+                        (1 - anteil_a) * anteil_f,
+                        anteil_a * (1 - anteil_f),
+                        anteil_a * anteil_f]) * innen
+    # wird im Cache geteilt und darf nicht veraendert werden
+    index = index.astype(np.int32 if index.max() < 2**31 else np.int64)
+    index.setflags(write=False)
+    gewicht.setflags(write=False)
+    return index, gewicht
+
+
+def sinogramm_falten(sinogramm):
+    """
+    Bildet ein Sinogramm ueber 360° auf 180° ab: die Projektion unter
+    θ + 180° ist die am Detektor gespiegelte Projektion unter θ (siehe
+    detektor_spiegeln). Bei gerader Anzahl Winkel werden beide gemittelt,
+    bei ungerader fallen die gespiegelten Zeilen genau zwischen die
+    uebrigen.
+
+    Parameters
+    ----------
+    sinogramm: Array (Anzahl Winkel, laenge), gleichmaeßige Winkelschritte
+    ueber 360°.
+
+    Return
+    ----------
+    sinogramm: Array, gleichmaeßige Winkelschritte ueber 180° (halbe
+    Anzahl Winkel bei gerader, gleiche bei ungerader Anzahl).
+    """
+    anzahl, laenge = sinogramm.shape
+    halb = anzahl // 2
+    if anzahl % 2 == 0:
+        gefaltet = (sinogramm[:halb] + detektor_spiegeln(sinogramm[halb:])) / 2
+        # erstes Element hat bei gerader Laenge kein gespiegeltes Gegenstueck
+        erstes = 1 - laenge % 2
+        gefaltet[:, :erstes] = sinogramm[:halb, :erstes]
+        return gefaltet
+    gefaltet = np.empty_like(sinogramm)
+    gefaltet[0::2] = sinogramm[:halb + 1]
+    gefaltet[1::2] = detektor_spiegeln(sinogramm[halb + 1:])
+    return gefaltet
+
+
+def fourier_rekonstruktion(sinogramm, winkel_max=180):
+    """
+    Direkte Fourier-Rekonstruktion: eindimensionale FFT jeder
+    Sinogrammzeile, Interpolation der Spektren auf ein kartesisches
+    Frequenzgitter (siehe fourier_gitter) und eine einzige zweidimensionale
+    inverse FFT. Aufwand O(N² log N) statt O(Winkel · N²) der
+    Rueckprojektion, dafuer mit Interpolationsartefakten, vor allem bei
+    wenigen Winkeln.
+
+    Parameters
+    ----------
+    sinogramm: Array (Anzahl Winkel, laenge), gleichmaeßige Winkelschritte
+    ueber winkel_max.
+
+    winkel_max: Winkelbereich, 180 oder 360 (Grad, wird auf 180° gefaltet,
+    siehe sinogramm_falten).
+
+    Return
+    ----------
+    image_r: Array (laenge, laenge), rekonstruiertes (vergroeßertes) Bild.
+    """
+    dtype = genauigkeit(sinogramm)
+    if winkel_max == 360:
+        sinogramm = sinogramm_falten(sinogramm.astype(dtype, copy=False))
+    anzahl, laenge = sinogramm.shape
+    laenge_fft = fft_laenge(laenge)
+    pixel_mitte = laenge // 2
+    spektrum = fft.fft(sinogramm.astype(dtype, copy=False), n=laenge_fft,
+                       axis=-1)
+    # Detektormitte (Drehpunkt) in den Ursprung verschieben
+    spektrum *= np.exp(2j * np.pi * fft.fftfreq(laenge_fft) *
+                       pixel_mitte).astype(spektrum.dtype)
+    # erste Zeile um 180° gedreht: gespiegelte Frequenzen
+    fortsetzung = spektrum[0, -np.arange(laenge_fft) % laenge_fft]
+    tabelle = np.vstack((spektrum, fortsetzung)).ravel()
+    index, gewicht = fourier_gitter(laenge, anzahl)
+    gitter = np.zeros(index.shape[1], dtype=spektrum.dtype)
+    for ecke in range(len(index)):
+        gitter += tabelle[index[ecke]] * gewicht[ecke].astype(dtype)
+    bild = fft.irfft2(gitter.reshape(laenge_fft, laenge_fft // 2 + 1),
+                      s=(laenge_fft, laenge_fft))
+    # Ursprung zurueck auf das mittlere Pixel
+    bild = np.roll(bild, (pixel_mitte, pixel_mitte), axis=(0, 1))
+    return bild[:laenge, :laenge]
+
+
+TEXTBILD_ENDUNG = ".strings_mit_CRLF"
+
+
+def textbild_lesen(dateiname, blockgroesse=16 * 2**20):
+    """
+    Liest ein Bild im Textformat (eine Bildzeile je Textzeile, Werte durch
+    Leerzeichen getrennt). Die Datei wird in Bloecken gelesen und jeder
+    Block auf einmal umgewandelt, statt Wert fuer Wert zu parsen.
+
+    Parameters
+    ----------
+    dateiname: Pfad zur Textdatei.
+
+    blockgroesse: Bytes je gelesenem Block.
+
+    Return
+    ----------
+    Bild als int32, falls alle Werte ganzzahlig sind, sonst als float64.
+    """
+    teile = []
+    zeilen = 0
+    rest = b""
+    with open(dateiname, "rb") as file:
+        while True:
+            block = file.read(blockgroesse)
+            if not block:
+                break
+            block = rest + block
+            # nur vollstaendige Zeilen umwandeln
+            ende = block.rfind(b"\n") + 1
+            block, rest = block[:ende], block[ende:]
+            zeilen += sum(1 for zeile in block.splitlines() if zeile.strip())
+            teile.append(np.array(block.split(), dtype=np.float64))
+    if rest.strip():
+        zeilen += 1
+        teile.append(np.array(rest.split(), dtype=np.float64))
+    werte = np.concatenate(teile) if teile else np.zeros(0)
+    if zeilen == 0 or werte.size % zeilen:
+        raise ValueError("Keine rechteckige Bildmatrix: {}".format(dateiname))
+    bild = werte.reshape(zeilen, -1)
+    if np.array_equal(bild, np.round(bild)):
+        bild = bild.astype(np.int32)
+    return bild
+
+
+def ist_bilddatei(dateiname):
+    """ True fuer CT-Bilder (.npy oder Textformat), nicht aber fuer die von
+        bild_laden neben Textbildern abgelegten .npy-Kopien. """
+    return dateiname.endswith(TEXTBILD_ENDUNG) or \
+        (dateiname.endswith(".npy") and
+         not dateiname.endswith(TEXTBILD_ENDUNG + ".npy"))
+
+
+def bild_kopf(dateiname):
+    """ Form und Datentyp eines CT-Bildes, .npy ohne die Daten zu laden
+        (Textbilder werden dafuer gelesen, siehe bild_laden). """
+    if dateiname.endswith(TEXTBILD_ENDUNG):
+        bild = bild_laden(dateiname)
+    else:
+        bild = np.load(dateiname, mmap_mode="r")
+    return bild.shape, bild.dtype
+
+
+def bild_laden(dateiname):
+    """
+    Laedt ein CT-Bild als .npy oder im Textformat (.strings_mit_CRLF).
+    Textbilder werden nach dem ersten Einlesen als .npy neben der
+    Textdatei abgelegt; die Kopie gilt, solange ihr Aenderungszeitpunkt
+    mit dem der Textdatei uebereinstimmt. Das Textformat speichert keinen
+    Datentyp: ganzzahlige Bilder kommen als int32 zurueck, auch wenn das
+    gleichnamige .npy (z.B. KreisExzentrisch256) float64 enthaelt.
+
+    Parameters
+    ----------
+    dateiname: Pfad zum Bild.
+    """
+    if not dateiname.endswith(TEXTBILD_ENDUNG):
+        return np.load(dateiname)
+    kopie = dateiname + ".npy"
+    zeitpunkt = os.stat(dateiname).st_mtime_ns
+    if os.path.exists(kopie) and os.stat(kopie).st_mtime_ns == zeitpunkt:
+        return np.load(kopie)
+    bild = textbild_lesen(dateiname)
+    try:
+        np.save(kopie, bild)
+        os.utime(kopie, ns=(zeitpunkt, zeitpunkt))
+    except OSError:
+        # z.B. schreibgeschuetztes Verzeichnis, dann ohne Kopie weiter
+        pass
+    return bild
+
+
+# Dateiformat .milu, Version 2: Kennung, Version und Kopflaenge, danach ein
+# JSON-Kopf (auf 64 Byte aufgefuellt) und die Sinogrammzeilen als float32,
+# entweder unkomprimiert (memmap-faehig) oder blockweise mit zlib gepackt.
+MILU_KENNUNG = b"MILU"
+MILU_VERSION = 2
+MILU_AUSRICHTUNG = 64
+
+
+def sinogramm_speichern(dateiname, sinogramm, laenge_original, winkel_max,
+                        winkel=None, filterart=None, komprimieren=False,
+                        blockzeilen=64):
+    """
+    Speichert ein Sinogramm im selbstbeschreibenden .milu-Format
+    (Version 2). Der Kopf enthaelt Seitenlaenge des Originalbildes,
+    Winkelbereich, Winkelliste, Datentyp, Rechengenauigkeit, mit der das
+    Sinogramm berechnet wurde, und Filterzustand.
+
+    Parameters
+    ----------
+    dateiname: Zieldatei.
+
+    sinogramm: Sinogramm (Winkelschritte x Detektorlaenge).
+
+    laenge_original: Seitenlaenge des Originalbildes.
+
+    winkel_max: Winkelbereich in Grad (180 oder 360).
+
+    winkel: Winkel der Zeilen in Grad; Standard sind gleichmaeßige
+            Schritte ueber winkel_max.
+
+    filterart: Name des bereits angewendeten Filters oder None.
+
+    komprimieren: Zeilenbloecke einzeln mit zlib packen. Solche Dateien
+                  koennen nicht per memmap geoeffnet werden.
+
+    blockzeilen: Anzahl Zeilen je komprimiertem Block.
+    """
+    daten = np.ascontiguousarray(sinogramm, dtype=np.float32)
+    if winkel is None:
+        winkel = np.linspace(0, winkel_max, len(daten), endpoint=False)
+    kopf = {"version": MILU_VERSION,
+            "laenge_original": int(laenge_original),
+            "winkel_max": int(winkel_max),
+            "winkel": [float(w) for w in winkel],
+            "dtype": "<f4",
+            "genauigkeit": np.dtype(genauigkeit(sinogramm)).name,
+            "form": list(daten.shape),
+            "filter": filterart,
+            "kompression": None}
+    bloecke = []
+    if komprimieren:
+        bloecke = [zlib.compress(daten[i:i + blockzeilen].tobytes())
+                   for i in range(0, len(daten), blockzeilen)]
+        kopf["kompression"] = "zlib"
+        kopf["blockzeilen"] = blockzeilen
+        kopf["bloecke"] = [len(block) for block in bloecke]
+    kopf_bytes = json.dumps(kopf).encode("utf-8")
+    # Datenbeginn ausrichten, Leerzeichen sind im JSON erlaubt
+    kopf_bytes += b" " * (-(len(kopf_bytes) + 9) % MILU_AUSRICHTUNG)
+    with open(dateiname, "wb") as file:
+        file.write(MILU_KENNUNG)
+        file.write(struct.pack("<BI", MILU_VERSION, len(kopf_bytes)))
+        file.write(kopf_bytes)
+        if komprimieren:
+            for block in bloecke:
+                file.write(block)
+        else:
+            daten.tofile(file)
+
+
+def sinogramm_lesen(dateiname):
+    """
+    Liest ein Sinogramm (.milu) samt Kopf. Unkomprimierte Dateien werden
+    per memmap geoeffnet, es werden also nur die tatsaechlich benutzten
+    Zeilen von der Platte gelesen. Dateien der Version 1 (np.save mit
+    Infozeile) werden ebenfalls erkannt.
+
+    Return
+    ----------
+    sinogramm, kopf (dict wie in sinogramm_speichern)
+    """
+    with open(dateiname, "rb") as file:
+        kennung = file.read(len(MILU_KENNUNG))
+        if kennung != MILU_KENNUNG:
+            # Version 1: erste Zeile enthaelt Laenge und Winkelbereich
+            sinogramm_plus_info = np.load(dateiname, mmap_mode="r")
+            sinogramm = sinogramm_plus_info[1:]
+            winkel_max = int(sinogramm_plus_info[0, 1])
+            kopf = {"version": 1,
+                    "laenge_original": int(sinogramm_plus_info[0, 0]),
+                    "winkel_max": winkel_max,
+                    "winkel": np.linspace(0, winkel_max, len(sinogramm),
+                                          endpoint=False).tolist(),
+                    "dtype": sinogramm.dtype.str,
+                    "genauigkeit": "float64",
+                    "form": list(sinogramm.shape),
+                    "filter": None,
+                    "kompression": None}
+            return sinogramm, kopf
+        version, kopf_laenge = struct.unpack("<BI", file.read(5))
+        if version > MILU_VERSION:
+            raise ValueError("Unbekannte .milu-Version: {}".format(version))
+        kopf = json.loads(file.read(kopf_laenge).decode("utf-8"))
+        form = tuple(kopf["form"])
+        dtype = np.dtype(kopf["dtype"])
+        if kopf["kompression"] == "zlib":
+            sinogramm = np.empty(form, dtype=dtype)
+            blockzeilen = kopf["blockzeilen"]
+            for nummer, laenge in enumerate(kopf["bloecke"]):
+                zeilen = np.frombuffer(zlib.decompress(file.read(laenge)),
+                                       dtype=dtype)
+                start = nummer * blockzeilen
+                sinogramm[start:start + blockzeilen] = \
+                    zeilen.reshape(-1, form[1])
+            return sinogramm, kopf
+        elif kopf["kompression"] is not None:
+            raise ValueError("Unbekannte Kompression: {}"
+                             .format(kopf["kompression"]))
+        beginn = file.tell()
+    sinogramm = np.memmap(dateiname, dtype=dtype, mode="r", offset=beginn,
+                          shape=form)
+    return sinogramm, kopf
+
+
+def sinogramm_laden(dateiname):
+    """
+    Laedt ein mit sinogramm_speichern abgelegtes Sinogramm (.milu).
+
+    Return
+    ----------
+    sinogramm, laenge_original, winkel_max
+    """
+    sinogramm, kopf = sinogramm_lesen(dateiname)
+    return sinogramm, kopf["laenge_original"], kopf["winkel_max"]
+
+
+SICHERUNG_VERZEICHNIS = os.path.join(CACHE_VERZEICHNIS, "sicherungen")
+
+
+class Sicherung:
+    """ Sicherungspunkte einer (abbrechbaren) Berechnung auf der Festplatte.
+        Der Name der Dateien ergibt sich aus den Parametern und den
+        Eingangsdaten, eine Berechnung mit denselben Einstellungen findet
+        daher ihre Sicherung wieder.
+
+        Fertige Sinogrammzeilen werden nur angehaengt (Startzeile, Anzahl,
+        Werte), ein Bild mit den erledigten Zeilen wird jeweils komplett
+        ersetzt.
+
+        Parameter:
+        ----------
+        art: Art der Berechnung, z.B. "vorwaerts".
+
+        parameter: dict mit allen Einstellungen, die das Ergebnis
+                   beeinflussen (muss als JSON darstellbar sein).
+
+        daten: Eingangsdaten (Array).
+
+        verzeichnis: Ablageort der Sicherungen.
+    """
+
+    def __init__(self, art, parameter, daten,
+                 verzeichnis=SICHERUNG_VERZEICHNIS):
+        pruefsumme = hashlib.sha1(json.dumps(parameter, sort_keys=True)
+                                  .encode("utf-8"))
+        pruefsumme.update(np.ascontiguousarray(daten).tobytes())
+        self.verzeichnis = verzeichnis
+        name = "{}_{}".format(art, pruefsumme.hexdigest()[:20])
+        self.datei_zeilen = os.path.join(verzeichnis, name + ".zeilen")
+        self.datei_bild = os.path.join(verzeichnis, name + ".npz")
+
+    def vorhanden(self):
+        """ True, falls eine Sicherung existiert. """
+        return os.path.exists(self.datei_zeilen) or \
+            os.path.exists(self.datei_bild)
+
+    def zeilen_anhaengen(self, start, zeilen):
+        """ Haengt fertige Zeilen ab start an die Sicherung an. """
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        with open(self.datei_zeilen, "ab") as file:
+            file.write(struct.pack("<II", start, len(zeilen)))
+            file.write(np.ascontiguousarray(zeilen).tobytes())
+
+    def zeilen_lesen(self, sinogramm):
+        """
+        Traegt die gesicherten Zeilen in sinogramm ein. Ein unvollstaendig
+        geschriebener letzter Eintrag wird ignoriert.
+
+        Return
+        ----------
+        erledigt: bool-Array, True fuer jede gesicherte Zeile.
+        """
+        erledigt = np.zeros(len(sinogramm), dtype=bool)
+        if not os.path.exists(self.datei_zeilen):
+            return erledigt
+        bytes_je_zeile = sinogramm[0].nbytes
+        with open(self.datei_zeilen, "rb") as file:
+            while True:
+                kopf = file.read(8)
+                if len(kopf) < 8:
+                    break
+                start, anzahl = struct.unpack("<II", kopf)
+                werte = file.read(anzahl * bytes_je_zeile)
+                if len(werte) < anzahl * bytes_je_zeile:
+                    break
+                sinogramm[start:start + anzahl] = np.frombuffer(
+                    werte, dtype=sinogramm.dtype).reshape(anzahl, -1)
+                erledigt[start:start + anzahl] = True
+        return erledigt
+
+    def bild_speichern(self, bild, erledigt):
+        """ Ersetzt das gesicherte Bild samt erledigter Zeilen. """
+        os.makedirs(self.verzeichnis, exist_ok=True)
+        temp = self.datei_bild + ".tmp"
+        with open(temp, "wb") as file:
+            np.savez(file, bild=bild, erledigt=erledigt)
+        # erst nach vollstaendigem Schreiben die alte Sicherung ersetzen
+        os.replace(temp, self.datei_bild)
+
+    def bild_lesen(self):
+        """ Return: bild, erledigt oder None, falls kein Bild gesichert. """
+        if not os.path.exists(self.datei_bild):
+            return None
+        with np.load(self.datei_bild) as daten:
+            return daten["bild"], daten["erledigt"]
+
+    def loeschen(self):
+        """ Entfernt die Sicherung (nach erfolgreicher Berechnung). """
+        for datei in (self.datei_zeilen, self.datei_bild):
+            if os.path.exists(datei):
+                os.remove(datei)
+
+
+def symmetrie_paare(winkel, toleranz=1e-6):
+    """
+    Sucht Paare von Winkeln, die sich um 180° unterscheiden. In der
+    Parallelstrahlgeometrie ist die Projektion unter θ + 180° die am
+    Detektor gespiegelte Projektion unter θ (t -> -t), sie muss also nicht
+    berechnet werden.
+
+    Parameters
+    ----------
+    winkel: Array, Projektionswinkel in Grad.
+
+    toleranz: maximale Abweichung (Grad) von genau 180°.
+
+    Return
+    ----------
+    quelle, ziel: Index-Arrays gleicher Laenge, Zeile ziel[k] ergibt sich
+    aus Zeile quelle[k] (siehe detektor_spiegeln). Quelle ist jeweils der
+    kleinere Index; Winkel ohne Partner kommen nicht vor.
+    """
+    winkel = np.mod(np.asarray(winkel, dtype=np.float64), 360)
+    reihenfolge = np.argsort(winkel, kind="stable")
+    sortiert = winkel[reihenfolge]
+    vergeben = np.zeros(len(winkel), dtype=bool)
+    quelle, ziel = [], []
+    for i in range(len(winkel)):
+        if vergeben[i]:
+            continue
+        partner = (winkel[i] + 180) % 360
+        k = np.searchsorted(sortiert, partner)
+        # Nachbarn im sortierten Array, auch ueber 360° -> 0° hinweg
+        for kandidat in reihenfolge[[(k - 1) % len(winkel),
+                                     k % len(winkel)]]:
+            abstand = abs((winkel[kandidat] - partner + 180) % 360 - 180)
+            if kandidat != i and not vergeben[kandidat] and \
+                    abstand <= toleranz:
+                vergeben[[i, kandidat]] = True
+                quelle.append(min(i, kandidat))
+                ziel.append(max(i, kandidat))
+                break
+    return np.array(quelle, dtype=np.intp), np.array(ziel, dtype=np.intp)
+
+
+def detektor_spiegeln(zeilen):
+    """
+    Spiegelt Sinogrammzeilen am Detektormittelpunkt (Pixel laenge // 2,
+    t -> -t). Bei gerader Laenge hat das erste Element kein Gegenstueck
+    und wird Null.
+
+    Parameters
+    ----------
+    zeilen: Array (..., laenge).
+    """
+    erstes = 1 - zeilen.shape[-1] % 2
+    gespiegelt = np.zeros_like(zeilen)
+    gespiegelt[..., erstes:] = zeilen[..., erstes:][..., ::-1]
+    return gespiegelt
+
+
+def offene_bereiche(erledigt, start, stop):
+    """ Zusammenhaengende Bereiche (a, b) zwischen start und stop, deren
+        Zeilen noch nicht erledigt sind. """
+    offen = np.concatenate(([False], ~erledigt[start:stop], [False]))
+    wechsel = np.flatnonzero(np.diff(offen.astype(np.int8)))
+    return [(start + a, start + b) for a, b in zip(wechsel[::2],
+                                                   wechsel[1::2])]
+
+
+class ProjektionsCache:
+    """ Zwischenspeicher (LRU) fuer einzelne Sinogrammzeilen.
+
+        Eine Zeile haengt nur vom Bildinhalt, ihrem Winkel und den
+        Einstellungen der Projektion (Projektor, Interpolation,
+        Genauigkeit) ab, nicht von Anzahl der Winkelschritte oder
+        Winkelbereich. Wird ein Bild z.B. erst mit 60, dann mit 120
+        Schritten oder ueber 360° statt 180° projiziert, muessen nur die
+        noch fehlenden Winkel berechnet werden. Der belegte Speicher ist
+        begrenzt, die am laengsten nicht benutzten Zeilen werden zuerst
+        verworfen.
+
+        Parameter:
+        ----------
+        max_bytes: obere Grenze fuer den belegten Arbeitsspeicher.
+    """
+
+    def __init__(self, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.eintraege = OrderedDict()
+        self.belegt = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def bild_schluessel(bild, projektor, ordnung):
+        """ Pruefsumme ueber Bildinhalt, Form, Datentyp und Einstellungen
+            der Projektion (gemeinsamer Teil der Schluessel eines Bildes). """
+        pruefsumme = hashlib.sha1(json.dumps(
+            {"projektor": projektor, "ordnung": ordnung,
+             "form": bild.shape, "dtype": bild.dtype.str}).encode("utf-8"))
+        pruefsumme.update(np.ascontiguousarray(bild).tobytes())
+        return pruefsumme.hexdigest()
+
+    @staticmethod
+    def schluessel(bild_schluessel, grad):
+        """ Schluessel aus Bild und (gerundetem) Winkel. """
+        return bild_schluessel, round(float(grad), 9)
+
+    def get(self, bild_schluessel, grad):
+        """ Gespeicherte Zeile fuer Bild und Winkel oder None. """
+        schluessel = self.schluessel(bild_schluessel, grad)
+        with self.lock:
+            zeile = self.eintraege.get(schluessel)
+            if zeile is not None:
+                self.eintraege.move_to_end(schluessel)
+            return zeile
+
+    def ablegen(self, bild_schluessel, grad, zeile):
+        """ Zeile (als Kopie) speichern, aelteste Zeilen ggf. verwerfen. """
+        schluessel = self.schluessel(bild_schluessel, grad)
+        # zu große Zeilen werden nicht gespeichert
+        if zeile.nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if schluessel in self.eintraege:
+                self.eintraege.move_to_end(schluessel)
+                return
+            while self.belegt + zeile.nbytes > self.max_bytes:
+                _, alt = self.eintraege.popitem(last=False)
+                self.belegt -= alt.nbytes
+            self.eintraege[schluessel] = np.array(zeile)
+            self.belegt += zeile.nbytes
+
+    def leeren(self):
+        """ Entfernt alle Zeilen. """
+        with self.lock:
+            self.eintraege.clear()
+            self.belegt = 0
+
+
+# gemeinsamer Cache fuer alle Vorwaertsprojektionen
+projektions_cache = ProjektionsCache()
+
+
+class Vorwaertsrechnung:
+    """ Vorwaertsprojektion eines (vergroeßerten) Bildes, ohne Bindung an
+        die grafische Oberflaeche.
+
+        Parameter:
+        ----------
+        data_gross: mit drehung_vorverarbeitung vergroeßertes Bild.
+
+        angle_value: Winkelbereich, 180 oder 360 (Grad).
+
+        angle_steps: Anzahl der Winkelschritte.
+
+        sinogramm: Array (angle_steps, laenge), wird gefuellt.
+
+        ordnung: Ordnung der Spline-Interpolation.
+
+        speicher_budget: maximaler Arbeitsspeicher je Block in Bytes.
+
+        projektor: Name des Projektors (siehe PROJEKTOREN).
+
+        prozesse: Anzahl Prozesse (1: ohne Prozesspool), hoechstens so
+        viele wie verfuegbare Prozessoren (siehe prozessoren).
+
+        sicherung: fertige Zeilen laufend auf der Festplatte sichern, damit
+                   eine abgebrochene Berechnung fortgesetzt werden kann.
+
+        symmetrie: Zeilen unter θ + 180° nicht berechnen, sondern aus der
+                   Zeile unter θ spiegeln (siehe symmetrie_paare), bei 360°
+                   halbiert das die Rechenzeit.
+
+        cache: bereits (auch mit anderer Schrittzahl oder anderem
+               Winkelbereich) berechnete Zeilen aus projektions_cache
+               uebernehmen und neue Zeilen dort ablegen.
+    """
+
+    def __init__(self, data_gross, angle_value, angle_steps, sinogramm,
+                 ordnung=3, speicher_budget=SPEICHER_BUDGET,
+                 projektor="Rotation", prozesse=1, sicherung=False,
+                 symmetrie=True, cache=True):
+        self.data_gross = data_gross
+        self.angle_value = angle_value
+        self.angle_steps = angle_steps
+        self.sinogramm = sinogramm
+        self.ordnung = ordnung
+        self.speicher_budget = speicher_budget
+        self.projektor = projektor
+        self.prozesse = prozesse
+        # Anzahl an Winkelschritten
+        self.numbers_angle = np.linspace(0, self.angle_value,
+                                         self.angle_steps, endpoint=False)
+        # bereits berechnete Zeilen (beim Fortsetzen)
+        self.erledigt = np.zeros(self.angle_steps, dtype=bool)
+        # Zeilen ziel werden aus den gespiegelten Zeilen quelle gefuellt
+        self.quelle, self.ziel = symmetrie_paare(self.numbers_angle) \
+            if symmetrie else (np.zeros(0, dtype=np.intp),) * 2
+        # gemeinsamer Teil der Schluessel im Projektionscache
+        self.cache_schluessel = None
+        if cache:
+            self.cache_schluessel = ProjektionsCache.bild_schluessel(
+                data_gross, projektor, ordnung)
+        self.sicherung = None
+        if sicherung:
+            self.sicherung = Sicherung(
+                "vorwaerts", {"angle_value": angle_value,
+                              "angle_steps": angle_steps,
+                              "ordnung": ordnung, "projektor": projektor,
+                              "dtype": sinogramm.dtype.str},
+                data_gross)
+
+    def fortsetzen(self):
+        """ Uebernimmt die gesicherten Zeilen einer abgebrochenen Berechnung
+            ins Sinogramm. Return: Anzahl uebernommener Zeilen. """
+        self.erledigt = self.sicherung.zeilen_lesen(self.sinogramm)
+        return int(np.count_nonzero(self.erledigt))
+
+    def aus_cache(self):
+        """ Uebernimmt alle noch offenen Zeilen, die im Projektionscache
+            liegen, ins Sinogramm. Return: Anzahl uebernommener Zeilen. """
+        if self.cache_schluessel is None:
+            return 0
+        gefunden = np.zeros(len(self.erledigt), dtype=bool)
+        for i in np.flatnonzero(~self.erledigt):
+            zeile = projektions_cache.get(self.cache_schluessel,
+                                          self.numbers_angle[i])
+            if zeile is not None:
+                self.sinogramm[i] = zeile
+                gefunden[i] = True
+        # zusammenhaengende Bereiche einzeln sichern
+        for a, b in offene_bereiche(~gefunden, 0, len(gefunden)):
+            self.zeilen_fertig(a, b, berechnet=False)
+        anzahl = int(np.count_nonzero(gefunden))
+        messprotokoll.zaehlen("winkel_cache", anzahl)
+        return anzahl
+
+    def zeilen_fertig(self, start, stop, berechnet=True):
+        """ Markiert Zeilen als erledigt und haengt sie an die Sicherung an.
+            Nur tatsaechlich projizierte Zeilen (berechnet) kommen in den
+            Projektionscache, gespiegelte nicht: eine spaetere Rechnung ohne
+            Symmetrie soll keine gespiegelten Zeilen erhalten. """
+        self.erledigt[start:stop] = True
+        if berechnet and self.cache_schluessel is not None:
+            for i in range(start, stop):
+                projektions_cache.ablegen(self.cache_schluessel,
+                                          self.numbers_angle[i],
+                                          self.sinogramm[i])
+        if self.sicherung is not None:
+            with messprotokoll.stufe("sicherung"):
+                self.sicherung.zeilen_anhaengen(start,
+                                                self.sinogramm[start:stop])
+
+    def spiegeln(self, start, stop):
+        """ Fuellt alle noch offenen Zeilen, deren (fertige) Quellzeile
+            zwischen start und stop liegt, mit der gespiegelten Quellzeile.
+            Return: (start, stop) der uebernommenen Zeilen oder None. """
+        auswahl = (self.quelle >= start) & (self.quelle < stop) & \
+            self.erledigt[self.quelle] & ~self.erledigt[self.ziel]
+        if not np.any(auswahl):
+            return None
+        ziel = self.ziel[auswahl]
+        self.sinogramm[ziel] = detektor_spiegeln(
+            self.sinogramm[self.quelle[auswahl]])
+        # zusammenhaengende Bereiche einzeln sichern
+        offen = np.ones(len(self.erledigt), dtype=bool)
+        offen[ziel] = False
+        for a, b in offene_bereiche(offen, ziel.min(), ziel.max() + 1):
+            self.zeilen_fertig(a, b, berechnet=False)
+        return ziel.min(), ziel.max() + 1
+
+    def fertig_melden(self, start, stop, fortschritt):
+        """ Uebernimmt die Spiegelungen der Zeilen start bis stop und meldet
+            den Fortschritt. Return: True bei Abbruch. """
+        gespiegelt = self.spiegeln(start, stop)
+        if gespiegelt is not None:
+            start, stop = min(start, gespiegelt[0]), max(stop, gespiegelt[1])
+        self.zeilen = (start, stop)
+        return fortschritt is not None and \
+            fortschritt(self.angle_value * np.count_nonzero(self.erledigt) /
+                        len(self.numbers_angle))
+
+    def berechnen(self, fortschritt=None):
+        """
+        Fuehrt die Projektion aus.
+
+        Parameters
+        ----------
+        fortschritt: optionale Funktion, die nach jedem Block mit dem
+        Fortschritt in Grad (Anteil fertiger Winkel mal angle_value)
+        aufgerufen wird. Gibt sie True zurueck, wird die Berechnung
+        abgebrochen. Die seit dem letzten Aufruf geaenderten Zeilen liegen
+        dabei zwischen self.zeilen (start, stop).
+
+        Return
+        ----------
+        abgebrochen: True, falls die Berechnung abgebrochen wurde.
+        """
+        abgebrochen = self.berechnen_bloecke(fortschritt)
+        if not abgebrochen and self.sicherung is not None:
+            self.sicherung.loeschen()
+        return abgebrochen
+
+    def berechnen_bloecke(self, fortschritt):
+        """ Projektion aller noch nicht erledigten Bloecke. """
+        # Zeilen frueherer Projektionen desselben Bildes, dazu gespiegelte
+        # Zeilen bereits vorhandener Quellzeilen (Cache, Fortsetzen)
+        self.aus_cache()
+        self.spiegeln(0, len(self.numbers_angle))
+        if self.uebersprungen().all():
+            self.fertig_melden(0, len(self.numbers_angle), fortschritt)
+            return False
+        # Spline-Koeffizienten nur einmal je Bild berechnen, da sich das
+        # Bild waehrend der Projektion nicht aendert
+        koeffizienten = None
+        if self.projektor == "Rotation":
+            with messprotokoll.stufe("spline_koeffizienten"):
+                koeffizienten = spline_koeffizienten(self.data_gross,
+                                                     self.ordnung)
+        if self.projektor == "Systemmatrix":
+            matrix = systemmatrix(len(self.data_gross), self.angle_steps,
+                                  self.angle_value, self.ordnung)
+        # Platz fuer die Geometrien aller berechneten Winkel, damit eine
+        # wiederholte Projektion sie wiederverwenden kann
+        reservierung = geometrie_cache.reservieren(
+            len(self.data_gross), len(self.numbers_angle) - len(self.ziel),
+            genauigkeit(koeffizienten), MESSFELD_KREIS) \
+            if self.projektor == "Rotation" else nullcontext()
+        with reservierung:
+            # mehr Prozesse als Prozessoren bremsen nur
+            prozesse = min(self.prozesse, prozessoren())
+            if self.projektor == "Rotation" and prozesse > 1:
+                return self.berechnen_parallel(koeffizienten, prozesse,
+                                               fortschritt)
+            # Strahlen nur durch den belegten Teil des Bildes verfolgen
+            rechteck = begrenzung(self.data_gross)
+            # mehrere Winkel je Block gemeinsam berechnen
+            anzahl = blockgroesse(len(self.data_gross), self.speicher_budget,
+                                  STRAHL_BYTES_JE_PIXEL
+                                  if self.projektor == "Strahlbasiert" else 32)
+            uebersprungen = self.uebersprungen()
+            for start in range(0, len(self.numbers_angle), anzahl):
+                stop = min(start + anzahl, len(self.numbers_angle))
+                bereiche = offene_bereiche(uebersprungen, start, stop)
+                if not bereiche:
+                    continue
+                for a, b in bereiche:
+                    beginn = time.perf_counter()
+                    # Drehung und Bildung von Linienintegralen fuer alle Winkel
+                    # des Bereichs
+                    if self.projektor == "Systemmatrix":
+                        self.sinogramm[a:b] = matrix.vorwaerts(self.data_gross,
+                                                               a, b)
+                    elif self.projektor == "Strahlbasiert":
+                        self.sinogramm[a:b] = strahl_vorwaerts(
+                            self.data_gross, self.numbers_angle[a:b], rechteck)
+                    else:
+                        self.sinogramm[a:b] = vorwaertsprojektion_block(
+                            koeffizienten, self.numbers_angle[a:b],
+                            self.ordnung)
+                    messprotokoll.winkel(time.perf_counter() - beginn, b - a)
+                    messprotokoll.zaehlen("winkel_vorwaerts", b - a)
+                    self.zeilen_fertig(a, b)
+                if self.fertig_melden(start, stop, fortschritt):
+                    return True
+        return False
+
+    def uebersprungen(self):
+        """ Zeilen, die nicht (mehr) projiziert werden: fertige und per
+            Spiegelung gefuellte. """
+        uebersprungen = np.copy(self.erledigt)
+        uebersprungen[self.ziel] = True
+        return uebersprungen
+
+    def berechnen_parallel(self, koeffizienten, prozesse, fortschritt):
+        """
+        Verteilt die Winkel blockweise auf einen (erhalten bleibenden) Pool
+        von Prozessen. Koeffizienten, Sinogramm und die Drehgeometrien der
+        Bloecke liegen in gemeinsamem Speicher, die Prozesse schreiben ihre
+        Zeilen direkt hinein. Geometrien aus dem Cache werden den Prozessen
+        mitgegeben, von ihnen berechnete in den Cache uebernommen. Damit
+        der Speicher begrenzt bleibt, sind hoechstens zwei Bloecke je
+        Prozess gleichzeitig unterwegs. Fortschritt wird nach jedem fertigen
+        Block gemeldet, bei Abbruch werden keine weiteren Bloecke begonnen.
+        """
+        numbers_angle = self.numbers_angle
+        laenge = len(self.data_gross)
+        # kleinere Bloecke als im seriellen Fall, damit alle Prozesse
+        # ausgelastet sind und der Fortschritt fein genug bleibt
+        anzahl = min(blockgroesse(laenge, self.speicher_budget),
+                     max(1, len(numbers_angle) // (4 * prozesse)))
+        dtype = genauigkeit(koeffizienten)
+        speicher_k, koeff_gemeinsam = gemeinsames_array((laenge, laenge),
+                                                        dtype=dtype)
+        speicher_s, sino_gemeinsam = gemeinsames_array(self.sinogramm.shape,
+                                                       dtype=dtype)
+        koeff_gemeinsam[:] = koeffizienten
+        uebersprungen = self.uebersprungen()
+        bereiche = deque((a, b) for start in range(0, len(numbers_angle),
+                                                   anzahl)
+                         for a, b in offene_bereiche(uebersprungen, start,
+                                                     start + anzahl))
+        pool = prozess_pool(prozesse)
+        # laufende Auftraege: (start, stop, gemeinsame Geometrie)
+        laufend = {}
+        abgebrochen = False
+        try:
+            while bereiche or laufend:
+                while bereiche and len(laufend) < 2 * prozesse:
+                    a, b = bereiche.popleft()
+                    geteilt = GeteilteGeometrie(laenge, b - a, dtype)
+                    for i, alpha in enumerate(numbers_angle[a:b]):
+                        geometrie = geometrie_cache.nachschlagen(
+                            laenge, alpha, dtype, MESSFELD_KREIS)
+                        if geometrie is not None:
+                            geteilt.eintragen(i, geometrie)
+                    bekannt = geteilt.pixel > 0
+                    try:
+                        auftrag = pool.submit(
+                            vorwaertsprojektion_teil, speicher_k.name,
+                            speicher_s.name, geteilt.namen, laenge,
+                            len(numbers_angle), numbers_angle[a:b], a,
+                            self.ordnung, np.dtype(dtype).name)
+                    except BaseException:
+                        geteilt.schliessen(freigeben=True)
+                        raise
+                    laufend[auftrag] = (a, b, geteilt, bekannt)
+                fertig, _ = wait(laufend, return_when=FIRST_COMPLETED)
+                for auftrag in fertig:
+                    start, stop, geteilt, bekannt = laufend.pop(auftrag)
+                    try:
+                        auftrag.result()
+                        # neu berechnete Geometrien fuer spaetere Projektionen
+                        for i in np.flatnonzero(~bekannt):
+                            geometrie_cache.uebernehmen(
+                                tuple(np.copy(array)
+                                      for array in geteilt.geometrie(i)),
+                                laenge, numbers_angle[start + i], dtype,
+                                MESSFELD_KREIS)
+                    finally:
+                        geteilt.schliessen(freigeben=True)
+                    self.sinogramm[start:stop] = sino_gemeinsam[start:stop]
+                    self.zeilen_fertig(start, stop)
+                    if self.fertig_melden(start, stop, fortschritt):
+                        abgebrochen = True
+                if abgebrochen:
+                    break
+        except BrokenProcessPool:
+            prozess_pool_beenden()
+            raise
+        finally:
+            # begonnene Auftraege noch zu Ende rechnen lassen, bevor ihr
+            # gemeinsamer Speicher freigegeben wird
+            for auftrag in laufend:
+                auftrag.cancel()
+            wait(laufend)
+            for eintrag in laufend.values():
+                eintrag[2].schliessen(freigeben=True)
+            del koeff_gemeinsam, sino_gemeinsam
+            for speicher in (speicher_k, speicher_s):
+                speicher.close()
+                speicher.unlink()
+        return abgebrochen
+
+
+class Rueckwaertsrechnung:
+    """ Rueckprojektion eines (gefilterten) Sinogramms, ohne Bindung an die
+        grafische Oberflaeche.
+
+        Parameter:
+        ----------
+        sinogramm_filter: Array (Anzahl Winkel, laenge).
+
+        image_r: Array (laenge, laenge), in das aufsummiert wird.
+
+        alpha_r: Array, Projektionswinkel der Sinogrammzeilen in Grad.
+
+        winkel_max: Winkelbereich, 180 oder 360 (Grad).
+
+        projektor: Name des Projektors (siehe RUECKPROJEKTOREN).
+
+        ordnung: Interpolation der pixelbasierten Rueckprojektion.
+
+        speicher_budget: maximaler Arbeitsspeicher je Block in Bytes.
+
+        threads: Anzahl Threads (1: ohne Threadpool).
+
+        intervall: Abstand (in s) zwischen Zwischenstaenden mit Threads.
+
+        sicherung: Zwischenstand (Teilbild und erledigte Winkel) auf der
+                   Festplatte sichern, damit eine abgebrochene Berechnung
+                   fortgesetzt werden kann.
+
+        sicherung_intervall: Mindestabstand (in s) zwischen zwei
+                             Sicherungen des Teilbildes.
+
+        symmetrie: Zeilen unter θ + 180° gespiegelt zur Zeile unter θ
+                   addieren und nur diese rueckprojizieren (siehe
+                   symmetrie_paare), bei 360° halbiert das die Rechenzeit.
+
+        laenge_original: nur das mittlere Quadrat dieser Seitenlaenge
+                         (Originalbild) berechnen, der Rest wird ohnehin
+                         weggeschnitten und bleibt Null. None: ganzes Bild.
+    """
+
+    def __init__(self, sinogramm_filter, image_r, alpha_r, winkel_max=180,
+                 projektor="Rotation", ordnung=1,
+                 speicher_budget=SPEICHER_BUDGET, threads=1, intervall=0.2,
+                 sicherung=False, sicherung_intervall=5, symmetrie=True,
+                 laenge_original=None):
+        self.sinogramm_filter = sinogramm_filter
+        self.image_r = image_r
+        self.alpha_r = alpha_r
+        self.winkel_max = winkel_max
+        self.projektor = projektor
+        self.ordnung = ordnung
+        self.speicher_budget = speicher_budget
+        self.threads = threads
+        self.intervall = intervall
+        self.laenge_original = laenge_original
+        # berechneter Teil von image_r
+        self.ausschnitt = (slice(None), slice(None))
+        if laenge_original is not None:
+            rand = (len(image_r) - laenge_original) // 2
+            self.ausschnitt = (slice(rand, rand + laenge_original),) * 2
+        # Abbruch (fuer Threads)
+        self.abbruch = False
+        # bereits rueckprojizierte Zeilen (beim Fortsetzen)
+        self.erledigt = np.zeros(len(sinogramm_filter), dtype=bool)
+        self.sicherung = None
+        self.sicherung_intervall = sicherung_intervall
+        if sicherung:
+            self.sicherung = Sicherung(
+                "rueckwaerts", {"alpha_r": [float(a) for a in alpha_r],
+                                "winkel_max": winkel_max,
+                                "projektor": projektor, "ordnung": ordnung,
+                                "laenge": len(image_r),
+                                "symmetrie": symmetrie,
+                                "laenge_original": laenge_original},
+                sinogramm_filter)
+        if symmetrie:
+            quelle, ziel = symmetrie_paare(alpha_r)
+            if len(ziel):
+                # Kopie, das Sinogramm des Aufrufers bleibt unveraendert
+                self.sinogramm_filter = np.array(sinogramm_filter)
+                self.sinogramm_filter[quelle] += detektor_spiegeln(
+                    self.sinogramm_filter[ziel])
+                self.erledigt[ziel] = True
+
+    def fortsetzen(self):
+        """ Uebernimmt Teilbild und erledigte Winkel einer abgebrochenen
+            Berechnung. Return: Anzahl bereits erledigter Winkel. """
+        gesichert = self.sicherung.bild_lesen()
+        if gesichert is None:
+            return 0
+        self.image_r[:], self.erledigt = gesichert
+        return int(np.count_nonzero(self.erledigt))
+
+    def sichern(self, bild, erledigt, erzwingen=False):
+        """ Sichert das Teilbild, hoechstens alle sicherung_intervall
+            Sekunden (außer bei erzwingen). """
+        if self.sicherung is None:
+            return
+        jetzt = time.perf_counter()
+        if erzwingen or jetzt - self.letzte_sicherung >= \
+                self.sicherung_intervall:
+            with messprotokoll.stufe("sicherung"):
+                self.sicherung.bild_speichern(bild, erledigt)
+            self.letzte_sicherung = jetzt
+
+    def berechnen(self, fortschritt=None):
+        """
+        Fuehrt die Rueckprojektion aus.
+
+        Parameters
+        ----------
+        fortschritt: optionale Funktion, die nach jedem Block (bzw. mit
+        Threads regelmaeßig) mit dem Fortschritt in Grad (Anteil fertiger
+        Winkel mal winkel_max) aufgerufen wird. Gibt sie True zurueck, wird
+        die Berechnung abgebrochen.
+
+        Return
+        ----------
+        abgebrochen: True, falls die Berechnung abgebrochen wurde.
+        """
+        self.letzte_sicherung = time.perf_counter()
+        abgebrochen = self.berechnen_bloecke(fortschritt)
+        if self.sicherung is not None:
+            if abgebrochen:
+                self.sichern(self.image_r, self.erledigt, erzwingen=True)
+            else:
+                self.sicherung.loeschen()
+        return abgebrochen
+
+    def berechnen_bloecke(self, fortschritt):
+        """ Rueckprojektion aller noch nicht erledigten Bloecke. """
+        if self.projektor == "Systemmatrix":
+            self.matrix = systemmatrix(len(self.image_r),
+                                       len(self.sinogramm_filter),
+                                       self.winkel_max)
+        # pixel- und strahlbasiert mehrere Winkel je Block, sonst einzeln
+        if self.projektor == "Pixelbasiert":
+            # je Pixel und Winkel: Koordinaten, Maske, Indizes und Werte
+            anzahl = blockgroesse(self.image_r[self.ausschnitt].shape[0],
+                                  self.speicher_budget / self.threads,
+                                  bytes_je_pixel=48)
+        elif self.projektor == "Strahlbasiert":
+            anzahl = blockgroesse(len(self.image_r),
+                                  self.speicher_budget / self.threads,
+                                  STRAHL_BYTES_JE_PIXEL)
+        else:
+            anzahl = 1
+        reservierung = geometrie_cache.reservieren(
+            len(self.image_r), np.count_nonzero(~self.erledigt),
+            genauigkeit(self.sinogramm_filter), self.laenge_original) \
+            if self.projektor == "Rotation" else nullcontext()
+        with reservierung:
+            if self.threads > 1:
+                return self.berechnen_threads(anzahl, fortschritt)
+            for start in range(0, len(self.sinogramm_filter), anzahl):
+                stop = min(start + anzahl, len(self.sinogramm_filter))
+                bereiche = offene_bereiche(self.erledigt, start, stop)
+                if not bereiche:
+                    continue
+                for a, b in bereiche:
+                    beginn = time.perf_counter()
+                    with messprotokoll.stufe("rueckprojektion"):
+                        self.image_r[self.ausschnitt] += \
+                            self.rueckprojektion(a, b)
+                    messprotokoll.winkel(time.perf_counter() - beginn, b - a)
+                    messprotokoll.zaehlen("winkel_rueck", b - a)
+                    self.erledigt[a:b] = True
+                self.sichern(self.image_r, self.erledigt)
+                if fortschritt is not None and \
+                        fortschritt(self.winkel_max *
+                                    np.count_nonzero(self.erledigt) /
+                                    len(self.sinogramm_filter)):
+                    return True
+        return False
+
+    def rueckprojektion(self, start, stop):
+        """ Summe der Rueckprojektionen der Sinogrammzeilen start bis stop
+            mit dem gewaehlten Projektor, nur fuer self.ausschnitt. """
+        if self.projektor == "Pixelbasiert":
+            return rueckprojektion_block(self.sinogramm_filter[start:stop],
+                                         self.alpha_r[start:stop],
+                                         self.ordnung, self.laenge_original)
+        if self.projektor == "Strahlbasiert":
+            # Zeilen und Spalten des Ausschnitts als Rechteck
+            bereich = self.ausschnitt[0].indices(len(self.image_r))[:2]
+            return strahl_rueckwaerts(self.sinogramm_filter[start:stop],
+                                      self.alpha_r[start:stop],
+                                      bereich * 2)[self.ausschnitt]
+        if self.projektor == "Systemmatrix":
+            # Rueckprojektion als transponiertes Produkt (Aᵀ enthaelt nur
+            # Pixel des Messfelds, Ausschnitt spart hier nichts)
+            return self.matrix.rueckwaerts(self.sinogramm_filter[start:stop],
+                                           start, stop)[self.ausschnitt]
+        image = np.zeros_like(self.image_r[self.ausschnitt])
+        for i in range(start, stop):
+            sino2d = self.sinogramm_filter[i] * np.ones_like(self.image_r)
+            # Drehung
+            image += drehung(sino2d, -self.alpha_r[i],
+                             messfeld=self.laenge_original)[self.ausschnitt]
+        return image
+
+    def berechnen_threads(self, anzahl, fortschritt):
+        """
+        Verteilt die Bloecke von Winkeln auf mehrere Threads. Jeder Thread
+        summiert in einen eigenen Akkumulator, erst am Ende werden diese
+        zusammengefasst. NumPy/SciPy geben waehrend der Rechnung den GIL
+        frei, daher laufen die Threads tatsaechlich parallel. Waehrend der
+        Rechnung wird image_r regelmaeßig auf die aktuelle Teilsumme gesetzt
+        (fuer die Animation).
+        """
+        bloecke = list(range(0, len(self.sinogramm_filter), anzahl))
+        akkumulatoren = [np.zeros_like(self.image_r)
+                         for _ in range(self.threads)]
+        basis = np.copy(self.image_r)
+        self.fertig = int(np.count_nonzero(self.erledigt))
+        self.lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=self.threads) as pool:
+            auftraege = [pool.submit(self.rueckprojektion_thread,
+                                     akkumulatoren[nummer],
+                                     bloecke[nummer::self.threads], anzahl)
+                         for nummer in range(self.threads)]
+            offen = auftraege
+            while offen:
+                erledigt, offen = wait(offen, timeout=self.intervall)
+                # Fehler der Threads weitergeben
+                for auftrag in erledigt:
+                    auftrag.result()
+                # Teilsumme fuer Animation (passend zu erledigt, da die
+                # Threads nur unter dem Lock aufsummieren)
+                with self.lock:
+                    self.image_r[:] = basis + np.sum(akkumulatoren, axis=0)
+                    erledigt = np.copy(self.erledigt)
+                self.sichern(self.image_r, erledigt)
+                if fortschritt is not None and \
+                        fortschritt(self.winkel_max * self.fertig /
+                                    len(self.sinogramm_filter)):
+                    self.abbruch = True
+        return self.abbruch
+
+    def rueckprojektion_thread(self, akkumulator, starts, anzahl):
+        """ Arbeit eines Threads: Rueckprojektion der Bloecke ab starts in
+            den eigenen Akkumulator. """
+        for start in starts:
+            stop = min(start + anzahl, len(self.sinogramm_filter))
+            for a, b in offene_bereiche(self.erledigt, start, stop):
+                if self.abbruch:
+                    return
+                beginn = time.perf_counter()
+                with messprotokoll.stufe("rueckprojektion"):
+                    image = self.rueckprojektion(a, b)
+                messprotokoll.winkel(time.perf_counter() - beginn, b - a)
+                messprotokoll.zaehlen("winkel_rueck", b - a)
+                with self.lock:
+                    akkumulator[self.ausschnitt] += image
+                    self.erledigt[a:b] = True
+                    self.fertig += b - a
+
+
+class Iterationsrechnung:
+    """ Iterative Rekonstruktion (SART mit geordneten Teilmengen), ohne
+        Bindung an die grafische Oberflaeche.
+
+        Die Winkel werden verschraenkt auf Teilmengen verteilt (Teilmenge k
+        enthaelt die Winkel k, k + m, k + 2m, ...). Je Teilmenge wird das
+        Bild mit dem normierten Residuum dieser Winkel korrigiert:
+
+            x += relaxation · C · Aᵀ (R · (y - A x))
+
+        mit R = 1 / Zeilensummen und C = 1 / Spaltensummen von A (nur
+        Winkel der Teilmenge). Als A dienen die vorhandenen Projektoren:
+        Drehung plus Summe (vorwaertsprojektion_block, linear) mit der
+        pixelbasierten Rueckprojektion, die Systemmatrix oder der
+        strahlbasierte Projektor mit seiner transponierten Rueckprojektion.
+
+        Parameter:
+        ----------
+        sinogramm: ungefiltertes Sinogramm (Anzahl Winkel, laenge).
+
+        image_r: Array (laenge, laenge), Startbild, wird verbessert.
+
+        alpha_r: Array, Projektionswinkel der Sinogrammzeilen in Grad.
+
+        winkel_max: Winkelbereich, 180 oder 360 (Grad).
+
+        projektor: "Systemmatrix", "Strahlbasiert", sonst
+                   Drehung/pixelbasiert.
+
+        iterationen: maximale Anzahl Durchlaeufe ueber alle Teilmengen.
+
+        teilmengen: Anzahl Teilmengen (1: SIRT).
+
+        relaxation: Schrittweite der Korrektur (0 bis 2).
+
+        schwelle: Abbruch, sobald das relative Residuum
+                  ||y - A x|| / ||y|| darunter liegt.
+
+        positiv: negative Werte nach jeder Korrektur auf Null setzen.
+
+        speicher_budget: maximaler Arbeitsspeicher je Block in Bytes.
+
+        sicherung: Zwischenstand nach fertigen Teilmengen sichern, um eine
+                   abgebrochene Berechnung fortsetzen zu koennen.
+
+        sicherung_intervall: Mindestabstand der Sicherungen in Sekunden.
+
+        laenge_original: Seitenlaenge des Originalbildes. Außerhalb des
+                         mittleren Quadrats dieser Groeße (mit Nullen
+                         aufgefuellter Rand, siehe drehung_vorverarbeitung)
+                         bleibt das Bild Null, None: ganzes Bild.
+    """
+
+    def __init__(self, sinogramm, image_r, alpha_r, winkel_max=180,
+                 projektor="Rotation", iterationen=10, teilmengen=10,
+                 relaxation=1.0, schwelle=1e-3, positiv=True,
+                 speicher_budget=SPEICHER_BUDGET, sicherung=False,
+                 sicherung_intervall=5, laenge_original=None):
+        # Genauigkeit richtet sich nach dem Bild
+        self.sinogramm = np.asarray(sinogramm, dtype=genauigkeit(image_r))
+        self.image_r = image_r
+        self.alpha_r = np.asarray(alpha_r)
+        self.winkel_max = winkel_max
+        self.projektor = projektor
+        self.iterationen = iterationen
+        self.relaxation = relaxation
+        self.schwelle = schwelle
+        self.positiv = positiv
+        self.speicher_budget = speicher_budget
+        self.laenge_original = laenge_original
+        anzahl = max(1, min(teilmengen, len(self.alpha_r)))
+        self.teilmengen = [np.arange(k, len(self.alpha_r), anzahl)
+                           for k in range(anzahl)]
+        # je Teilmenge: Matrix (Systemmatrix), Zeilen- und Spaltengewichte
+        self.matrizen = None
+        self.gewichte = [None] * anzahl
+        # relatives Residuum je Iteration
+        self.residuen = []
+        # bereits ausgefuehrte Teilmengen aller Iterationen (beim
+        # Fortsetzen)
+        self.erledigt = np.zeros(iterationen * anzahl, dtype=bool)
+        self.sicherung = None
+        self.sicherung_intervall = sicherung_intervall
+        if sicherung:
+            # Startbild gehoert zu den Eingangsdaten
+            self.sicherung = Sicherung(
+                "iterativ", {"alpha_r": [float(a) for a in alpha_r],
+                             "winkel_max": winkel_max,
+                             "projektor": projektor,
+                             "iterationen": iterationen,
+                             "teilmengen": anzahl, "relaxation": relaxation,
+                             "positiv": positiv,
+                             "laenge_original": laenge_original},
+                np.concatenate([self.sinogramm.ravel(), image_r.ravel()]))
+
+    def fortsetzen(self):
+        """ Uebernimmt Bild und erledigte Teilmengen einer abgebrochenen
+            Berechnung. Return: Anzahl bereits erledigter Teilmengen. """
+        gesichert = self.sicherung.bild_lesen()
+        if gesichert is None:
+            return 0
+        self.image_r[:], self.erledigt = gesichert
+        return int(np.count_nonzero(self.erledigt))
+
+    def sichern(self, erzwingen=False):
+        """ Sichert Bild und erledigte Teilmengen, hoechstens alle
+            sicherung_intervall Sekunden (außer bei erzwingen). """
+        if self.sicherung is None:
+            return
+        jetzt = time.perf_counter()
+        if erzwingen or jetzt - self.letzte_sicherung >= \
+                self.sicherung_intervall:
+            with messprotokoll.stufe("sicherung"):
+                self.sicherung.bild_speichern(self.image_r, self.erledigt)
+            self.letzte_sicherung = jetzt
+
+    def vorwaerts(self, bild, nummer):
+        """ Projektion des Bildes fuer die Winkel der Teilmenge nummer. """
+        teil = self.teilmengen[nummer]
+        laenge = len(bild)
+        if self.matrizen is not None:
+            return (self.matrizen[nummer] @ bild.ravel()).reshape(len(teil),
+                                                                 laenge)
+        if self.projektor == "Strahlbasiert":
+            anzahl = blockgroesse(laenge, self.speicher_budget,
+                                  STRAHL_BYTES_JE_PIXEL)
+            return np.concatenate([
+                strahl_vorwaerts(bild, self.alpha_r[teil[i:i + anzahl]])
+                for i in range(0, len(teil), anzahl)])
+        anzahl = blockgroesse(laenge, self.speicher_budget)
+        return np.concatenate([
+            vorwaertsprojektion_block(bild, self.alpha_r[teil[i:i + anzahl]],
+                                      1)
+            for i in range(0, len(teil), anzahl)])
+
+    def rueckwaerts(self, zeilen, nummer):
+        """ Rueckprojektion von Zeilen der Teilmenge nummer. """
+        teil = self.teilmengen[nummer]
+        laenge = zeilen.shape[1]
+        if self.matrizen is not None:
+            return (self.matrizen[nummer].T @ zeilen.ravel()).reshape(laenge,
+                                                                      laenge)
+        anzahl = blockgroesse(laenge, self.speicher_budget,
+                              STRAHL_BYTES_JE_PIXEL
+                              if self.projektor == "Strahlbasiert" else 48)
+        image = np.zeros((laenge, laenge), dtype=self.sinogramm.dtype)
+        for i in range(0, len(teil), anzahl):
+            if self.projektor == "Strahlbasiert":
+                image += strahl_rueckwaerts(zeilen[i:i + anzahl],
+                                            self.alpha_r[teil[i:i + anzahl]])
+            else:
+                image += rueckprojektion_block(
+                    zeilen[i:i + anzahl], self.alpha_r[teil[i:i + anzahl]])
+        return image
+
+    def gewichte_teilmenge(self, nummer):
+        """ Kehrwerte der Zeilen- und Spaltensummen von A fuer eine
+            Teilmenge, werden nur beim ersten Durchlauf berechnet. """
+        if self.gewichte[nummer] is None:
+            laenge = self.sinogramm.shape[1]
+            zeilen = self.vorwaerts(np.ones((laenge, laenge),
+                                            dtype=self.sinogramm.dtype),
+                                    nummer)
+            spalten = self.rueckwaerts(np.ones_like(zeilen), nummer)
+            kehrwert = [np.divide(1, summe, out=np.zeros_like(summe),
+                                  where=summe > 1e-8)
+                        for summe in (zeilen, spalten)]
+            # ohne Spaltengewicht wird der Rand nie korrigiert
+            kehrwert[1][self.rand()] = 0
+            self.gewichte[nummer] = tuple(kehrwert)
+        return self.gewichte[nummer]
+
+    def rand(self):
+        """ Maske der Pixel außerhalb des Originalbildes (siehe
+            laenge_original). """
+        laenge = self.sinogramm.shape[1]
+        maske = np.zeros((laenge, laenge), dtype=bool)
+        if self.laenge_original is not None:
+            rand = (laenge - self.laenge_original) // 2
+            maske[:] = True
+            maske[rand:rand + self.laenge_original,
+                  rand:rand + self.laenge_original] = False
+        return maske
+
+    def berechnen(self, fortschritt=None):
+        """
+        Fuehrt die Iterationen aus.
+
+        Parameters
+        ----------
+        fortschritt: optionale Funktion, die nach jeder Teilmenge mit einem
+        Wert zwischen 0 und winkel_max (Anteil der maximalen Iterationen)
+        aufgerufen wird; image_r enthaelt dann den aktuellen Stand. Gibt
+        sie True zurueck, wird die Berechnung abgebrochen.
+
+        Return
+        ----------
+        abgebrochen: True, falls die Berechnung abgebrochen wurde.
+        """
+        self.letzte_sicherung = time.perf_counter()
+        abgebrochen = self.berechnen_iterationen(fortschritt)
+        if self.sicherung is not None:
+            if abgebrochen:
+                self.sichern(erzwingen=True)
+            else:
+                self.sicherung.loeschen()
+        return abgebrochen
+
+    def berechnen_iterationen(self, fortschritt):
+        """ Alle noch nicht erledigten Iterationen. """
+        laenge = self.sinogramm.shape[1]
+        if self.projektor == "Systemmatrix":
+            matrix = systemmatrix(laenge, len(self.sinogramm),
+                                  self.winkel_max)
+            self.matrizen = [matrix.teilmatrix(teil)
+                             for teil in self.teilmengen]
+        # jede Iteration projiziert erneut unter allen Winkeln
+        reservierung = geometrie_cache.reservieren(
+            laenge, len(self.alpha_r), self.sinogramm.dtype,
+            MESSFELD_KREIS) \
+            if self.projektor not in ("Systemmatrix", "Strahlbasiert") \
+            else nullcontext()
+        norm = np.linalg.norm(self.sinogramm) or 1
+        bild = self.image_r
+        bild[self.rand()] = 0
+        with reservierung:
+            anzahl = len(self.teilmengen)
+            erster = int(np.count_nonzero(self.erledigt))
+            for iteration in range(erster // anzahl, self.iterationen):
+                quadratsumme = 0
+                for nummer, teil in enumerate(self.teilmengen):
+                    schritt = iteration * anzahl + nummer
+                    if self.erledigt[schritt]:
+                        continue
+                    beginn = time.perf_counter()
+                    zeilen_gewicht, spalten_gewicht = \
+                        self.gewichte_teilmenge(nummer)
+                    differenz = self.sinogramm[teil] - self.vorwaerts(bild,
+                                                                      nummer)
+                    quadratsumme += np.sum(differenz ** 2)
+                    bild += self.relaxation * spalten_gewicht * \
+                        self.rueckwaerts(differenz * zeilen_gewicht, nummer)
+                    if self.positiv:
+                        np.maximum(bild, 0, out=bild)
+                    messprotokoll.winkel(time.perf_counter() - beginn,
+                                         len(teil))
+                    messprotokoll.zaehlen("winkel_iterativ", len(teil))
+                    self.erledigt[schritt] = True
+                    self.sichern()
+                    if fortschritt is not None and \
+                            fortschritt(self.winkel_max * (schritt + 1) /
+                                        len(self.erledigt)):
+                        return True
+                # Residuum waehrend des Durchlaufs (vor der jeweiligen
+                # Korrektur), beim Fortsetzen fehlen im ersten Durchlauf
+                # die bereits erledigten Teilmengen
+                self.residuen.append(np.sqrt(quadratsumme) / norm)
+                if self.residuen[-1] < self.schwelle and \
+                        iteration * anzahl >= erster:
+                    break
+        return False
+
+
+class Schichtordner:
+    """ Stapel von Schichten aus einzelnen Dateien (.npy oder Textbilder),
+        die erst beim Zugriff geladen werden.
+
+        Parameter:
+        ----------
+        dateien: Liste der Dateinamen, Reihenfolge = Reihenfolge der
+        Schichten.
+    """
+
+    def __init__(self, dateien):
+        self.dateien = dateien
+        # alle Schichten pruefen, sonst scheitert erst ein spaeteres Fenster
+        koepfe = [bild_kopf(datei) for datei in dateien]
+        form, self.dtype = koepfe[0]
+        if len(form) != 2 or form[0] != form[1]:
+            raise ValueError("{} ist keine quadratische Schicht (Form {})"
+                             .format(dateien[0], form))
+        for datei, (form_schicht, dtype) in zip(dateien, koepfe):
+            if form_schicht != form or dtype != self.dtype:
+                raise ValueError(
+                    "Schicht {} (Form {}, {}) passt nicht zu {} (Form {}, "
+                    "{})".format(datei, form_schicht, dtype, dateien[0],
+                                 form, self.dtype))
+        self.shape = (len(dateien),) + form
+
+    def __len__(self):
+        return len(self.dateien)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return np.array([bild_laden(datei)
+                             for datei in self.dateien[index]])
+        return bild_laden(self.dateien[index])
+
+
+def schichten_oeffnen(eingabe):
+    """
+    Oeffnet ein Volumen, ohne es vollstaendig zu laden.
+
+    Parameters
+    ----------
+    eingabe: 3D-Array (.npy, wird als memmap geoeffnet) oder Verzeichnis
+    mit einer Datei (.npy oder .strings_mit_CRLF) je Schicht, sortiert nach
+    Dateinamen. Ein 2D-Array gilt als Volumen aus einer Schicht.
+
+    Return
+    ----------
+    schichten: Stapel (Anzahl Schichten, laenge, laenge), Zugriff mit
+    schichten[start:stop].
+    """
+    if os.path.isdir(eingabe):
+        dateien = sorted(datei for datei in os.listdir(eingabe)
+                         if ist_bilddatei(datei))
+        if not dateien:
+            raise ValueError("Keine Schichten in {}".format(eingabe))
+        return Schichtordner([os.path.join(eingabe, datei)
+                              for datei in dateien])
+    schichten = np.load(eingabe, mmap_mode="r")
+    if schichten.ndim == 2:
+        schichten = schichten[np.newaxis]
+    if schichten.ndim != 3:
+        raise ValueError("{} ist kein Volumen (Form {})".format(
+            eingabe, schichten.shape))
+    return schichten
+
+
+class Volumenrechnung:
+    """ Vorwaertsprojektion und gefilterte Rueckprojektion eines Volumens
+        (Stapel gleich großer Schichten), ohne Bindung an die grafische
+        Oberflaeche.
+
+        Die Schichten laufen in Fenstern von hoechstens fenster Schichten
+        durch den Arbeitsspeicher; Sinogramme und Volumen werden (bei
+        Angabe von Dateinamen) direkt in .npy-Dateien geschrieben. Alle
+        Schichten teilen sich Vergroeßerung, Drehgeometrie, Systemmatrix und
+        Filterkern; innerhalb eines Fensters werden die Koordinaten jedes
+        Winkelblocks nur einmal fuer alle Schichten aufbereitet.
+
+        Parameter:
+        ----------
+        schichten: Stapel (Anzahl Schichten, laenge, laenge), z.B. von
+        schichten_oeffnen.
+
+        angle_value: Winkelbereich, 180 oder 360 (Grad).
+
+        angle_steps: Anzahl der Winkelschritte.
+
+        filterart: Filter der Rueckprojektion (siehe FILTER), None:
+        ungefiltert.
+
+        ordnung: Ordnung der Spline-Interpolation der Drehung.
+
+        projektor: Projektor der Vorwaertsprojektion (siehe PROJEKTOREN).
+
+        rueckprojektor: "Systemmatrix", "Strahlbasiert", sonst
+        pixelbasiert (entspricht der Rueckprojektion durch Drehung).
+
+        fenster: Anzahl Schichten, die gemeinsam im Speicher liegen.
+
+        dtype: Rechengenauigkeit (np.float32 oder np.float64).
+
+        datei_sinogramme, datei_volumen: .npy-Dateien fuer Sinogramme
+        (Anzahl Schichten, angle_steps, laenge vergroeßert) und
+        rekonstruiertes Volumen (Anzahl Schichten, laenge, laenge), None:
+        im Arbeitsspeicher.
+
+        rekonstruieren: False, nur Sinogramme berechnen.
+
+        speicher_budget: maximaler Arbeitsspeicher je Block in Bytes.
+    """
+
+    def __init__(self, schichten, angle_value, angle_steps, filterart="Ramp",
+                 ordnung=3, projektor="Rotation",
+                 rueckprojektor="Pixelbasiert", fenster=8, dtype=np.float64,
+                 datei_sinogramme=None, datei_volumen=None,
+                 rekonstruieren=True, speicher_budget=SPEICHER_BUDGET):
+        self.schichten = schichten
+        self.angle_value = angle_value
+        self.filterart = filterart
+        self.ordnung = ordnung
+        self.projektor = projektor
+        self.rueckprojektor = rueckprojektor
+        self.fenster = max(1, fenster)
+        self.dtype = dtype
+        self.speicher_budget = speicher_budget
+        self.numbers_angle = np.linspace(0, angle_value, angle_steps,
+                                         endpoint=False)
+        anzahl, self.laenge_original = len(schichten), schichten.shape[-1]
+        # Vergroeßerung einmal fuer alle Schichten bestimmen
+        self.laenge = len(drehung_vorverarbeitung(
+            np.zeros((self.laenge_original, self.laenge_original))))
+        self.rand = (self.laenge - self.laenge_original) // 2
+        self.sinogramme = self.ausgabe(
+            datei_sinogramme, (anzahl, angle_steps, self.laenge))
+        self.volumen = None
+        if rekonstruieren:
+            self.volumen = self.ausgabe(
+                datei_volumen,
+                (anzahl, self.laenge_original, self.laenge_original))
+
+    def ausgabe(self, dateiname, form):
+        """ Ausgabearray: .npy-Datei als memmap oder im Arbeitsspeicher. """
+        if dateiname is None:
+            return np.zeros(form, dtype=self.dtype)
+        return np.lib.format.open_memmap(dateiname, mode="w+",
+                                         dtype=self.dtype, shape=form)
+
+    def berechnen(self, fortschritt=None):
+        """
+        Verarbeitet alle Schichten fensterweise.
+
+        Parameters
+        ----------
+        fortschritt: optionale Funktion, die nach jedem Fenster mit der
+        Anzahl fertiger Schichten aufgerufen wird. Gibt sie True zurueck,
+        wird die Berechnung abgebrochen.
+
+        Return
+        ----------
+        abgebrochen: True, falls die Berechnung abgebrochen wurde.
+        """
+        matrix = None
+        if self.projektor == "Systemmatrix" or \
+                self.rueckprojektor == "Systemmatrix":
+            matrix = systemmatrix(self.laenge, len(self.numbers_angle),
+                                  self.angle_value, self.ordnung)
+        # vergroeßerte Schichten eines Fensters, Rand bleibt immer Null
+        gross = np.zeros((self.fenster, self.laenge, self.laenge),
+                         dtype=self.dtype)
+        innen = (slice(None), slice(self.rand, self.rand +
+                                    self.laenge_original),
+                 slice(self.rand, self.rand + self.laenge_original))
+        # jedes Fenster projiziert erneut unter allen Winkeln
+        reservierung = geometrie_cache.reservieren(
+            self.laenge, len(self.numbers_angle), self.dtype,
+            MESSFELD_KREIS) \
+            if self.projektor not in ("Systemmatrix", "Strahlbasiert") \
+            else nullcontext()
+        with reservierung:
+            for start in range(0, len(self.schichten), self.fenster):
+                stop = min(start + self.fenster, len(self.schichten))
+                stapel = gross[:stop - start]
+                stapel[innen] = self.schichten[start:stop]
+                sinogramme = self.vorwaerts(stapel, matrix)
+                self.sinogramme[start:stop] = sinogramme
+                if self.volumen is not None:
+                    with messprotokoll.stufe("filtern"):
+                        sinogramme = filtern(sinogramme, self.filterart,
+                                             inplace=True)
+                    self.volumen[start:stop] = self.rueckwaerts(sinogramme,
+                                                                matrix)
+                messprotokoll.zaehlen("schichten", stop - start)
+                if fortschritt is not None and fortschritt(stop):
+                    return True
+        for ausgabe in (self.sinogramme, self.volumen):
+            if isinstance(ausgabe, np.memmap):
+                ausgabe.flush()
+        return False
+
+    def vorwaerts(self, stapel, matrix):
+        """ Sinogramme (Anzahl Schichten, Anzahl Winkel, laenge) eines
+            Fensters vergroeßerter Schichten. """
+        if self.projektor == "Systemmatrix":
+            return matrix.vorwaerts_stapel(stapel).astype(self.dtype,
+                                                          copy=False)
+        if self.projektor == "Strahlbasiert":
+            return self.strahl_vorwaerts(stapel)
+        with messprotokoll.stufe("spline_koeffizienten"):
+            koeffizienten = np.array([spline_koeffizienten(schicht,
+                                                           self.ordnung)
+                                      for schicht in stapel])
+        sinogramme = np.empty((len(stapel), len(self.numbers_angle),
+                               self.laenge), dtype=self.dtype)
+        anzahl = blockgroesse(self.laenge, self.speicher_budget)
+        for a in range(0, len(self.numbers_angle), anzahl):
+            b = min(a + anzahl, len(self.numbers_angle))
+            sinogramme[:, a:b] = vorwaertsprojektion_block(
+                koeffizienten, self.numbers_angle[a:b], self.ordnung)
+        return sinogramme
+
+    def rueckwaerts(self, sinogramme, matrix):
+        """ Rueckprojektion der (gefilterten) Sinogramme eines Fensters,
+            nur im Bereich der Originalschichten (Anzahl Schichten,
+            laenge_original, laenge_original). """
+        if self.rueckprojektor == "Systemmatrix":
+            return zuschneiden(matrix.rueckwaerts_stapel(sinogramme),
+                               self.laenge_original)
+        if self.rueckprojektor == "Strahlbasiert":
+            return self.strahl_rueckwaerts(sinogramme)
+        bilder = np.zeros((len(sinogramme), self.laenge_original,
+                           self.laenge_original), dtype=self.dtype)
+        # gemeinsame Koordinaten plus ein Wert je Schicht und Pixel
+        anzahl = blockgroesse(self.laenge, self.speicher_budget,
+                              bytes_je_pixel=40 + 8 * len(sinogramme))
+        with messprotokoll.stufe("rueckprojektion"):
+            for a in range(0, len(self.numbers_angle), anzahl):
+                b = min(a + anzahl, len(self.numbers_angle))
+                bilder += rueckprojektion_block(sinogramme[:, a:b],
+                                                self.numbers_angle[a:b],
+                                                innen=self.laenge_original)
+        return bilder
+
+    def strahl_vorwaerts(self, stapel):
+        """ Strahlbasierte Sinogramme eines Fensters, ein gemeinsames
+            Rechteck (siehe begrenzung) fuer alle Schichten. """
+        rechteck = begrenzung(stapel)
+        sinogramme = np.empty((len(stapel), len(self.numbers_angle),
+                               self.laenge), dtype=self.dtype)
+        anzahl = blockgroesse(self.laenge, self.speicher_budget,
+                              STRAHL_BYTES_JE_PIXEL)
+        for a in range(0, len(self.numbers_angle), anzahl):
+            b = min(a + anzahl, len(self.numbers_angle))
+            for schicht, sinogramm in zip(stapel, sinogramme):
+                sinogramm[a:b] = strahl_vorwaerts(
+                    schicht, self.numbers_angle[a:b], rechteck)
+        return sinogramme
+
+    def strahl_rueckwaerts(self, sinogramme):
+        """ Strahlbasierte Rueckprojektion eines Fensters, nur im Bereich
+            der Originalschichten. """
+        bilder = np.zeros((len(sinogramme), self.laenge, self.laenge),
+                          dtype=self.dtype)
+        innen = (self.rand, self.rand + self.laenge_original) * 2
+        anzahl = blockgroesse(self.laenge, self.speicher_budget,
+                              STRAHL_BYTES_JE_PIXEL)
+        with messprotokoll.stufe("rueckprojektion"):
+            for a in range(0, len(self.numbers_angle), anzahl):
+                b = min(a + anzahl, len(self.numbers_angle))
+                for sinogramm, bild in zip(sinogramme, bilder):
+                    bild += strahl_rueckwaerts(sinogramm[a:b],
+                                               self.numbers_angle[a:b], innen)
+        return zuschneiden(bilder, self.laenge_original)
+
+
+# Verkleinerungsfaktoren der Vorschau, von grob nach fein
+VORSCHAU_STUFEN = (4, 2)
+
+
+def sinogramm_verkleinern(sinogramm, faktor):
+    """
+    Verkleinert ein Sinogramm fuer die Vorschau: jede faktor-te Zeile
+    (Winkel) und je faktor Detektorelemente zusammengefasst. Die Gruppen
+    werden so gelegt, dass die Drehmitte in der mittleren Gruppe liegt.
+    Die Werte werden so skaliert, dass sie Linienintegralen durch das
+    entsprechend verkleinerte Bild entsprechen.
+
+    Parameters
+    ----------
+    sinogramm: Array (Anzahl Winkel, laenge).
+
+    faktor: Verkleinerungsfaktor.
+
+    Return
+    ----------
+    sinogramm_klein: Array (Anzahl Winkel / faktor, laenge_klein).
+
+    start: Detektorposition, an der die erste Gruppe beginnt (kann
+    negativ sein, fehlende Elemente zaehlen als Null).
+    """
+    zeilen = np.asarray(sinogramm[::faktor], dtype=np.float64)
+    laenge = zeilen.shape[1]
+    pixel_mitte = laenge // 2
+    laenge_klein = 2 * (pixel_mitte // faktor) + 1
+    start = pixel_mitte - (laenge_klein // 2) * faktor - faktor // 2
+    ende = start + laenge_klein * faktor
+    erweitert = np.zeros((len(zeilen), laenge_klein * faktor))
+    von, bis = max(start, 0), min(ende, laenge)
+    erweitert[:, von - start:bis - start] = zeilen[:, von:bis]
+    summe = erweitert.reshape(len(zeilen), laenge_klein, faktor).sum(axis=2)
+    return summe / faktor ** 2, start
+
+
+def bild_vergroessern(bild_klein, laenge, faktor, start):
+    """
+    Vergroeßert ein Vorschaubild (bilinear) auf die volle Seitenlaenge,
+    passend zur Gruppierung aus sinogramm_verkleinern.
+
+    Parameters
+    ----------
+    bild_klein: Array (laenge_klein, laenge_klein).
+
+    laenge: Seitenlaenge des vollen (vergroeßerten) Bildes.
+
+    faktor, start: wie von sinogramm_verkleinern verwendet.
+    """
+    # Mitte der Gruppe k liegt bei start + k * faktor + (faktor - 1) / 2
+    achse = (np.arange(laenge) - start - (faktor - 1) / 2) / faktor
+    zeilen, spalten = np.meshgrid(achse, achse, indexing="ij")
+    return map_coordinates(bild_klein, [zeilen, spalten], order=1,
+                           mode="nearest")
+
+
+def vorschau_rekonstruktion(zeilen, winkel, faktor=1, anzahl_winkel=None,
+                            winkel_max=180, filterart=None, iterationen=0,
+                            teilmengen=10):
+    """
+    Rekonstruktion eines verkleinerten Sinogramms fuer die Vorschau:
+    pixelbasierte (gefilterte) Rueckprojektion oder, mit iterationen > 0,
+    SART (siehe Iterationsrechnung).
+
+    Die Rueckprojektion summiert ueber die Winkel, ihr Ergebnis wird daher
+    auf die Anzahl Winkel des vollen Sinogramms hochgerechnet; ungefiltert
+    zusaetzlich mit faktor, da je Detektorelement faktor Pixel
+    zusammengefasst sind (gefiltert gleicht der Rampenfilter das aus).
+    SART loest das Gleichungssystem und braucht keine Anpassung. So hat
+    die Vorschau dieselbe Helligkeit wie das volle Ergebnis.
+
+    Parameters
+    ----------
+    zeilen: verkleinertes, ungefiltertes Sinogramm.
+
+    winkel: Projektionswinkel der Zeilen in Grad.
+
+    faktor: Verkleinerungsfaktor (siehe sinogramm_verkleinern).
+
+    anzahl_winkel: Anzahl Winkel des vollen Sinogramms, None: wie winkel.
+
+    winkel_max: Winkelbereich, 180 oder 360 (Grad).
+
+    filterart: Filter der Rueckprojektion (siehe FILTER), None: ungefiltert.
+
+    iterationen: Anzahl Iterationen, 0: keine iterative Rekonstruktion.
+
+    teilmengen: Anzahl Teilmengen der iterativen Rekonstruktion.
+    """
+    image = np.zeros((zeilen.shape[1], zeilen.shape[1]))
+    if iterationen > 0:
+        Iterationsrechnung(zeilen, image, winkel, winkel_max, "Rotation",
+                           iterationen, teilmengen).berechnen()
+        return image
+    Rueckwaertsrechnung(filtern(zeilen, filterart), image, winkel,
+                        winkel_max, "Pixelbasiert").berechnen()
+    if anzahl_winkel is not None:
+        image *= anzahl_winkel / len(winkel)
+    if filterart is None:
+        image *= faktor
+    return image
+
+
+def vorschau_stufen(sinogramm, alpha_r, rekonstruktion,
+                    stufen=VORSCHAU_STUFEN):
+    """
+    Grob-zu-fein-Vorschau: rekonstruiert das Sinogramm nacheinander in
+    den verkleinerten Aufloesungen der stufen. Als Generator, damit jedes
+    Ergebnis sofort angezeigt (oder die Vorschau abgebrochen) werden kann.
+
+    Parameters
+    ----------
+    sinogramm: Array (Anzahl Winkel, laenge), ungefiltert.
+
+    alpha_r: Projektionswinkel der Sinogrammzeilen in Grad.
+
+    rekonstruktion: Funktion (zeilen, winkel, faktor, anzahl_winkel) ->
+                    Bild, z.B. vorschau_rekonstruktion mit festen
+                    Einstellungen.
+
+    stufen: Verkleinerungsfaktoren.
+
+    Return
+    ----------
+    je Stufe (faktor, bild) mit bild in voller Groeße (laenge, laenge).
+    """
+    laenge = sinogramm.shape[1]
+    for faktor in stufen:
+        zeilen, start = sinogramm_verkleinern(sinogramm, faktor)
+        bild_klein = rekonstruktion(zeilen, np.asarray(alpha_r)[::faktor],
+                                    faktor, len(alpha_r))
+        yield faktor, bild_vergroessern(bild_klein, laenge, faktor, start)